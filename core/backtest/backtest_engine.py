@@ -0,0 +1,181 @@
+import heapq
+import logging
+import time
+from typing import Callable, List, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
+
+from core.models.backtest_report_dict import BacktestReportDict
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_archive import CandleArchive
+from core.stock.candle_cache import CandleCache
+from core.stock.stock_data_manager import StockDataManager
+from core.strategy.strategy import Strategy
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
+from tools.virtual_clock import VirtualClock
+
+if TYPE_CHECKING:
+    from core.stock.time_frame_manager import TimeFrameManager
+
+
+class _ReplayedTimeFrame(object):
+    """Candles of a (market, time frame) waiting to be replayed"""
+
+    __slots__ = ("market", "time_frame_length", "stock_data_manager", "records", "close_times", "position")
+
+    def __init__(self, market: str, time_frame_length: int, stock_data_manager: StockDataManager,
+                 records: np.ndarray):
+        self.market: str = market
+        self.time_frame_length: int = time_frame_length
+        self.stock_data_manager: StockDataManager = stock_data_manager
+        self.records: np.ndarray = records
+        self.close_times: np.ndarray = records["time"] + time_frame_length
+        self.position: int = 0  # Index of the next candle to replay
+
+
+class BacktestEngine(object):
+    """
+    Event driven backtest engine. Replays archived candles of many markets and time frames in candle close order into
+    their stock data managers, and runs a strategy on a virtual clock between candle closes
+    """
+
+    def __init__(self, start_time: int, end_time: int, candle_archive: Optional[CandleArchive] = None):
+        """
+        Backtest engine constructor
+
+        :param start_time: Virtual time at which the backtest starts
+        :param end_time: Time after the last replayed candle start (excluded)
+        :param candle_archive: Archive to read the replayed candles from
+        """
+        self.start_time: int = start_time
+        self.end_time: int = end_time
+        self.clock: VirtualClock = VirtualClock(start_time)
+        self._candle_archive: Optional[CandleArchive] = candle_archive
+        self._time_frames: List[_ReplayedTimeFrame] = []
+        self._queue: List[Tuple[int, int]] = []  # Heap of (next candle close time, time frame index)
+        self._candle_listeners: List[Callable[[str, int, List[RawStockDataDict]], None]] = []
+        self.candle_number: int = 0  # Number of replayed candles
+
+    def add_stock_data_manager(self, market: str, time_frame_length: int, stock_data_manager: StockDataManager,
+                               records: Optional[np.ndarray] = None) -> None:
+        """
+        Replay the candles of a market time frame into a stock data manager
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param stock_data_manager: The stock data manager to feed
+        :param records: Candle records (CANDLE_DTYPE) sorted by time asc. Read from the candle archive if None
+        """
+        if records is None:
+            if self._candle_archive is None:
+                raise FtxAlgotradingException("Backtest engine: no candle archive to read the candles from")
+            records = self._candle_archive.get_range(market, time_frame_length, self.start_time, self.end_time)
+        else:
+            start, end = np.searchsorted(records["time"], [self.start_time, self.end_time])
+            records = records[start:end]
+
+        self._time_frames.append(_ReplayedTimeFrame(market, time_frame_length, stock_data_manager, records))
+
+        if len(records) > 0:
+            heapq.heappush(self._queue, (int(self._time_frames[-1].close_times[0]), len(self._time_frames) - 1))
+
+    def add_time_frame_manager(self, time_frame_manager: 'TimeFrameManager') -> None:
+        """
+        Replay the archived candles of a time frame into its stock data manager. Its data acquisition must not be
+        started
+
+        :param time_frame_manager: The time frame manager to feed
+        """
+        self.add_stock_data_manager(time_frame_manager.market, time_frame_manager.time_frame_length,
+                                    time_frame_manager.stock_data_manager)
+
+    def add_candle_listener(self, listener: Callable[[str, int, List[RawStockDataDict]], None]) -> None:
+        """
+        Call a function with the replayed candles (ie: SimulatedExchange.update_candles), before the stock data managers
+        are fed
+
+        :param listener: Function called with the market, the time frame length and the candles
+        """
+        self._candle_listeners.append(listener)
+
+    def replay_until(self, timestamp: float) -> int:
+        """
+        Feed the stock data managers with the candles closed at a given time
+
+        :param timestamp: The time
+        :return: Number of replayed candles
+        """
+        candle_number = 0
+
+        while len(self._queue) > 0 and self._queue[0][0] <= timestamp:
+            _, index = heapq.heappop(self._queue)
+            time_frame = self._time_frames[index]
+
+            end = int(np.searchsorted(time_frame.close_times, timestamp, side="right"))
+            stock_data = CandleCache.to_stock_data(time_frame.records[time_frame.position:end])
+
+            for listener in self._candle_listeners:
+                listener(time_frame.market, time_frame.time_frame_length, stock_data)
+
+            time_frame.stock_data_manager.update_data(stock_data)
+            candle_number += end - time_frame.position
+            time_frame.position = end
+
+            if end < len(time_frame.records):
+                heapq.heappush(self._queue, (int(time_frame.close_times[end]), index))
+
+        self.candle_number += candle_number
+        return candle_number
+
+    def get_next_candle_close_time(self) -> Optional[int]:
+        """
+        :return: Close time of the next candle to replay, None if every candle has been replayed
+        """
+        return self._queue[0][0] if len(self._queue) > 0 else None
+
+    def run(self, strategy: Strategy) -> BacktestReportDict:
+        """
+        Run a strategy over the replayed candles. The strategy sleeps on the virtual clock. When no candle closed while
+        it was sleeping, the clock jumps to the next candle close so that idle loops are skipped. Threads started with
+        the clock (ie: position drivers) are stepped along with the strategy, so that runs are deterministic
+
+        :param strategy: The strategy to run. Its data acquisitions must not be started
+        :return: The backtest report
+        """
+        strategy.clock = self.clock
+        started_at = time.perf_counter()
+        loop_number = 0
+
+        self.replay_until(self.clock.time())
+
+        while True:
+            strategy.before_loop()
+            strategy.loop()
+            strategy.after_loop()
+            loop_number += 1
+
+            next_candle_close_time = self.get_next_candle_close_time()
+            if next_candle_close_time is None:
+                break
+
+            # Threads started by the strategy on the clock (ie: position drivers) must be done with the current time
+            self.clock.wait_until_idle()
+            if self.replay_until(self.clock.time()) == 0:
+                self.clock.advance_to(next_candle_close_time)
+                self.replay_until(next_candle_close_time)
+
+        self.clock.stop()  # Threads still sleeping on the virtual clock (ie: position drivers) must end
+        duration = time.perf_counter() - started_at
+        report: BacktestReportDict = {
+            "start_time": self.start_time,
+            "end_time": int(self.clock.time()),
+            "candle_number": self.candle_number,
+            "loop_number": loop_number,
+            "duration": duration,
+            "candles_per_second": self.candle_number / duration if duration > 0 else 0
+        }
+
+        logging.info(f"Backtest: {report['candle_number']} candles replayed in {round(duration, 2)} sec "
+                     f"({round(report['candles_per_second'])} candles/sec, {loop_number} strategy loops)")
+
+        return report
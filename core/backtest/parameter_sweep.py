@@ -0,0 +1,94 @@
+import importlib
+import itertools
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from core.stock.candle_archive import CandleArchive
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
+
+_worker_candle_archive: Optional[CandleArchive] = None  # Candle archive opened once per worker process
+
+
+def _init_worker(candle_archive_directory: str) -> None:
+    """
+    Open the candle archive of a worker process. Archive files are memory mapped: every worker reads the same pages
+
+    :param candle_archive_directory: Directory of the candle archive
+    """
+    global _worker_candle_archive
+    _worker_candle_archive = CandleArchive(candle_archive_directory)
+
+
+def _run_combination(module_name: str, parameters: Dict[str, Any],
+                     run_backtest: Callable[[CandleArchive], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Override the module constants with a parameter combination then run a backtest (in a worker process)
+
+    :param module_name: Name of the module holding the constants
+    :param parameters: The parameter combination { [constant name]: value }
+    :param run_backtest: The backtest function
+    :return: The backtest result
+    """
+    module = importlib.import_module(module_name)
+
+    for name, value in parameters.items():
+        if not hasattr(module, name):
+            raise FtxAlgotradingException(f"Parameter sweep: {module_name} has no {name} constant")
+        setattr(module, name, value)
+
+    return run_backtest(_worker_candle_archive)
+
+
+class ParameterSweep(object):
+    """
+    Run a backtest for every combination of a parameter grid in a process pool. Parameters are module level constants
+    (ie: strategy tuning constants) overridden in the worker processes
+    """
+
+    def __init__(self, module_name: str, run_backtest: Callable[[CandleArchive], Dict[str, Any]],
+                 candle_archive_directory: str, worker_number: Optional[int] = None):
+        """
+        Parameter sweep constructor
+
+        :param module_name: Name of the module holding the constants to sweep (ie:
+        strategies.multi_coin_abnormal_volume_tracker.multi_coin_abnormal_volume_tracker)
+        :param run_backtest: Function running a backtest over the candle archive and returning its result as a flat
+        dict (ie: SimulatedExchange.get_statistics()). Must be picklable: a module level function or a
+        functools.partial of one
+        :param candle_archive_directory: Directory of the candle archive shared by the workers
+        :param worker_number: Number of worker processes. The number of CPUs if None
+        """
+        self.module_name: str = module_name
+        self.run_backtest: Callable[[CandleArchive], Dict[str, Any]] = run_backtest
+        self.candle_archive_directory: str = candle_archive_directory
+        self.worker_number: int = worker_number if worker_number is not None else os.cpu_count()
+
+    @staticmethod
+    def get_combinations(parameter_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """
+        :param parameter_grid: The values of each parameter { [constant name]: [values] }
+        :return: Every parameter combination
+        """
+        names = list(parameter_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*[parameter_grid[n] for n in names])]
+
+    def run(self, parameter_grid: Dict[str, List[Any]]) -> pd.DataFrame:
+        """
+        Run a backtest for every parameter combination
+
+        :param parameter_grid: The values of each parameter { [constant name]: [values] }
+        :return: One row per combination: the parameters followed by the backtest result
+        """
+        combinations = ParameterSweep.get_combinations(parameter_grid)
+        logging.info(f"Parameter sweep: {len(combinations)} combinations on {self.worker_number} workers")
+
+        with ProcessPoolExecutor(max_workers=self.worker_number, initializer=_init_worker,
+                                 initargs=(self.candle_archive_directory,)) as executor:
+            results = list(executor.map(_run_combination, itertools.repeat(self.module_name), combinations,
+                                        itertools.repeat(self.run_backtest)))
+
+        return pd.DataFrame([dict(combination, **result) for combination, result in zip(combinations, results)])
@@ -0,0 +1,584 @@
+import datetime
+import itertools
+import threading
+from typing import Any, Dict, List, Optional
+
+from core.enums.request_priority_enum import RequestPriorityEnum
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.models.trade_statistics_dict import TradeStatisticsDict
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+from tools.system_clock import SystemClock
+
+DEFAULT_TAKER_FEE = 0.0007
+DEFAULT_MAKER_FEE = 0.0002
+DEFAULT_SIZE_INCREMENT = 0.001
+
+
+class SimulatedExchange(object):
+    """
+    In process stand-in for FtxRestApi. Implements the market, wallet, order, trigger order and position endpoints
+    used by the strategies and the position driver. Orders are filled against replayed candles or trades
+    """
+
+    def __init__(self, initial_balance: float = 10000, clock: Optional[SystemClock] = None,
+                 taker_fee: float = DEFAULT_TAKER_FEE, maker_fee: float = DEFAULT_MAKER_FEE, spread: float = 0,
+                 leverage: float = 1, time_frame_length: Optional[int] = None,
+                 size_increments: Optional[Dict[str, float]] = None):
+        """
+        Simulated exchange constructor
+
+        :param initial_balance: Initial USD balance
+        :param clock: Clock giving order creation times. The system clock if None
+        :param taker_fee: Fee rate of the orders filled at market
+        :param maker_fee: Fee rate of the limit orders filled later on
+        :param spread: Spread between ask and bid prices, as a fraction of the price
+        :param leverage: Account leverage, used to compute the collateral of the positions
+        :param time_frame_length: Only the candles of this time frame update the prices. Every candle if None
+        :param size_increments: Size increment of the markets. DEFAULT_SIZE_INCREMENT for the others
+        """
+        self.clock: SystemClock = clock if clock is not None else SystemClock()
+        self.taker_fee: float = taker_fee
+        self.maker_fee: float = maker_fee
+        self.spread: float = spread
+        self.leverage: float = leverage
+        self.time_frame_length: Optional[int] = time_frame_length
+        self.size_increments: Dict[str, float] = size_increments if size_increments is not None else {}
+        self.initial_balance: float = initial_balance
+        self.balance: float = initial_balance  # USD balance: initial balance plus realized pnl minus fees
+        self.fees: float = 0  # Paid fees
+        self.trade_pnls: List[float] = []  # Pnl (fees included) of each closed position
+        self._prices: Dict[str, float] = {}  # { [market]: last price }
+        self._positions: Dict[str, dict] = {}  # { [market]: position (net size, entry price, ...) }
+        self._orders: Dict[int, dict] = {}  # { [id]: open limit order }
+        self._conditional_orders: Dict[int, dict] = {}  # { [id]: open trigger order }
+        self._trailing_prices: Dict[int, float] = {}  # { [trigger order id]: best price since trailing stop creation }
+        self._order_ids = itertools.count(1)
+        self._lock: threading.RLock = threading.RLock()
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            priority: Optional[RequestPriorityEnum] = None) -> Any:
+        """
+        Simulated FTX api GET request
+
+        :param path: The endpoint path
+        :param params: The request parameters
+        :param priority: Ignored, the simulated exchange has no rate limit
+        :return: The request result
+        """
+        params = params if params is not None else {}
+
+        with self._lock:
+            if path == "markets":
+                return [self._get_market(market) for market in self._prices]
+            if path.startswith("markets/") and path.count("/") == 1:
+                return self._get_market(self._check_market(path.split("/")[1]))
+            if path == "wallet/balances":
+                return [self._get_wallet()]
+            if path == "positions":
+                return [self._get_position(market) for market in self._positions]
+            if path == "orders":
+                return [dict(order) for order in self._orders.values()
+                        if params.get("market") in [None, order["market"]]]
+            if path == "conditional_orders":
+                return [dict(order) for order in self._conditional_orders.values()
+                        if params.get("market") in [None, order["market"]]]
+
+        raise FtxRestApiException(f"Not supported by the simulated exchange: GET {path}")
+
+    def post(self, path: str, params: Optional[Dict[str, Any]] = None,
+             priority: Optional[RequestPriorityEnum] = None) -> Any:
+        """
+        Simulated FTX api POST request
+
+        :param path: The endpoint path
+        :param params: The request parameters
+        :param priority: Ignored, the simulated exchange has no rate limit
+        :return: The request result
+        """
+        with self._lock:
+            if path == "orders":
+                return self._place_order(params)
+            if path == "conditional_orders":
+                return self._place_conditional_order(params)
+
+        raise FtxRestApiException(f"Not supported by the simulated exchange: POST {path}")
+
+    def delete(self, path: str, params: Optional[Dict[str, Any]] = None,
+               priority: Optional[RequestPriorityEnum] = None) -> Any:
+        """
+        Simulated FTX api DELETE request
+
+        :param path: The endpoint path
+        :param params: The request parameters
+        :param priority: Ignored, the simulated exchange has no rate limit
+        :return: The request result
+        """
+        params = params if params is not None else {}
+
+        with self._lock:
+            if path == "orders":
+                # Like FTX, trigger orders are cancelled as well
+                for orders in [self._orders, self._conditional_orders]:
+                    for order_id in [order_id for order_id, order in orders.items()
+                                     if params.get("market") in [None, order["market"]]]:
+                        self._cancel(orders, order_id)
+                return "Orders queued for cancellation"
+
+            if path.startswith("orders/") or path.startswith("conditional_orders/"):
+                orders = self._orders if path.startswith("orders/") else self._conditional_orders
+                order_id = int(path.split("/")[1])
+                if order_id not in orders:
+                    raise FtxRestApiException("Order not found")
+                self._cancel(orders, order_id)
+                return "Order queued for cancellation"
+
+        raise FtxRestApiException(f"Not supported by the simulated exchange: DELETE {path}")
+
+    def get_statistics(self) -> TradeStatisticsDict:
+        """
+        :return: Pnl and trade statistics since the exchange creation
+        """
+        with self._lock:
+            trade_number = len(self.trade_pnls)
+            winning_trade_number = len([trade_pnl for trade_pnl in self.trade_pnls if trade_pnl > 0])
+
+            return {
+                "balance": self.balance,
+                "pnl": self.balance - self.initial_balance,
+                "fees": self.fees,
+                "trade_number": trade_number,
+                "winning_trade_number": winning_trade_number,
+                "win_rate": winning_trade_number / trade_number if trade_number > 0 else None,
+                "average_trade_pnl": sum(self.trade_pnls) / trade_number if trade_number > 0 else None,
+                "worst_trade_pnl": min(self.trade_pnls) if trade_number > 0 else None,
+                "best_trade_pnl": max(self.trade_pnls) if trade_number > 0 else None
+            }
+
+    def update_candles(self, market: str, time_frame_length: int, candles: List[RawStockDataDict]) -> None:
+        """
+        Update a market price with closed candles, triggering orders along the way. Prices are assumed to go from open
+        to low then high for green candles and from open to high then low for red ones, before reaching close
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the candles in seconds
+        :param candles: The candles sorted by time asc
+        """
+        if self.time_frame_length is not None and time_frame_length != self.time_frame_length:
+            return
+
+        with self._lock:
+            for candle in candles:
+                if candle["close_price"] >= candle["open_price"]:
+                    path = [candle["low_price"], candle["high_price"], candle["close_price"]]
+                else:
+                    path = [candle["high_price"], candle["low_price"], candle["close_price"]]
+
+                # The open price can gap from the previous price, orders are then filled at the open price
+                self._update_price(market, candle["open_price"], True)
+                for price in path:
+                    self._update_price(market, price, False)
+
+    def add_trades(self, market: str, trades: List[dict]) -> None:
+        """
+        Update a market price with trades, triggering orders along the way
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param trades: FTX websocket trades (with a price field), sorted by time asc
+        """
+        with self._lock:
+            for trade in trades:
+                self._update_price(market, float(trade["price"]), True)
+
+    def _update_price(self, market: str, price: float, exact: bool) -> None:
+        """
+        Move the price of a market and fill the orders it reaches
+
+        :param market: Name of the market
+        :param price: The new price
+        :param exact: True if the price is reached without going through the prices in between (gap or trade), in
+        which case reached orders are filled at this price instead of their own price
+        """
+        self._prices[market] = price
+
+        for order_id, order in list(self._conditional_orders.items()):
+            if order_id not in self._conditional_orders or order["market"] != market:
+                continue  # Cancelled while processing another order
+
+            trigger_price = self._get_trigger_price(order_id, price)
+            is_buy = order["side"] == "buy"
+            is_stop = order["type"] in ["stop", "trailing_stop"]
+
+            # Stops trigger when the price moves against the position, take profits when it moves in favour
+            if (price >= trigger_price) if is_buy == is_stop else (price <= trigger_price):
+                fill_price = price if exact else trigger_price
+                self._trigger(order, fill_price)
+
+        for order_id, order in list(self._orders.items()):
+            if order_id not in self._orders or order["market"] != market:
+                continue
+
+            if (price <= order["price"]) if order["side"] == "buy" else (price >= order["price"]):
+                fill_price = price if exact else order["price"]
+                self._fill_order(order, fill_price, self.maker_fee)
+
+    def _get_trigger_price(self, order_id: int, price: float) -> float:
+        """
+        :param order_id: Trigger order id
+        :param price: Current price of the market
+        :return: The trigger price of the order, moved along with the price for trailing stops
+        """
+        order = self._conditional_orders[order_id]
+
+        if order["type"] == "trailing_stop":
+            trailing_price = self._trailing_prices[order_id]
+            trailing_price = max(trailing_price, price) if order["side"] == "sell" else min(trailing_price, price)
+            self._trailing_prices[order_id] = trailing_price
+            order["triggerPrice"] = trailing_price + order["trailValue"]
+
+        return order["triggerPrice"]
+
+    def _trigger(self, order: dict, fill_price: float) -> None:
+        """
+        Trigger a trigger order: fill it at market or place its limit order
+
+        :param order: The trigger order
+        :param fill_price: Price at which a market order is filled
+        """
+        self._conditional_orders.pop(order["id"])
+        self._trailing_prices.pop(order["id"], None)
+        order["status"] = "triggered"
+        order["triggeredAt"] = self._get_iso_time()
+
+        size = self._get_order_size(order["market"], order["side"], order["size"], order["reduceOnly"])
+        if size == 0:
+            order["status"] = "cancelled"
+            return
+
+        triggered_order = self._new_order(order["market"], order["side"],
+                                          "market" if order["orderPrice"] is None else "limit", order["orderPrice"],
+                                          size, order["reduceOnly"])
+
+        if order["orderPrice"] is None:
+            self._fill_order(triggered_order, self._get_execution_price(fill_price, order["side"]), self.taker_fee)
+        else:
+            self._orders[triggered_order["id"]] = triggered_order
+
+        order["filledSize"] = triggered_order["filledSize"]
+        order["avgFillPrice"] = triggered_order["avgFillPrice"]
+
+    def _place_order(self, params: Dict[str, Any]) -> dict:
+        """
+        Place an order, filled at once if it is a market order or if its price is reached
+
+        :param params: FTX order parameters
+        :return: The FTX formatted order
+        """
+        market = self._check_market(params["market"])
+        side = params["side"]
+        reduce_only = bool(params.get("reduceOnly", False))
+        size = self._get_order_size(market, side, float(params["size"]), reduce_only)
+
+        if size <= 0:
+            raise FtxRestApiException("Invalid reduce-only order" if reduce_only else "Invalid size")
+
+        price = float(params["price"]) if params["type"] == "limit" else None
+        order = self._new_order(market, side, params["type"], price, size, reduce_only)
+        execution_price = self._get_execution_price(self._prices[market], side)
+
+        self._check_collateral(market, side, size, execution_price if price is None else price)
+
+        if price is None or (execution_price <= price if side == "buy" else execution_price >= price):
+            self._fill_order(order, execution_price, self.taker_fee)
+        else:
+            self._orders[order["id"]] = order
+
+        return dict(order)
+
+    def _place_conditional_order(self, params: Dict[str, Any]) -> dict:
+        """
+        Place a trigger order
+
+        :param params: FTX trigger order parameters
+        :return: The FTX formatted trigger order
+        """
+        market = self._check_market(params["market"])
+        order_type = {"stop": "stop", "takeProfit": "take_profit", "trailingStop": "trailing_stop"}.get(params["type"])
+
+        if order_type is None:
+            raise FtxRestApiException(f"Invalid type: {params['type']}")
+
+        if order_type == "trailing_stop":
+            trail_value = float(params["trailValue"])
+            if (trail_value >= 0) if params["side"] == "sell" else (trail_value <= 0):
+                raise FtxRestApiException("Invalid trail value")
+        elif params.get("triggerPrice") is None:
+            raise FtxRestApiException("Missing parameter triggerPrice")
+
+        order = {
+            "id": next(self._order_ids),
+            "market": market,
+            "future": market,
+            "side": params["side"],
+            "type": order_type,
+            "orderType": "market" if params.get("orderPrice") is None else "limit",
+            "orderPrice": float(params["orderPrice"]) if params.get("orderPrice") is not None else None,
+            "triggerPrice": float(params["triggerPrice"]) if order_type != "trailing_stop" else None,
+            "trailValue": float(params["trailValue"]) if order_type == "trailing_stop" else None,
+            "size": float(params["size"]),
+            "reduceOnly": bool(params.get("reduceOnly", False)),
+            "retryUntilFilled": params.get("orderPrice") is None,
+            "status": "open",
+            "filledSize": 0.0,
+            "avgFillPrice": None,
+            "createdAt": self._get_iso_time(),
+            "triggeredAt": None
+        }
+
+        self._conditional_orders[order["id"]] = order
+        if order_type == "trailing_stop":
+            self._trailing_prices[order["id"]] = self._prices[market]
+            self._get_trigger_price(order["id"], self._prices[market])
+
+        return dict(order)
+
+    def _new_order(self, market: str, side: str, order_type: str, price: Optional[float], size: float,
+                   reduce_only: bool) -> dict:
+        """
+        :param market: Name of the market
+        :param side: Side of the order (buy or sell)
+        :param order_type: Type of the order (market or limit)
+        :param price: Price of a limit order, None for a market order
+        :param size: Size of the order
+        :param reduce_only: True if the order can only reduce the position
+        :return: A new FTX formatted order
+        """
+        return {
+            "id": next(self._order_ids),
+            "clientId": None,
+            "market": market,
+            "future": market,
+            "type": order_type,
+            "side": side,
+            "price": price,
+            "size": size,
+            "filledSize": 0.0,
+            "remainingSize": size,
+            "avgFillPrice": None,
+            "status": "open" if order_type == "limit" else "new",
+            "createdAt": self._get_iso_time(),
+            "reduceOnly": reduce_only,
+            "ioc": order_type == "market",
+            "postOnly": False
+        }
+
+    def _fill_order(self, order: dict, fill_price: float, fee_rate: float) -> None:
+        """
+        Fill an order and update the position of its market
+
+        :param order: The FTX formatted order
+        :param fill_price: The fill price
+        :param fee_rate: The fee rate to apply
+        """
+        self._orders.pop(order["id"], None)
+        market = order["market"]
+        size = self._get_order_size(market, order["side"], order["remainingSize"], order["reduceOnly"])
+
+        order["filledSize"] = size
+        order["remainingSize"] = 0.0
+        order["avgFillPrice"] = fill_price if size > 0 else None
+        order["status"] = "closed"
+
+        if size == 0:
+            return
+
+        position = self._positions.setdefault(market, {"net_size": 0.0, "entry_price": None, "realized_pnl": 0.0,
+                                                       "trade_pnl": 0.0})
+        signed_size = size if order["side"] == "buy" else -size
+        net_size = position["net_size"]
+
+        if net_size == 0 or (net_size > 0) == (signed_size > 0):
+            # Increase the position
+            cost = abs(net_size) * (position["entry_price"] or 0) + size * fill_price
+            position["entry_price"] = cost / (abs(net_size) + size)
+        else:
+            # Reduce (and maybe flip) the position
+            closed_size = min(abs(net_size), size)
+            pnl = closed_size * (fill_price - position["entry_price"]) * (1 if net_size > 0 else -1)
+            position["realized_pnl"] += pnl
+            position["trade_pnl"] += pnl
+            self.balance += pnl
+            if size > abs(net_size):
+                position["entry_price"] = fill_price
+            elif size == abs(net_size):
+                position["entry_price"] = None
+
+        position["net_size"] = round(net_size + signed_size, 12)
+        fee = size * fill_price * fee_rate
+        self.fees += fee
+        self.balance -= fee
+        position["trade_pnl"] -= fee
+
+        if net_size != 0 and (position["net_size"] == 0 or (position["net_size"] > 0) != (net_size > 0)):
+            # The position has been closed (or flipped)
+            self.trade_pnls.append(position["trade_pnl"])
+            position["trade_pnl"] = 0.0
+
+        if position["net_size"] == 0:
+            # Reduce only trigger orders are useless without position
+            for order_id in [order_id for order_id, conditional_order in self._conditional_orders.items()
+                             if conditional_order["market"] == market and conditional_order["reduceOnly"]]:
+                self._cancel(self._conditional_orders, order_id)
+
+    def _get_order_size(self, market: str, side: str, size: float, reduce_only: bool) -> float:
+        """
+        :param market: Name of the market
+        :param side: Side of the order (buy or sell)
+        :param size: Requested size
+        :param reduce_only: True if the order can only reduce the position
+        :return: The size of an order, capped to the position size for reduce only orders
+        """
+        if not reduce_only:
+            return size
+
+        net_size = self._positions[market]["net_size"] if market in self._positions else 0
+        reducible_size = max(net_size, 0) if side == "sell" else max(-net_size, 0)
+        return min(size, reducible_size)
+
+    def _check_collateral(self, market: str, side: str, size: float, price: float) -> None:
+        """
+        Check there is enough free collateral to increase a position
+
+        :param market: Name of the market
+        :param side: Side of the order (buy or sell)
+        :param size: Size of the order
+        :param price: Execution price of the order
+        :raise FtxRestApiException: If there is not enough collateral
+        """
+        net_size = self._positions[market]["net_size"] if market in self._positions else 0
+        is_reducing = net_size > 0 if side == "sell" else net_size < 0
+        increased_size = max(size - abs(net_size), 0) if is_reducing else size
+
+        if increased_size * price / self.leverage > self._get_free_collateral():
+            raise FtxRestApiException("Not enough balances")
+
+    def _cancel(self, orders: Dict[int, dict], order_id: int) -> None:
+        """
+        Cancel an open order or trigger order
+
+        :param orders: The orders the order belongs to
+        :param order_id: The order id
+        """
+        order = orders.pop(order_id)
+        order["status"] = "cancelled" if orders is self._conditional_orders else "closed"
+        self._trailing_prices.pop(order_id, None)
+
+    def _check_market(self, market: str) -> str:
+        """
+        :param market: Name of the market
+        :return: The market name
+        :raise FtxRestApiException: If no price has been received for the market
+        """
+        if market not in self._prices:
+            raise FtxRestApiException(f"No such market: {market}")
+        return market
+
+    def _get_execution_price(self, price: float, side: str) -> float:
+        """
+        :param price: Price of the market
+        :param side: Side of the order (buy or sell)
+        :return: The price at which a market order of the given side is filled (ask for buy orders, bid for sell ones)
+        """
+        return price * (1 + self.spread / 2) if side == "buy" else price * (1 - self.spread / 2)
+
+    def _get_unrealized_pnl(self, market: str) -> float:
+        """
+        :param market: Name of the market
+        :return: Unrealized pnl of the position of a market
+        """
+        position = self._positions[market]
+        if position["net_size"] == 0:
+            return 0.0
+        return position["net_size"] * (self._prices[market] - position["entry_price"])
+
+    def _get_collateral_used(self, market: str) -> float:
+        """
+        :param market: Name of the market
+        :return: Collateral used by the position of a market
+        """
+        return abs(self._positions[market]["net_size"]) * self._prices[market] / self.leverage
+
+    def _get_free_collateral(self) -> float:
+        """
+        :return: The collateral available to open new positions
+        """
+        return self.balance + sum(self._get_unrealized_pnl(market) - self._get_collateral_used(market)
+                                  for market in self._positions)
+
+    def _get_market(self, market: str) -> dict:
+        """
+        :param market: Name of the market
+        :return: The FTX formatted market
+        """
+        price = self._prices[market]
+        return {
+            "name": market,
+            "price": price,
+            "ask": self._get_execution_price(price, "buy"),
+            "bid": self._get_execution_price(price, "sell"),
+            "last": price,
+            "change1h": 0.0,
+            "change24h": 0.0,
+            "sizeIncrement": self.size_increments.get(market, DEFAULT_SIZE_INCREMENT)
+        }
+
+    def _get_wallet(self) -> dict:
+        """
+        :return: The FTX formatted USD wallet
+        """
+        free = max(self._get_free_collateral(), 0)
+        return {
+            "coin": "USD",
+            "total": self.balance,
+            "free": free,
+            "availableWithoutBorrow": free,
+            "usdValue": self.balance,
+            "spotBorrow": 0.0
+        }
+
+    def _get_position(self, market: str) -> dict:
+        """
+        :param market: Name of the market
+        :return: The FTX formatted position of a market
+        """
+        position = self._positions[market]
+        net_size = position["net_size"]
+        long_order_size = sum(order["remainingSize"] for order in self._orders.values()
+                              if order["market"] == market and order["side"] == "buy")
+        short_order_size = sum(order["remainingSize"] for order in self._orders.values()
+                               if order["market"] == market and order["side"] == "sell")
+        collateral_used = self._get_collateral_used(market)
+
+        return {
+            "future": market,
+            "size": abs(net_size),
+            "side": "sell" if net_size < 0 else "buy",
+            "netSize": net_size,
+            "longOrderSize": long_order_size,
+            "shortOrderSize": short_order_size,
+            "cost": net_size * (position["entry_price"] or 0),
+            "entryPrice": position["entry_price"],
+            "unrealizedPnl": self._get_unrealized_pnl(market),
+            "realizedPnl": position["realized_pnl"],
+            "initialMarginRequirement": 1 / self.leverage,
+            "maintenanceMarginRequirement": 0.03,
+            # Maximum size held if all the open orders are filled
+            "openSize": max(abs(net_size + long_order_size), abs(net_size - short_order_size)),
+            "collateralUsed": collateral_used,
+            "estimatedLiquidationPrice": None
+        }
+
+    def _get_iso_time(self) -> str:
+        """
+        :return: Current time of the clock in FTX format
+        """
+        return datetime.datetime.fromtimestamp(self.clock.time(), datetime.timezone.utc).isoformat()
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class CandleUpsertResultEnum(Enum):
+    """Candle upsert result enum"""
+
+    UNCHANGED = 0
+    APPENDED = 1
+    LAST_UPDATED = 2
+    UPDATED = 3
+    INSERTED = 4
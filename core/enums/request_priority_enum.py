@@ -0,0 +1,9 @@
+from enum import Enum
+
+
+class RequestPriorityEnum(Enum):
+    """Request priority enum (lowest value first)"""
+
+    ORDER = 0
+    ACCOUNT = 1
+    MARKET_DATA = 2
@@ -0,0 +1,91 @@
+import json
+import operator
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from core.stock.trade_candle_aggregator import TradeCandleAggregator
+from tools.utils import format_ohlcv_raw_data_list
+
+# Trade record type: FTX websocket and REST trades as typed columns
+TRADE_DTYPE: np.dtype = np.dtype([("id", np.int64), ("time", np.float64), ("price", np.float64),
+                                  ("size", np.float64), ("is_buy", np.bool_), ("liquidation", np.bool_)])
+# Orderbook level record type
+ORDERBOOK_LEVEL_DTYPE: np.dtype = np.dtype([("price", np.float64), ("size", np.float64)])
+
+_get_trade_values = operator.itemgetter("id", "price", "size", "side", "liquidation", "time")
+
+
+def _get_fastest_loads() -> Callable[[Union[str, bytes]], Any]:
+    """
+    :return: The loads function of the fastest installed JSON parser (orjson, then ujson, then the standard library)
+    """
+    try:
+        import orjson
+        return orjson.loads
+    except ImportError:
+        pass
+
+    try:
+        import ujson
+        return ujson.loads
+    except ImportError:
+        return json.loads
+
+
+class FtxJsonDecoder(object):
+    """
+    Decoder of FTX REST and websocket payloads. Parses JSON with the fastest installed parser, and converts candle,
+    trade and orderbook arrays to typed numpy records in one pass instead of formatting them row by row
+    """
+
+    def __init__(self, loads: Optional[Callable[[Union[str, bytes]], Any]] = None):
+        """
+        FTX JSON decoder constructor
+
+        :param loads: Function parsing a JSON document (ie: json.loads). The fastest installed parser if None
+        """
+        self.loads: Callable[[Union[str, bytes]], Any] = loads if loads is not None else _get_fastest_loads()
+
+    def decode(self, payload: Union[str, bytes]) -> Any:
+        """
+        :param payload: A JSON document
+        :return: The parsed document
+        :raise ValueError: If the document is not valid JSON
+        """
+        return self.loads(payload)
+
+    @staticmethod
+    def to_candle_records(raw_candles: List[Dict[str, Any]], time_frame_length: int) -> np.ndarray:
+        """
+        Convert FTX candles (markets/{market_name}/candles result) to candle records
+
+        :param raw_candles: The FTX candles
+        :param time_frame_length: The length of the time frame in seconds
+        :return: The candle records (CANDLE_DTYPE)
+        """
+        return format_ohlcv_raw_data_list(raw_candles, time_frame_length)
+
+    @staticmethod
+    def to_trade_records(raw_trades: List[Dict[str, Any]]) -> np.ndarray:
+        """
+        Convert FTX trades (trades channel data or markets/{market_name}/trades result) to trade records
+
+        :param raw_trades: The FTX trades
+        :return: The trade records (TRADE_DTYPE)
+        """
+        return np.array([(trade_id, TradeCandleAggregator.parse_trade_time(trade_time), price, size, side == "buy",
+                          liquidation)
+                         for trade_id, price, size, side, liquidation, trade_time
+                         in map(_get_trade_values, raw_trades)], dtype=TRADE_DTYPE)
+
+    @staticmethod
+    def to_orderbook_levels(raw_levels: List[List[float]]) -> np.ndarray:
+        """
+        Convert FTX orderbook levels (bids or asks of the orderbook channel data) to orderbook level records
+
+        :param raw_levels: The FTX [price, size] levels
+        :return: The orderbook level records (ORDERBOOK_LEVEL_DTYPE)
+        """
+        return np.ascontiguousarray(np.array(raw_levels, dtype=np.float64).reshape(-1, 2)) \
+            .view(ORDERBOOK_LEVEL_DTYPE).reshape(-1)
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+from requests import Request
+from yarl import URL
+
+import config.private.ftx_config as ftx_config
+from core.enums.request_priority_enum import RequestPriorityEnum
+from core.ftx.rest.ftx_rest_api import FtxRestApi, REST_POOL_SIZE, REST_TOO_MANY_REQUESTS_MAX_RETRY, \
+    REST_TOO_MANY_REQUESTS_MIN_RETRY_DELAY
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+
+
+class AsyncFtxRestApi(object):
+    """
+    Asyncio FTX REST api client. Same surface as FtxRestApi with coroutines, so that one event loop can send many
+    requests at once. Requests share the FtxRestApi rate limiters
+
+    ie:
+        async with AsyncFtxRestApi() as ftx_rest_api:
+            candles = await ftx_rest_api.gather_candles(["BTC-PERP", "ETH-PERP"], 60)
+    """
+
+    _ENDPOINT = ftx_config.rest_endpoint
+
+    def __init__(self, pool_size: int = REST_POOL_SIZE):
+        """
+        Async FTX REST api constructor
+
+        :param pool_size: Maximum number of connections kept alive (and of requests in flight)
+        """
+        self._pool_size: int = pool_size
+        self._session: Optional[aiohttp.ClientSession] = None  # Created in the event loop on first request
+        self._api_key = ftx_config.api['key']
+        self._api_secret = ftx_config.api['secret']
+        self._api_sub_account = ftx_config.api['sub_account']
+
+    # Same request signing as FtxRestApi
+    _sign_request = FtxRestApi._sign_request
+
+    async def __aenter__(self) -> 'AsyncFtxRestApi':
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+                  priority: Optional[RequestPriorityEnum] = None) -> Any:
+        return await self._request('GET', path, priority, params=params)
+
+    async def post(self, path: str, params: Optional[Dict[str, Any]] = None,
+                   priority: Optional[RequestPriorityEnum] = None) -> Any:
+        return await self._request('POST', path, priority, json=params)
+
+    async def delete(self, path: str, params: Optional[Dict[str, Any]] = None,
+                     priority: Optional[RequestPriorityEnum] = None) -> Any:
+        return await self._request('DELETE', path, priority, json=params)
+
+    async def close(self) -> None:
+        """Close the connections"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def gather_candles(self, markets: List[str], resolution: int,
+                             params: Optional[Dict[str, Any]] = None) -> Dict[str, List[dict]]:
+        """
+        Retrieve the candles of many markets concurrently. Markets whose request failed are logged and left out
+
+        :param markets: Names of the markets (ex: BTC-PERP)
+        :param resolution: The length of the candles in seconds
+        :param params: Other request parameters (limit, start_time, end_time)
+        :return: The FTX raw candles of each market { [market]: candles }
+        """
+        return await self._gather({market: self.get(f"markets/{market}/candles", dict(params or {},
+                                                                                        resolution=resolution))
+                                   for market in markets})
+
+    async def gather_markets(self, names: List[str]) -> Dict[str, dict]:
+        """
+        Retrieve many markets concurrently. Markets whose request failed are logged and left out
+
+        :param names: Names of the markets (ex: BTC-PERP)
+        :return: The FTX raw market of each name { [name]: market }
+        """
+        return await self._gather({name: self.get(f"markets/{name}") for name in names})
+
+    @staticmethod
+    async def _gather(requests: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run requests concurrently
+
+        :param requests: The request coroutines { [key]: coroutine }
+        :return: The result of each successful request { [key]: result }
+        """
+        results = await asyncio.gather(*requests.values(), return_exceptions=True)
+        successful_results = {}
+
+        for key, result in zip(requests, results):
+            if isinstance(result, Exception):
+                logging.error(f"FTX API: Http request failed for {key}. Details: {str(result)}")
+            else:
+                successful_results[key] = result
+
+        return successful_results
+
+    async def _request(self, method: str, path: str, priority: Optional[RequestPriorityEnum], **kwargs) -> Any:
+        rate_limiter = FtxRestApi.get_rate_limiter(method, path)
+        priority = priority if priority is not None else FtxRestApi.get_request_priority(method, path)
+        retry_delay = REST_TOO_MANY_REQUESTS_MIN_RETRY_DELAY
+
+        for retry in range(REST_TOO_MANY_REQUESTS_MAX_RETRY + 1):
+            await rate_limiter.acquire_async(priority=priority.value)
+            await FtxRestApi.rate_limiter.acquire_async(priority=priority.value)
+
+            request = Request(method, AsyncFtxRestApi._ENDPOINT + path, **kwargs)
+            if self._api_key:
+                self._sign_request(request)
+            prepared = request.prepare()
+
+            # The url is sent as prepared (and signed): it must not be quoted again
+            async with self._get_session().request(method, URL(prepared.url, encoded=True), data=prepared.body,
+                                                   headers=dict(prepared.headers)) as response:
+                if response.status != 429 or retry == REST_TOO_MANY_REQUESTS_MAX_RETRY:
+                    return await AsyncFtxRestApi._process_response(response)
+
+            FtxRestApi.record_too_many_requests_retry()
+            await asyncio.sleep(retry_delay)
+            retry_delay *= 2
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        :return: The client session, created on first call
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=self._pool_size))
+
+        return self._session
+
+    @staticmethod
+    async def _process_response(response: aiohttp.ClientResponse) -> Any:
+        try:
+            data = FtxRestApi.json_decoder.decode(await response.read())
+        except ValueError:
+            response.raise_for_status()
+            raise
+        else:
+            if not data['success']:
+                raise FtxRestApiException(data['error'])
+            return data['result']
@@ -1,13 +1,30 @@
 import hmac
+import re
 import threading
 import time
 import urllib.parse
 from typing import Optional, Dict, Any
 
 from requests import Request, Session, Response
+from requests.adapters import HTTPAdapter
 
 import config.private.ftx_config as ftx_config
+from core.enums.request_priority_enum import RequestPriorityEnum
+from core.ftx.ftx_json_decoder import FtxJsonDecoder
+from core.ftx.rest.response_cache import ResponseCache
+from core.models.rate_limit_metrics_dict import RateLimitMetricsDict
 from exceptions.ftx_rest_api_exception import FtxRestApiException
+from tools.priority_token_bucket import PriorityTokenBucket
+
+REST_POOL_SIZE = 20  # Maximum number of connections kept alive (and of requests in flight) per FtxRestApi instance
+# FTX api rate limit is 10 requests per second: every request draws from a global rate limiter holding this budget,
+# where waiting requests are served by priority (orders first). Public (market data) and private (account, orders)
+# requests also draw from their own rate limiter first, so that market data never takes the whole budget
+REST_MAX_REQUESTS_PER_SECOND = 10
+REST_PUBLIC_MAX_REQUESTS_PER_SECOND = 8
+REST_PRIVATE_MAX_REQUESTS_PER_SECOND = 10
+REST_TOO_MANY_REQUESTS_MAX_RETRY = 3  # Number of times a request is sent again after an HTTP 429 response
+REST_TOO_MANY_REQUESTS_MIN_RETRY_DELAY = 0.5  # Doubled on each retry
 
 api = {
     'public': {
@@ -139,33 +156,152 @@ api = {
 }
 
 
+# GET paths of the private endpoints (ie: 'orders/{order_id}' -> 'orders/[^/]+')
+_PRIVATE_GET_PATH_PATTERN = re.compile('|'.join(re.sub(r'{\w+}', '[^/]+', path) for path in api['private']['get']))
+# Paths of the order placement, modification and cancel endpoints
+_ORDER_PATH_PATTERN = re.compile(r'(orders|conditional_orders)(/.*)?')
+
+
 class FtxRestApi(object):
+    """
+    FTX REST api client. Requests are sent concurrently over a pool of keep-alive connections, under rate limits
+    shared by every instance. Requests waiting for a rate limit token are served by priority: orders first, then
+    account requests, then market data
+    """
+
     _ENDPOINT = ftx_config.rest_endpoint
-    _LOCK: threading.Lock = threading.Lock()
+    rate_limiter: PriorityTokenBucket = PriorityTokenBucket(REST_MAX_REQUESTS_PER_SECOND, REST_MAX_REQUESTS_PER_SECOND)
+    public_rate_limiter: PriorityTokenBucket = PriorityTokenBucket(REST_PUBLIC_MAX_REQUESTS_PER_SECOND,
+                                                                   REST_PUBLIC_MAX_REQUESTS_PER_SECOND)
+    private_rate_limiter: PriorityTokenBucket = PriorityTokenBucket(REST_PRIVATE_MAX_REQUESTS_PER_SECOND,
+                                                                    REST_PRIVATE_MAX_REQUESTS_PER_SECOND)
+    json_decoder: FtxJsonDecoder = FtxJsonDecoder()  # Parser of the responses
+    _too_many_requests_retry_number: int = 0
+    _metrics_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, pool_size: int = REST_POOL_SIZE, response_cache: Optional[ResponseCache] = None):
+        """
+        FTX REST api constructor
 
-    def __init__(self):
-        self._session = Session()
+        :param pool_size: Maximum number of connections kept alive. Requests wait for a free connection when they are
+        all in use
+        :param response_cache: Cache of the GET responses of hot endpoints (ie: markets/{market_name}). It is cleared
+        after each POST or DELETE request. No cache if None
+        """
+        self.response_cache: Optional[ResponseCache] = response_cache
+        self._adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self._thread_local = threading.local()  # One session per thread, all sharing the connection pool
         self._api_key = ftx_config.api['key']
         self._api_secret = ftx_config.api['secret']
         self._api_sub_account = ftx_config.api['sub_account']
 
-    def get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        return self._request('GET', path, params=params)
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            priority: Optional[RequestPriorityEnum] = None) -> Any:
+        ttl = self.response_cache.get_ttl(path) if self.response_cache is not None else None
+
+        if ttl is None:
+            return self._request('GET', path, priority, params=params)
 
-    def post(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        return self._request('POST', path, json=params)
+        key = path + '?' + urllib.parse.urlencode(sorted(params.items())) if params else path
+        return self.response_cache.get(key, ttl, lambda: self._request('GET', path, priority, params=params))
 
-    def delete(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
-        return self._request('DELETE', path, json=params)
+    def post(self, path: str, params: Optional[Dict[str, Any]] = None,
+             priority: Optional[RequestPriorityEnum] = None) -> Any:
+        try:
+            return self._request('POST', path, priority, json=params)
+        finally:
+            if self.response_cache is not None:
+                self.response_cache.clear()
+
+    def delete(self, path: str, params: Optional[Dict[str, Any]] = None,
+               priority: Optional[RequestPriorityEnum] = None) -> Any:
+        try:
+            return self._request('DELETE', path, priority, json=params)
+        finally:
+            if self.response_cache is not None:
+                self.response_cache.clear()
+
+    def _request(self, method: str, path: str, priority: Optional[RequestPriorityEnum], **kwargs) -> Any:
+        rate_limiter = FtxRestApi.get_rate_limiter(method, path)
+        priority = priority if priority is not None else FtxRestApi.get_request_priority(method, path)
+        retry_delay = REST_TOO_MANY_REQUESTS_MIN_RETRY_DELAY
+
+        for retry in range(REST_TOO_MANY_REQUESTS_MAX_RETRY + 1):
+            # Request type budget first, then the global budget where orders get ahead of any other waiting request
+            rate_limiter.acquire(priority=priority.value)
+            FtxRestApi.rate_limiter.acquire(priority=priority.value)
 
-    def _request(self, method: str, path: str, **kwargs) -> Any:
-        with FtxRestApi._LOCK:
             request = Request(method, FtxRestApi._ENDPOINT + path, **kwargs)
             if self._api_key:
                 self._sign_request(request)
-            response = self._session.send(request.prepare())
+            response = self._get_session().send(request.prepare())
+
+            if response.status_code != 429 or retry == REST_TOO_MANY_REQUESTS_MAX_RETRY:
+                return FtxRestApi._process_response(response)
+
+            FtxRestApi.record_too_many_requests_retry()
+            time.sleep(retry_delay)
+            retry_delay *= 2
+
+    @staticmethod
+    def get_request_priority(method: str, path: str) -> RequestPriorityEnum:
+        """
+        :param method: The HTTP method
+        :param path: The endpoint path (ie: markets/BTC-PERP/candles)
+        :return: The default priority of the endpoint: order placements and cancels first, then account requests, then
+        market data
+        """
+        if method != 'GET' and _ORDER_PATH_PATTERN.fullmatch(path) is not None:
+            return RequestPriorityEnum.ORDER
+        if FtxRestApi.get_rate_limiter(method, path) is FtxRestApi.private_rate_limiter:
+            return RequestPriorityEnum.ACCOUNT
+        return RequestPriorityEnum.MARKET_DATA
+
+    @staticmethod
+    def record_too_many_requests_retry() -> None:
+        """Count a request sent again after an HTTP 429 response"""
+        with FtxRestApi._metrics_lock:
+            FtxRestApi._too_many_requests_retry_number += 1
+
+    @staticmethod
+    def get_rate_limit_metrics() -> RateLimitMetricsDict:
+        """
+        :return: Time waited for a rate limit token in each priority lane, and number of HTTP 429 retries
+        """
+        return {
+            "lanes": {RequestPriorityEnum(priority).name: metrics
+                      for priority, metrics in FtxRestApi.rate_limiter.get_metrics().items()},
+            "public_lanes": {RequestPriorityEnum(priority).name: metrics
+                             for priority, metrics in FtxRestApi.public_rate_limiter.get_metrics().items()},
+            "private_lanes": {RequestPriorityEnum(priority).name: metrics
+                              for priority, metrics in FtxRestApi.private_rate_limiter.get_metrics().items()},
+            "too_many_requests_retry_number": FtxRestApi._too_many_requests_retry_number
+        }
+
+    @staticmethod
+    def get_rate_limiter(method: str, path: str) -> PriorityTokenBucket:
+        """
+        :param method: The HTTP method
+        :param path: The endpoint path (ie: markets/BTC-PERP/candles)
+        :return: The request type rate limiter of the endpoint: private for every account endpoint, public otherwise.
+        Requests also draw from the global rate limiter
+        """
+        is_private = method != 'GET' or _PRIVATE_GET_PATH_PATTERN.fullmatch(path) is not None
+        return FtxRestApi.private_rate_limiter if is_private else FtxRestApi.public_rate_limiter
+
+    def _get_session(self) -> Session:
+        """
+        :return: The session of the calling thread
+        """
+        session = getattr(self._thread_local, 'session', None)
+
+        if session is None:
+            session = Session()
+            session.mount('https://', self._adapter)
+            session.mount('http://', self._adapter)
+            self._thread_local.session = session
 
-            return FtxRestApi._process_response(response)
+        return session
 
     def _sign_request(self, request: Request) -> None:
         ts = int(time.time() * 1000)
@@ -183,7 +319,7 @@ class FtxRestApi(object):
     @staticmethod
     def _process_response(response: Response) -> Any:
         try:
-            data = response.json()
+            data = FtxRestApi.json_decoder.decode(response.content)
         except ValueError:
             response.raise_for_status()
             raise
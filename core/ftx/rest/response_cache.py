@@ -0,0 +1,131 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from core.models.response_cache_metrics_dict import ResponseCacheMetricsDict
+
+RESPONSE_CACHE_MAX_SIZE = 1000  # Maximum number of cached responses, the least recently used ones are evicted first
+# Time to live of the cached responses in seconds { [endpoint path pattern]: ttl }
+RESPONSE_CACHE_TTLS = {
+    'markets': 5,
+    'markets/{market_name}': 1,
+    'wallet/balances': 1,
+    'positions': 1
+}
+
+
+class _Flight(object):
+    """Request in flight, shared by the identical requests sent meanwhile"""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done: threading.Event = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class ResponseCache(object):
+    """
+    Short lived LRU cache of GET responses. Concurrent identical requests are sent once: the requests arriving while it
+    is in flight wait for its response. Cached responses are shared, they must not be modified
+    """
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, max_size: int = RESPONSE_CACHE_MAX_SIZE):
+        """
+        Response cache constructor
+
+        :param ttls: Time to live of the responses of each endpoint in seconds (ie: {'markets/{market_name}': 1}).
+        Responses of the other endpoints are not cached. RESPONSE_CACHE_TTLS if None
+        :param max_size: Maximum number of cached responses
+        """
+        self.max_size: int = max_size
+        self._ttls: List[Tuple[Pattern, float]] = [(re.compile(re.sub(r'{\w+}', '[^/]+', path)), ttl) for path, ttl
+                                                   in (ttls if ttls is not None else RESPONSE_CACHE_TTLS).items()]
+        self._entries: OrderedDict = OrderedDict()  # { [request key]: (expiration time, response) }, oldest used first
+        self._flights: Dict[str, _Flight] = {}  # { [request key]: request in flight }
+        self._lock: threading.Lock = threading.Lock()
+        self._hit_number: int = 0
+        self._miss_number: int = 0
+        self._shared_request_number: int = 0
+
+    def get_ttl(self, path: str) -> Optional[float]:
+        """
+        :param path: The endpoint path (ie: markets/BTC-PERP)
+        :return: The time to live of the endpoint responses, None if they are not cached
+        """
+        for pattern, ttl in self._ttls:
+            if pattern.fullmatch(path) is not None:
+                return ttl
+        return None
+
+    def get(self, key: str, ttl: float, send_request: Callable[[], Any]) -> Any:
+        """
+        Return a cached response, or send the request and cache its response
+
+        :param key: The request key (path and parameters)
+        :param ttl: Time to live of the response in seconds
+        :param send_request: Function sending the request and returning its response
+        :return: The response
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self._hit_number += 1
+                return entry[1]
+
+            flight = self._flights.get(key)
+            is_sender = flight is None
+
+            if is_sender:
+                flight = self._flights[key] = _Flight()
+                self._miss_number += 1
+            else:
+                self._shared_request_number += 1
+
+        if not is_sender:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = send_request()
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+
+                if flight.error is None:
+                    self._entries[key] = (time.monotonic() + ttl, flight.result)
+                    self._entries.move_to_end(key)
+
+                    while len(self._entries) > self.max_size:
+                        self._entries.popitem(last=False)
+
+            flight.done.set()
+
+        return flight.result
+
+    def clear(self) -> None:
+        """Forget every cached response (ie: after an order changed the wallet balances and positions)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_metrics(self) -> ResponseCacheMetricsDict:
+        """
+        :return: The number of cache hits, misses and shared requests
+        """
+        with self._lock:
+            return {
+                "hit_number": self._hit_number,
+                "miss_number": self._miss_number,
+                "shared_request_number": self._shared_request_number,
+                "size": len(self._entries)
+            }
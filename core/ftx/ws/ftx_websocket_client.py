@@ -1,18 +1,20 @@
 import hmac
-import json
 import time
-import zlib
 from collections import defaultdict, deque
-from itertools import zip_longest
-from typing import DefaultDict, Deque, List, Dict, Tuple, Optional
+from typing import Callable, DefaultDict, Deque, List, Dict, Tuple, Optional
 from gevent.event import Event
 import config.private.ftx_config as ftx_config
 
+from core.enums.side_enum import SideEnum
+from core.ftx.ftx_json_decoder import FtxJsonDecoder
+from core.models.orderbook_snapshot_dict import OrderbookSnapshotDict
+from core.stock.orderbook import Orderbook
 from tools.communication.websocket_manager import WebsocketManager
 
 
 class FtxWebsocketClient(WebsocketManager):
     _ENDPOINT = ftx_config.ws_endpoint
+    json_decoder: FtxJsonDecoder = FtxJsonDecoder()  # Parser of the received messages
 
     def __init__(self):
         super(FtxWebsocketClient, self).__init__()
@@ -22,19 +24,44 @@ class FtxWebsocketClient(WebsocketManager):
         self._api_secret = ftx_config.api['secret']
         self._api_sub_account = ftx_config.api['sub_account']
         self._orderbook_update_events: DefaultDict[str, Event] = defaultdict(Event)
+        self._trades_listeners: DefaultDict[str, List[Callable[[List[Dict]], None]]] = defaultdict(list)
+        self._reconnect_listeners: List[Callable[[], None]] = []
+        self._disconnect_listeners: List[Callable[[], None]] = []
+        self._connected_once: bool = False
         self._reset_data()
 
     def _on_open(self, ws) -> None:
+        if not self._connected_once:
+            self._connected_once = True
+            return
+
+        # Reconnection: subscriptions are lost and data received before may be incomplete
+        orderbook_subscriptions = [subscription for subscription in self._subscriptions
+                                   if subscription.get('channel') == 'orderbook']
         self._reset_data()
 
+        for market, listeners in list(self._trades_listeners.items()):
+            if len(listeners) > 0:
+                self._subscribe({'channel': 'trades', 'market': market})
+
+        # Orderbooks are kept live: readers must not wait for a new subscription after each reconnection
+        for subscription in orderbook_subscriptions:
+            self._subscribe(subscription)
+
+        for listener in list(self._reconnect_listeners):
+            listener()
+
+    def _on_disconnect(self) -> None:
+        for listener in list(self._disconnect_listeners):
+            listener()
+
     def _reset_data(self) -> None:
         self._subscriptions: List[Dict] = []
         self._orders: DefaultDict[int, Dict] = defaultdict(dict)
         self._tickers: DefaultDict[str, Dict] = defaultdict(dict)
         self._orderbook_timestamps: DefaultDict[str, float] = defaultdict(float)
         self._orderbook_update_events.clear()
-        self._orderbooks: DefaultDict[str, Dict[str, DefaultDict[float, float]]] = defaultdict(
-            lambda: {side: defaultdict(float) for side in {'bids', 'asks'}})
+        self._orderbooks: DefaultDict[str, Orderbook] = defaultdict(Orderbook)
         self._orderbook_timestamps.clear()
         self._logged_in = False
         self._last_received_orderbook_data_at: float = 0.0
@@ -69,6 +96,25 @@ class FtxWebsocketClient(WebsocketManager):
         while subscription in self._subscriptions:
             self._subscriptions.remove(subscription)
 
+    def remove_market(self, market: str) -> None:
+        """
+        Unsubscribe from every channel of a market, dropping its data and its trades listeners
+
+        :param market: The market
+        """
+        for subscription in [subscription for subscription in self._subscriptions
+                             if subscription.get('market') == market]:
+            if self.is_connected():
+                self._unsubscribe(subscription)
+            else:  # Subscriptions are lost anyway on reconnection
+                while subscription in self._subscriptions:
+                    self._subscriptions.remove(subscription)
+
+        self._trades_listeners.pop(market, None)
+        self._trades.pop(market, None)
+        self._tickers.pop(market, None)
+        self._reset_orderbook(market)
+
     def get_fills(self) -> List[Dict]:
         if not self._logged_in:
             self._login()
@@ -91,20 +137,84 @@ class FtxWebsocketClient(WebsocketManager):
             self._subscribe(subscription)
         return list(self._trades[market].copy())
 
-    def get_orderbook(self, market: str) -> Dict[str, List[Tuple[float, float]]]:
+    def add_trades_listener(self, market: str, listener: Callable[[List[Dict]], None]) -> None:
+        """
+        Call a listener with each trade list received on a market. Trades subscription is kept on reconnection
+
+        :param market: The market
+        :param listener: Function called with the received trades
+        """
+        self._trades_listeners[market].append(listener)
+        subscription = {'channel': 'trades', 'market': market}
+        if subscription not in self._subscriptions:
+            self._subscribe(subscription)
+
+    def remove_trades_listener(self, market: str, listener: Callable[[List[Dict]], None]) -> None:
+        if listener in self._trades_listeners[market]:
+            self._trades_listeners[market].remove(listener)
+
+    def add_reconnect_listener(self, listener: Callable[[], None], market: Optional[str] = None) -> None:
+        """
+        Call a listener each time the websocket connection is opened again. Some messages may have been missed
+
+        :param listener: Function called on reconnection
+        :param market: The market the listener follows. Unused: a reconnection affects every market
+        """
+        self._reconnect_listeners.append(listener)
+
+    def remove_reconnect_listener(self, listener: Callable[[], None], market: Optional[str] = None) -> None:
+        if listener in self._reconnect_listeners:
+            self._reconnect_listeners.remove(listener)
+
+    def add_disconnect_listener(self, listener: Callable[[], None]) -> None:
+        """
+        Call a listener each time the websocket connection is lost, before connecting again
+
+        :param listener: Function called on disconnection
+        """
+        self._disconnect_listeners.append(listener)
+
+    def remove_disconnect_listener(self, listener: Callable[[], None]) -> None:
+        if listener in self._disconnect_listeners:
+            self._disconnect_listeners.remove(listener)
+
+    def get_orderbook(self, market: str, depth: Optional[int] = None) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        :param market: The market
+        :param depth: Maximum number of levels of each side to return. All of them if None
+        :return: The (price, size) levels of each side, from the best price to the worst one { [side]: levels }
+        """
+        return self._get_live_orderbook(market).get_levels(depth)
+
+    def get_orderbook_snapshot(self, market: str) -> OrderbookSnapshotDict:
+        """
+        :param market: The market
+        :return: Best bid / ask, spread, microprice and depth imbalance of the market orderbook
+        """
+        return self._get_live_orderbook(market).get_snapshot()
+
+    def get_orderbook_vwap(self, market: str, side: SideEnum, size: float) -> Optional[float]:
+        """
+        :param market: The market
+        :param side: Side of the order
+        :param size: Size of the order
+        :return: The expected average fill price of a market order. None if the orderbook does not hold enough size
+        """
+        return self._get_live_orderbook(market).get_vwap(side, size)
+
+    def _get_live_orderbook(self, market: str) -> Orderbook:
+        """
+        Subscribe to the market orderbook if needed, waiting for its first update
+
+        :param market: The market
+        :return: The market orderbook
+        """
         subscription = {'channel': 'orderbook', 'market': market}
         if subscription not in self._subscriptions:
             self._subscribe(subscription)
         if self._orderbook_timestamps[market] == 0:
             self.wait_for_orderbook_update(market, 5)
-        return {
-            side: sorted(
-                [(price, quantity) for price, quantity in list(self._orderbooks[market][side].items())
-                 if quantity],
-                key=lambda order: order[0] * (-1 if side == 'bids' else 1)
-            )
-            for side in {'bids', 'asks'}
-        }
+        return self._orderbooks[market]
 
     def get_orderbook_timestamp(self, market: str) -> float:
         return self._orderbook_timestamps[market]
@@ -129,23 +239,11 @@ class FtxWebsocketClient(WebsocketManager):
         data = message['data']
         if data['action'] == 'partial':
             self._reset_orderbook(market)
-        for side in {'bids', 'asks'}:
-            book = self._orderbooks[market][side]
-            for price, size in data[side]:
-                if size:
-                    book[price] = size
-                else:
-                    del book[price]
-            self._orderbook_timestamps[market] = data['time']
-        checksum = data['checksum']
-        orderbook = self.get_orderbook(market)
-        checksum_data = [
-            ':'.join([f'{float(order[0])}:{float(order[1])}' for order in (bid, offer) if order])
-            for (bid, offer) in zip_longest(orderbook['bids'][:100], orderbook['asks'][:100])
-        ]
-
-        computed_result = int(zlib.crc32(':'.join(checksum_data).encode()))
-        if computed_result != checksum:
+        orderbook = self._orderbooks[market]
+        orderbook.update(data['bids'], data['asks'], data['time'])
+        self._orderbook_timestamps[market] = data['time']
+
+        if orderbook.get_checksum() != data['checksum']:
             self._last_received_orderbook_data_at = 0
             self._reset_orderbook(market)
             self._unsubscribe({'market': market, 'channel': 'orderbook'})
@@ -157,6 +255,9 @@ class FtxWebsocketClient(WebsocketManager):
     def _handle_trades_message(self, message: Dict) -> None:
         self._trades[message['market']].append(message['data'])
 
+        for listener in list(self._trades_listeners[message['market']]):
+            listener(message['data'])
+
     def _handle_ticker_message(self, message: Dict) -> None:
         self._tickers[message['market']] = message['data']
 
@@ -168,7 +269,7 @@ class FtxWebsocketClient(WebsocketManager):
         self._orders.update({data['id']: data})
 
     def _on_message(self, ws, raw_message: str) -> None:
-        message = json.loads(raw_message)
+        message = FtxWebsocketClient.json_decoder.decode(raw_message)
         message_type = message['type']
         if message_type in {'subscribed', 'unsubscribed'}:
             return
@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import threading
+from collections import defaultdict
+from functools import partial
+from typing import Callable, DefaultDict, Dict, List, Optional, Set, Tuple
+
+from core.enums.side_enum import SideEnum
+from core.ftx.ws.ftx_websocket_client import FtxWebsocketClient
+from core.models.orderbook_snapshot_dict import OrderbookSnapshotDict
+
+WS_SHARD_NUMBER = 4  # Number of websocket connections
+
+
+class ShardedFtxWebsocketClient(object):
+    """
+    FTX websocket client spreading the market subscriptions over several connections (one FtxWebsocketClient each),
+    with the same market API as FtxWebsocketClient. Markets are assigned to connections by rendezvous hashing: the
+    markets of a connection are moved to the other ones when it is lost, and moved back when it reconnects. Account
+    channels (fills and orders) use the first connection
+    """
+
+    def __init__(self, shard_number: int = WS_SHARD_NUMBER):
+        """
+        Sharded FTX websocket client constructor
+
+        :param shard_number: Number of websocket connections
+        """
+        self._shards: List[FtxWebsocketClient] = [FtxWebsocketClient() for _ in range(shard_number)]
+        self._market_shards: Dict[str, int] = {}  # { [market]: index of the connection the market is assigned to }
+        self._trades_listeners: DefaultDict[str, List[Callable[[List[Dict]], None]]] = defaultdict(list)
+        # Reconnect listeners of each market. Listeners of every market are stored with None
+        self._reconnect_listeners: DefaultDict[Optional[str], List[Callable[[], None]]] = defaultdict(list)
+        self._lock: threading.RLock = threading.RLock()
+
+        for shard_index, shard in enumerate(self._shards):
+            shard.add_disconnect_listener(partial(self._on_shard_disconnect, shard_index))
+            shard.add_reconnect_listener(partial(self._on_shard_reconnect, shard_index))
+
+    def connect(self) -> None:
+        for shard in self._shards:
+            shard.connect()
+
+    def reconnect(self) -> None:
+        for shard in self._shards:
+            shard.reconnect()
+
+    def get_shard_markets(self) -> List[List[str]]:
+        """
+        :return: The markets assigned to each connection
+        """
+        with self._lock:
+            shard_markets = [[] for _ in self._shards]
+            for market, shard_index in self._market_shards.items():
+                shard_markets[shard_index].append(market)
+            return shard_markets
+
+    def get_fills(self) -> List[Dict]:
+        return self._shards[0].get_fills()
+
+    def get_orders(self) -> Dict[int, Dict]:
+        return self._shards[0].get_orders()
+
+    def get_trades(self, market: str) -> List[Dict]:
+        return self._get_shard(market).get_trades(market)
+
+    def add_trades_listener(self, market: str, listener: Callable[[List[Dict]], None]) -> None:
+        """
+        Call a listener with each trade list received on a market. The listener follows the market when it is moved to
+        another connection
+
+        :param market: The market
+        :param listener: Function called with the received trades
+        """
+        with self._lock:
+            shard = self._get_shard(market)
+            self._trades_listeners[market].append(listener)
+            shard.add_trades_listener(market, listener)
+
+    def remove_trades_listener(self, market: str, listener: Callable[[List[Dict]], None]) -> None:
+        with self._lock:
+            if listener in self._trades_listeners[market]:
+                self._trades_listeners[market].remove(listener)
+            self._get_shard(market).remove_trades_listener(market, listener)
+
+    def add_reconnect_listener(self, listener: Callable[[], None], market: Optional[str] = None) -> None:
+        """
+        Call a listener each time the connection of a market is opened again or the market is moved to another
+        connection. Some messages of the market may have been missed
+
+        :param listener: Function called on reconnection
+        :param market: The market the listener follows. The listener is called for every market if None
+        """
+        with self._lock:
+            self._reconnect_listeners[market].append(listener)
+
+    def remove_reconnect_listener(self, listener: Callable[[], None], market: Optional[str] = None) -> None:
+        with self._lock:
+            if listener in self._reconnect_listeners[market]:
+                self._reconnect_listeners[market].remove(listener)
+
+    def get_orderbook(self, market: str, depth: Optional[int] = None) -> Dict[str, List[Tuple[float, float]]]:
+        return self._get_shard(market).get_orderbook(market, depth)
+
+    def get_orderbook_snapshot(self, market: str) -> OrderbookSnapshotDict:
+        return self._get_shard(market).get_orderbook_snapshot(market)
+
+    def get_orderbook_vwap(self, market: str, side: SideEnum, size: float) -> Optional[float]:
+        return self._get_shard(market).get_orderbook_vwap(market, side, size)
+
+    def get_orderbook_timestamp(self, market: str) -> float:
+        return self._get_shard(market).get_orderbook_timestamp(market)
+
+    def wait_for_orderbook_update(self, market: str, timeout: Optional[float]) -> None:
+        self._get_shard(market).wait_for_orderbook_update(market, timeout)
+
+    def get_ticker(self, market: str) -> Dict:
+        return self._get_shard(market).get_ticker(market)
+
+    def _get_shard(self, market: str) -> FtxWebsocketClient:
+        """
+        :param market: The market
+        :return: The connection the market is assigned to. The market is assigned on first call
+        """
+        with self._lock:
+            if market not in self._market_shards:
+                self._move_market(market, self._get_target_shard_index(market))
+
+            return self._shards[self._market_shards[market]]
+
+    def _get_target_shard_index(self, market: str) -> int:
+        """
+        Rendezvous hashing: the market goes to the connected shard with the highest hash of (shard index, market), so
+        that only the markets of a disconnected shard are moved
+
+        :param market: The market
+        :return: Index of the connection the market should be assigned to
+        """
+        shard_indexes = [index for index, shard in enumerate(self._shards) if shard.is_connected()]
+        if len(shard_indexes) == 0:
+            shard_indexes = list(range(len(self._shards)))
+
+        return max(shard_indexes,
+                   key=lambda index: hashlib.blake2b(f"{index}:{market}".encode(), digest_size=8).digest())
+
+    def _move_market(self, market: str, shard_index: int) -> bool:
+        """
+        Assign a market to a connection, moving its subscriptions and trades listeners
+
+        :param market: The market
+        :param shard_index: Index of the connection
+        :return: True if the market was moved from another connection, False otherwise
+        """
+        previous_shard_index = self._market_shards.get(market)
+        if previous_shard_index == shard_index:
+            return False
+
+        if previous_shard_index is not None:
+            self._shards[previous_shard_index].remove_market(market)
+            logging.info(f"Websocket: market {market} moved from connection {previous_shard_index} to {shard_index}")
+
+        self._market_shards[market] = shard_index
+        for listener in self._trades_listeners[market]:
+            self._shards[shard_index].add_trades_listener(market, listener)
+
+        return previous_shard_index is not None
+
+    def _rebalance(self) -> Set[str]:
+        """
+        Assign every market to its target connection
+
+        :return: The moved markets
+        """
+        with self._lock:
+            return {market for market in list(self._market_shards.keys())
+                    if self._move_market(market, self._get_target_shard_index(market))}
+
+    def _on_shard_disconnect(self, shard_index: int) -> None:
+        """
+        Move the markets of a lost connection to the other ones
+
+        :param shard_index: Index of the lost connection
+        """
+        self._notify_reconnect_listeners(self._rebalance())
+
+    def _on_shard_reconnect(self, shard_index: int) -> None:
+        """
+        Move back the markets of a connection opened again. Its markets missed some messages, as the moved ones
+
+        :param shard_index: Index of the connection opened again
+        """
+        with self._lock:
+            markets = self._rebalance()
+            markets.update(market for market, index in self._market_shards.items() if index == shard_index)
+
+        self._notify_reconnect_listeners(markets)
+
+    def _notify_reconnect_listeners(self, markets: Set[str]) -> None:
+        """
+        Call the reconnect listeners of some markets (the lock must not be held)
+
+        :param markets: The markets that may have missed messages
+        """
+        if len(markets) == 0:
+            return
+
+        with self._lock:
+            listeners = list(self._reconnect_listeners[None])
+            for market in markets:
+                listeners.extend(self._reconnect_listeners.get(market, []))
+
+        for listener in listeners:
+            listener()
@@ -0,0 +1,12 @@
+from typing import TypedDict
+
+
+class BacktestReportDict(TypedDict):
+    """Backtest report dict"""
+
+    start_time: int  # Virtual time at which the backtest started
+    end_time: int  # Virtual time at which the backtest ended
+    candle_number: int  # Number of replayed candles
+    loop_number: int  # Number of strategy loops
+    duration: float  # Real duration of the backtest in seconds
+    candles_per_second: float
@@ -1,3 +1,5 @@
+import numpy as np
+
 from core.enums.color_enum import ColorEnum
 from core.models.identified_candle import IdentifiedCandle
 
@@ -5,6 +7,8 @@ from core.models.identified_candle import IdentifiedCandle
 class Candle(IdentifiedCandle):
     """Candle"""
 
+    __slots__ = ("time", "open_price", "high_price", "low_price", "close_price", "volume")
+
     def __init__(self, identifier: int, time: int, open_price: float, high_price: float, low_price: float,
                  close_price: float, volume: float) -> None:
         """
@@ -63,6 +67,66 @@ class Candle(IdentifiedCandle):
                 return True
         return False
 
+    @staticmethod
+    def get_colors(open_prices: np.ndarray, close_prices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized get_color: determine the color of several candles at once
+
+        :param open_prices: Open prices of the candles
+        :param close_prices: Close prices of the candles
+        :return: The ColorEnum values of the candles (ie: colors == ColorEnum.GREEN.value gives the green candles)
+        :rtype: np.ndarray
+        """
+        return np.where(np.asarray(open_prices) <= np.asarray(close_prices), ColorEnum.GREEN.value, ColorEnum.RED.value)
+
+    @staticmethod
+    def are_hammers_or_hanging_men(open_prices: np.ndarray, high_prices: np.ndarray, low_prices: np.ndarray,
+                                   close_prices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_hammer_or_hanging_man: tells which candles are hammers or hanging men
+
+        :param open_prices: Open prices of the candles
+        :param high_prices: Highest prices of the candles
+        :param low_prices: Lowest prices of the candles
+        :param close_prices: Close prices of the candles
+        :return: A boolean mask, True for the candles that are hammers or hanging men
+        :rtype: np.ndarray
+        """
+        open_prices, close_prices = np.asarray(open_prices), np.asarray(close_prices)
+        high_prices = np.asarray(high_prices)
+        third_of_high_minus_low = (high_prices - np.asarray(low_prices)) / 3
+        return (np.abs(open_prices - close_prices) < third_of_high_minus_low) \
+            & (high_prices - np.minimum(open_prices, close_prices) < third_of_high_minus_low)
+
+    @staticmethod
+    def are_inverted_hammers_or_shooting_stars(open_prices: np.ndarray, high_prices: np.ndarray,
+                                               low_prices: np.ndarray, close_prices: np.ndarray) -> np.ndarray:
+        """
+        Vectorized is_inverted_hammer_or_shooting_star: tells which candles are inverted hammers or shooting stars
+
+        :param open_prices: Open prices of the candles
+        :param high_prices: Highest prices of the candles
+        :param low_prices: Lowest prices of the candles
+        :param close_prices: Close prices of the candles
+        :return: A boolean mask, True for the candles that are inverted hammers or shooting stars
+        :rtype: np.ndarray
+        """
+        open_prices, close_prices = np.asarray(open_prices), np.asarray(close_prices)
+        low_prices = np.asarray(low_prices)
+        third_of_high_minus_low = (np.asarray(high_prices) - low_prices) / 3
+        return (np.abs(open_prices - close_prices) < third_of_high_minus_low) \
+            & (np.maximum(open_prices, close_prices) - low_prices < third_of_high_minus_low)
+
+    def __eq__(self, other):
+        if not isinstance(other, Candle):
+            return NotImplemented
+        return self.identifier == other.identifier and self.time == other.time \
+            and self.open_price == other.open_price and self.high_price == other.high_price \
+            and self.low_price == other.low_price and self.close_price == other.close_price \
+            and self.volume == other.volume
+
+    __hash__ = IdentifiedCandle.__hash__
+
     def __str__(self):
         return "{identifier: %d, " \
                "open_price: %f, " \
@@ -1,6 +1,8 @@
 class IdentifiedCandle(object):
     """Identified candle"""
 
+    __slots__ = ("identifier",)
+
     def __init__(self, identifier: int):
         """
         Identified candle constructor
@@ -12,5 +14,10 @@ class IdentifiedCandle(object):
     def __str__(self):
         return "{identifier: %d}" % self.identifier
 
+    def __eq__(self, other):
+        if not isinstance(other, IdentifiedCandle):
+            return NotImplemented
+        return type(self) is type(other) and self.identifier == other.identifier
+
     def __hash__(self):
         return self.identifier
@@ -0,0 +1,15 @@
+from typing import Optional, TypedDict
+
+
+class OrderbookSnapshotDict(TypedDict):
+    """Orderbook snapshot dict. Prices are None while a side is empty"""
+
+    timestamp: float  # Time of the last orderbook update
+    best_bid: Optional[float]
+    best_bid_size: float
+    best_ask: Optional[float]
+    best_ask_size: float
+    spread: Optional[float]  # Best ask - best bid
+    mid_price: Optional[float]
+    microprice: Optional[float]  # Mid price weighted by the size on the other side of the book
+    imbalance: Optional[float]  # (bid depth - ask depth) / (bid depth + ask depth) over the top levels, in [-1, 1]
@@ -0,0 +1,9 @@
+from typing import TypedDict
+
+
+class RateLimitLaneMetricsDict(TypedDict):
+    """Rate limit lane metrics dict"""
+
+    request_number: int  # Number of requests that went through the lane
+    average_wait_time: float  # Average time waited for a token in seconds
+    max_wait_time: float  # Longest time waited for a token in seconds
@@ -0,0 +1,12 @@
+from typing import Dict, TypedDict
+
+from core.models.rate_limit_lane_metrics_dict import RateLimitLaneMetricsDict
+
+
+class RateLimitMetricsDict(TypedDict):
+    """Rate limit metrics dict"""
+
+    lanes: Dict[str, RateLimitLaneMetricsDict]  # Metrics of the global rate limiter { [priority name]: metrics }
+    public_lanes: Dict[str, RateLimitLaneMetricsDict]  # Metrics of the public rate limiter
+    private_lanes: Dict[str, RateLimitLaneMetricsDict]  # Metrics of the private rate limiter
+    too_many_requests_retry_number: int  # Number of requests sent again after an HTTP 429 response
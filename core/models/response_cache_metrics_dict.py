@@ -0,0 +1,10 @@
+from typing import TypedDict
+
+
+class ResponseCacheMetricsDict(TypedDict):
+    """Response cache metrics dict"""
+
+    hit_number: int  # Number of requests answered from the cache
+    miss_number: int  # Number of requests sent to FTX
+    shared_request_number: int  # Number of requests that waited for an identical request in flight
+    size: int  # Number of cached responses
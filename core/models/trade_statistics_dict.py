@@ -0,0 +1,15 @@
+from typing import Optional, TypedDict
+
+
+class TradeStatisticsDict(TypedDict):
+    """Trade statistics dict"""
+
+    balance: float
+    pnl: float  # Realized pnl minus fees
+    fees: float
+    trade_number: int  # Number of closed positions
+    winning_trade_number: int
+    win_rate: Optional[float]
+    average_trade_pnl: Optional[float]
+    worst_trade_pnl: Optional[float]
+    best_trade_pnl: Optional[float]
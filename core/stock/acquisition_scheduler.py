@@ -0,0 +1,153 @@
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple, TYPE_CHECKING
+
+from tools.token_bucket import TokenBucket
+
+if TYPE_CHECKING:
+    from core.stock.time_frame_manager import TimeFrameManager
+
+# FTX api rate limit is 10 requests per second. Let some room for strategy requests (orders, wallet, ...)
+ACQUISITION_MAX_REQUESTS_PER_SECOND = 8
+ACQUISITION_WORKER_NUMBER = 4  # Number of requests that can be waiting for an FTX api response at the same time
+
+
+class AcquisitionScheduler(object):
+    """
+    Shared stock data acquisition scheduler. Owns every (market, time frame) subscription and feeds them in the order
+    their next candle is due, under a global rate limit
+    """
+
+    _instance: Optional['AcquisitionScheduler'] = None
+    _instance_lock: threading.Lock = threading.Lock()
+
+    def __init__(self, max_requests_per_second: float = ACQUISITION_MAX_REQUESTS_PER_SECOND,
+                 worker_number: int = ACQUISITION_WORKER_NUMBER):
+        """
+        Acquisition scheduler constructor
+
+        :param max_requests_per_second: Maximum number of acquisition requests per second
+        :param worker_number: Number of worker threads
+        """
+        self._token_bucket: TokenBucket = TokenBucket(max_requests_per_second, max_requests_per_second)
+        self._worker_number: int = worker_number
+        self._workers: List[threading.Thread] = []
+        self._queue: List[Tuple[float, int, 'TimeFrameManager']] = []  # Heap of (due time, sequence, subscription)
+        self._sequence = itertools.count()  # Keeps subscriptions due at the same time in subscription order
+        self._subscriptions: Dict['TimeFrameManager', int] = {}  # { [subscription]: sequence of its queue entry }
+        self._condition: threading.Condition = threading.Condition()
+
+    @staticmethod
+    def get_instance() -> 'AcquisitionScheduler':
+        """
+        Return the acquisition scheduler shared by all the time frame managers
+
+        :return: The shared acquisition scheduler
+        """
+        with AcquisitionScheduler._instance_lock:
+            if AcquisitionScheduler._instance is None:
+                AcquisitionScheduler._instance = AcquisitionScheduler()
+            return AcquisitionScheduler._instance
+
+    def subscribe(self, time_frame_manager: 'TimeFrameManager', due_time: Optional[float] = None) -> None:
+        """
+        Schedule the data acquisition of a time frame manager
+
+        :param time_frame_manager: The time frame manager to feed
+        :param due_time: Timestamp of the first acquisition. Now if None
+        """
+        with self._condition:
+            self._push(time_frame_manager, time.time() if due_time is None else due_time)
+            self._start_workers()
+            self._condition.notify()
+
+    def unsubscribe(self, time_frame_manager: 'TimeFrameManager') -> None:
+        """
+        Stop the data acquisition of a time frame manager. An acquisition in progress is not interrupted
+
+        :param time_frame_manager: The time frame manager
+        """
+        with self._condition:
+            self._subscriptions.pop(time_frame_manager, None)
+            self._condition.notify_all()
+
+    def is_subscribed(self, time_frame_manager: 'TimeFrameManager') -> bool:
+        """
+        :param time_frame_manager: The time frame manager
+        :return: True if the data acquisition of the time frame manager is scheduled, False otherwise
+        """
+        with self._condition:
+            return time_frame_manager in self._subscriptions
+
+    def _push(self, time_frame_manager: 'TimeFrameManager', due_time: float) -> None:
+        """
+        Add a queue entry for a time frame manager. Older entries of the same time frame manager become invalid
+
+        :param time_frame_manager: The time frame manager
+        :param due_time: Timestamp of the acquisition
+        """
+        sequence = next(self._sequence)
+        self._subscriptions[time_frame_manager] = sequence
+        heapq.heappush(self._queue, (due_time, sequence, time_frame_manager))
+
+    def _start_workers(self) -> None:
+        """Start worker threads if needed (workers stop when there is no more subscription)"""
+        self._workers = [worker for worker in self._workers if worker.is_alive()]
+
+        while len(self._workers) < self._worker_number:
+            worker = threading.Thread(target=self._worker)
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_time_frame_manager(self) -> Optional['TimeFrameManager']:
+        """
+        Wait for the next due time frame manager
+
+        :return: The time frame manager to feed, None if there is no more subscription
+        """
+        with self._condition:
+            while len(self._subscriptions) > 0:
+                # Drop entries of unsubscribed or rescheduled time frame managers
+                while len(self._queue) > 0 and self._subscriptions.get(self._queue[0][2]) != self._queue[0][1]:
+                    heapq.heappop(self._queue)
+
+                if len(self._queue) == 0:
+                    self._condition.wait()  # Every subscription is being fed by another worker
+                    continue
+
+                time_to_wait = self._queue[0][0] - time.time()
+                if time_to_wait > 0:
+                    self._condition.wait(time_to_wait)
+                    continue
+
+                _, sequence, time_frame_manager = heapq.heappop(self._queue)
+                self._subscriptions[time_frame_manager] = -sequence - 1  # Being fed, no valid queue entry
+                return time_frame_manager
+
+            return None
+
+    def _worker(self) -> None:
+        """Threaded function that feeds the due time frame managers"""
+
+        while True:
+            time_frame_manager = self._next_time_frame_manager()
+            if time_frame_manager is None:
+                break
+
+            self._token_bucket.acquire()
+
+            try:
+                time_frame_manager.feed()
+            except Exception as e:
+                logging.error(f"Market: {time_frame_manager.market}, time frame: {time_frame_manager.time_frame_length}"
+                              f" sec. Unexpected acquisition error: {str(e)}")
+
+            with self._condition:
+                if time_frame_manager in self._subscriptions:
+                    self._push(time_frame_manager, time_frame_manager.get_next_acquisition_time())
+                    self._condition.notify()
+
+        logging.debug("Ending acquisition scheduler worker thread, no more subscription.")
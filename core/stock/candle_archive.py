@@ -0,0 +1,143 @@
+import os
+import threading
+from typing import Dict, Iterator, Optional, Tuple
+
+import numpy as np
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_cache import CandleCache
+from core.stock.candle_ring_buffer import CANDLE_DTYPE
+from tools.utils import expand_var_and_user
+
+ARCHIVE_FILE_EXTENSION = ".candles"
+
+
+class CandleArchive(object):
+    """
+    Append only candle archive, one file of CANDLE_DTYPE records per (market, time frame), sorted by time. Files are
+    memory mapped: range queries return numpy views without loading the whole history into memory
+    """
+
+    def __init__(self, directory: str):
+        """
+        Candle archive constructor
+
+        :param directory: Directory where the archive files are stored
+        """
+        self.directory: str = expand_var_and_user(directory)
+        self._memory_maps: Dict[str, np.ndarray] = {}  # { [path]: memory map of the whole file }
+        self._lock: threading.Lock = threading.Lock()
+
+    def get_path(self, market: str, time_frame_length: int) -> str:
+        """
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :return: Path of the archive file of a market time frame
+        """
+        return os.path.join(self.directory, market.replace("/", "_"), f"{time_frame_length}{ARCHIVE_FILE_EXTENSION}")
+
+    def get_records(self, market: str, time_frame_length: int) -> np.ndarray:
+        """
+        Get all the archived candles of a market time frame
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :return: A read only memory mapped record array (CANDLE_DTYPE) sorted by time asc
+        """
+        path = self.get_path(market, time_frame_length)
+
+        with self._lock:
+            record_number = os.path.getsize(path) // CANDLE_DTYPE.itemsize if os.path.isfile(path) else 0
+            memory_map = self._memory_maps.get(path)
+
+            # Map the file again when records have been appended
+            if memory_map is None or len(memory_map) != record_number:
+                memory_map = np.memmap(path, dtype=CANDLE_DTYPE, mode="r", shape=(record_number,)) \
+                    if record_number > 0 else np.empty(0, dtype=CANDLE_DTYPE)
+                self._memory_maps[path] = memory_map
+
+            return memory_map
+
+    def get_range(self, market: str, time_frame_length: int, start_time: Optional[int] = None,
+                  end_time: Optional[int] = None) -> np.ndarray:
+        """
+        Get the archived candles of a market time frame within a time range. No copy is made
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param start_time: Minimum candle time (included). From the first archived candle if None
+        :param end_time: Maximum candle time (excluded). Up to the last archived candle if None
+        :return: A read only memory mapped record array (CANDLE_DTYPE) sorted by time asc
+        """
+        records = self.get_records(market, time_frame_length)
+        start, end = self._get_range_indexes(records, start_time, end_time)
+        return records[start:end]
+
+    def get_last_time(self, market: str, time_frame_length: int) -> Optional[int]:
+        """
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :return: Time of the last archived candle, None if there is none
+        """
+        records = self.get_records(market, time_frame_length)
+        return int(records["time"][-1]) if len(records) > 0 else None
+
+    def append(self, market: str, time_frame_length: int, records: np.ndarray) -> int:
+        """
+        Append candles to the archive of a market time frame. Candles not newer than the last archived one are ignored
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param records: Candle records (CANDLE_DTYPE) sorted by time asc
+        :return: Number of appended candles
+        """
+        path = self.get_path(market, time_frame_length)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        last_time = self.get_last_time(market, time_frame_length)
+        if last_time is not None:
+            records = records[records["time"] > last_time]
+
+        if len(records) == 0:
+            return 0
+
+        with self._lock:
+            with open(path, "ab") as file:
+                # Drop an incomplete record (interrupted write) before appending
+                file.truncate(os.path.getsize(path) // CANDLE_DTYPE.itemsize * CANDLE_DTYPE.itemsize)
+                file.write(np.ascontiguousarray(records, dtype=CANDLE_DTYPE).tobytes())
+
+        return len(records)
+
+    def iter_stock_data(self, market: str, time_frame_length: int, start_time: Optional[int] = None,
+                        end_time: Optional[int] = None, chunk_size: int = 10000) -> Iterator[RawStockDataDict]:
+        """
+        Iterate over the archived candles of a market time frame within a time range, loading them chunk by chunk
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param start_time: Minimum candle time (included). From the first archived candle if None
+        :param end_time: Maximum candle time (excluded). Up to the last archived candle if None
+        :param chunk_size: Number of candles converted at once
+        :return: An iterator over the stock data, sorted by time asc
+        """
+        records = self.get_range(market, time_frame_length, start_time, end_time)
+
+        for chunk_start in range(0, len(records), chunk_size):
+            yield from CandleCache.to_stock_data(records[chunk_start:chunk_start + chunk_size])
+
+    @staticmethod
+    def _get_range_indexes(records: np.ndarray, start_time: Optional[int],
+                           end_time: Optional[int]) -> Tuple[int, int]:
+        """
+        Find a time range in records sorted by time (binary search)
+
+        :param records: The records
+        :param start_time: Minimum time (included), None for no minimum
+        :param end_time: Maximum time (excluded), None for no maximum
+        :return: Start and end indexes of the range
+        """
+        times = records["time"]
+        start = int(np.searchsorted(times, start_time, side="left")) if start_time is not None else 0
+        end = int(np.searchsorted(times, end_time, side="left")) if end_time is not None else len(records)
+        return start, max(start, end)
@@ -0,0 +1,104 @@
+import logging
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from core.ftx.rest.ftx_rest_api import FtxRestApi
+from core.stock.candle_archive import CandleArchive
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+from tools.token_bucket import TokenBucket
+from tools.utils import format_ohlcv_raw_data_list
+
+# Stay below FTX api rate limit (10 requests per second) when importing while the bot is running
+IMPORT_MAX_REQUESTS_PER_SECOND = 2
+IMPORT_PAGE_SIZE = 1500  # Number of candles requested at once
+IMPORT_MAX_RETRY = 5
+IMPORT_MIN_RETRY_DELAY = 5
+
+
+class CandleArchiveImporter(object):
+    """Bulk import of FTX candle history into a candle archive"""
+
+    def __init__(self, ftx_rest_api: FtxRestApi, candle_archive: CandleArchive,
+                 max_requests_per_second: float = IMPORT_MAX_REQUESTS_PER_SECOND):
+        """
+        Candle archive importer constructor
+
+        :param ftx_rest_api: FTX rest api
+        :param candle_archive: Archive where the candles are imported
+        :param max_requests_per_second: Maximum number of requests per second
+        """
+        self._ftx_rest_api: FtxRestApi = ftx_rest_api
+        self._candle_archive: CandleArchive = candle_archive
+        self._token_bucket: TokenBucket = TokenBucket(max_requests_per_second, 1)
+
+    def import_candles(self, market: str, time_frame_length: int, start_time: int,
+                       end_time: Optional[int] = None) -> int:
+        """
+        Import the closed candles of a market time frame, page by page from the oldest to the newest. The import
+        resumes after the last archived candle
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param start_time: Time of the first candle to import
+        :param end_time: Time after the last candle to import (excluded). Up to the last closed candle if None
+        :return: Number of imported candles
+        """
+        # The candle currently open is never imported
+        last_closed_candle_time = math.floor(time.time() / time_frame_length) * time_frame_length - time_frame_length
+        last_candle_time = last_closed_candle_time if end_time is None else min(end_time - 1, last_closed_candle_time)
+
+        last_archived_time = self._candle_archive.get_last_time(market, time_frame_length)
+        page_start_time = math.ceil(start_time / time_frame_length) * time_frame_length  # Aligned on candle starts
+        if last_archived_time is not None:
+            page_start_time = max(page_start_time, last_archived_time + time_frame_length)
+        imported_candle_number = 0
+
+        while page_start_time <= last_candle_time:
+            page_end_time = min(page_start_time + (IMPORT_PAGE_SIZE - 1) * time_frame_length, last_candle_time)
+            response = self._get_candles(market, time_frame_length, page_start_time, page_end_time)
+
+            records = format_ohlcv_raw_data_list(response, time_frame_length)
+            records = records[(records["time"] >= page_start_time) & (records["time"] <= page_end_time)]
+            records = records[np.argsort(records["time"], kind="stable")]
+
+            imported_candle_number += self._candle_archive.append(market, time_frame_length, records)
+            page_start_time = page_end_time + time_frame_length
+
+            logging.info(f"Candle archive import: market: {market}, time frame: {time_frame_length} sec. "
+                         f"{imported_candle_number} candles imported")
+
+        return imported_candle_number
+
+    def _get_candles(self, market: str, time_frame_length: int, page_start_time: int, page_end_time: int) -> [dict]:
+        """
+        Retrieve a page of candles, retrying with a doubled delay on failure
+
+        :param market: Name of the market
+        :param time_frame_length: The length of the time frame in seconds
+        :param page_start_time: Time of the first candle of the page
+        :param page_end_time: Time of the last candle of the page
+        :return: The FTX raw candles
+        """
+        retry_delay = IMPORT_MIN_RETRY_DELAY
+
+        for retry in range(IMPORT_MAX_RETRY + 1):
+            self._token_bucket.acquire()
+
+            try:
+                return self._ftx_rest_api.get(f"markets/{market}/candles", {
+                    "resolution": time_frame_length,
+                    "limit": IMPORT_PAGE_SIZE,
+                    "start_time": page_start_time,
+                    "end_time": page_end_time
+                })
+            except FtxRestApiException as ftx_rest_api_ex:
+                if retry == IMPORT_MAX_RETRY:
+                    raise
+
+                logging.error(f"FTX API: Http request failed, trying again in {retry_delay} sec. "
+                              f"Details: {str(ftx_rest_api_ex)}")
+                time.sleep(retry_delay)
+                retry_delay *= 2
@@ -0,0 +1,90 @@
+import logging
+import os
+import threading
+from typing import List
+
+import numpy as np
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_ring_buffer import CANDLE_DTYPE
+from tools.utils import expand_var_and_user
+
+
+class CandleCache(object):
+    """
+    On disk candle cache, one numpy file per (market, time frame). Used to restart data acquisitions from the last
+    known candles instead of retrieving all of them again
+    """
+
+    def __init__(self, directory: str):
+        """
+        Candle cache constructor
+
+        :param directory: Directory where the candle files are stored
+        """
+        self.directory: str = expand_var_and_user(directory)
+
+    def get_path(self, market: str, time_frame_length: int) -> str:
+        """
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :return: Path of the candle file of a market time frame
+        """
+        return os.path.join(self.directory, market.replace("/", "_"), f"{time_frame_length}.npy")
+
+    def load(self, market: str, time_frame_length: int) -> np.ndarray:
+        """
+        Load the cached candles of a market time frame
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :return: The candle records (CANDLE_DTYPE) sorted by identifier asc, empty if nothing is cached
+        """
+        path = self.get_path(market, time_frame_length)
+
+        try:
+            records = np.load(path)  # Not memory mapped: the file can be replaced while the records are in use
+            if records.dtype == CANDLE_DTYPE:
+                return records
+            logging.warning(f"Candle cache: ignoring {path}, unexpected data type {records.dtype}")
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logging.warning(f"Candle cache: ignoring unreadable file {path}. Details: {str(e)}")
+
+        return np.empty(0, dtype=CANDLE_DTYPE)
+
+    def save(self, market: str, time_frame_length: int, records: np.ndarray) -> None:
+        """
+        Replace the cached candles of a market time frame
+
+        :param market: Name of the market (ex: BTC-PERP)
+        :param time_frame_length: The length of the time frame in seconds
+        :param records: The candle records (CANDLE_DTYPE)
+        """
+        path = self.get_path(market, time_frame_length)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # Write a temporary file first so that a reader never gets a partially written file
+        temporary_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "wb") as file:
+            np.save(file, records)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def to_stock_data(records: np.ndarray) -> List[RawStockDataDict]:
+        """
+        Convert candle records to stock data
+
+        :param records: The candle records (CANDLE_DTYPE)
+        :return: The stock data list
+        """
+        return [{
+            "id": identifier,
+            "time": time,
+            "open_price": open_price,
+            "high_price": high_price,
+            "low_price": low_price,
+            "close_price": close_price,
+            "volume": volume
+        } for identifier, time, open_price, high_price, low_price, close_price, volume in records.tolist()]
@@ -0,0 +1,125 @@
+from typing import Dict, List, Optional
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+
+
+class CandleResampler(object):
+    """
+    Incrementally build candles of a time frame from the candles of a finer time frame (base candles). Only the
+    candles fully covered by the received base candles are built
+    """
+
+    def __init__(self, time_frame_length: int, base_time_frame_length: int):
+        """
+        Candle resampler constructor
+
+        :param time_frame_length: The length of the built candles in seconds
+        :param base_time_frame_length: The length of the base candles in seconds (time_frame_length must be a multiple
+        of it)
+        """
+        self.time_frame_length: int = time_frame_length
+        self.base_time_frame_length: int = base_time_frame_length
+        self._first_base_time: Optional[int] = None  # Time of the first base candle received
+        self._bucket_time: Optional[int] = None  # Start time of the candle being built
+        self._bucket_base_candles: Dict[int, RawStockDataDict] = {}  # Base candles of the candle being built
+        self._closed_aggregate: Optional[RawStockDataDict] = None  # Candle built from all base candles but the last
+        self._last_base_candle: Optional[RawStockDataDict] = None
+        self.closed_candle_number: int = 0  # Number of fully covered candles built and closed
+
+    def resample(self, base_candles: List[RawStockDataDict]) -> List[RawStockDataDict]:
+        """
+        Update the built candles with new or updated base candles
+
+        :param base_candles: Base candles sorted by time asc
+        :return: The candles that have been created or updated, sorted by time asc. The last one can be partial (still
+        open)
+        """
+        updated_candles: Dict[int, RawStockDataDict] = {}
+
+        for base_candle in base_candles:
+            if self._first_base_time is None:
+                self._first_base_time = base_candle["time"]
+
+            bucket_time = base_candle["time"] - base_candle["time"] % self.time_frame_length
+
+            if self._bucket_time is None or bucket_time > self._bucket_time:
+                if self._bucket_time is not None and self._is_covered():
+                    self.closed_candle_number += 1
+                self._bucket_time = bucket_time
+                self._bucket_base_candles = {}
+                self._closed_aggregate = None
+                self._last_base_candle = None
+            elif bucket_time < self._bucket_time:
+                continue  # Candle already closed
+
+            self._add_base_candle(base_candle)
+
+            if self._is_covered():
+                updated_candles[bucket_time] = self._build_candle()
+
+        return [updated_candles[bucket_time] for bucket_time in sorted(updated_candles)]
+
+    def _is_covered(self) -> bool:
+        """
+        :return: True if the base candles have been received since the start of the candle being built
+        """
+        return self._first_base_time <= self._bucket_time
+
+    def _add_base_candle(self, base_candle: RawStockDataDict) -> None:
+        """
+        Add or update a base candle of the candle being built
+
+        :param base_candle: The base candle
+        """
+        last_base_candle = self._last_base_candle
+        self._bucket_base_candles[base_candle["time"]] = base_candle
+
+        if last_base_candle is None or base_candle["time"] > last_base_candle["time"]:
+            self._closed_aggregate = CandleResampler._merge(self._closed_aggregate, last_base_candle)
+            self._last_base_candle = base_candle
+        elif base_candle["time"] == last_base_candle["time"]:
+            self._last_base_candle = base_candle
+        else:
+            # An older base candle changed, aggregate again all the base candles but the last one
+            self._closed_aggregate = None
+            for time in sorted(self._bucket_base_candles):
+                if time != last_base_candle["time"]:
+                    self._closed_aggregate = CandleResampler._merge(self._closed_aggregate,
+                                                                    self._bucket_base_candles[time])
+
+    def _build_candle(self) -> RawStockDataDict:
+        """
+        :return: The candle being built
+        """
+        candle = CandleResampler._merge(self._closed_aggregate, self._last_base_candle)
+        return {
+            "id": self._bucket_time // self.time_frame_length,
+            "time": self._bucket_time,
+            "open_price": candle["open_price"],
+            "high_price": candle["high_price"],
+            "low_price": candle["low_price"],
+            "close_price": candle["close_price"],
+            "volume": candle["volume"]
+        }
+
+    @staticmethod
+    def _merge(candle: Optional[RawStockDataDict], next_candle: Optional[RawStockDataDict]) -> RawStockDataDict:
+        """
+        Merge two consecutive candles
+
+        :param candle: The first candle (can be None)
+        :param next_candle: The candle following the first one (can be None)
+        :return: The merged candle
+        """
+        if candle is None or next_candle is None:
+            return next_candle if candle is None else candle
+
+        return {
+            "id": candle["id"],
+            "time": candle["time"],
+            "open_price": candle["open_price"],
+            "high_price": max(candle["high_price"], next_candle["high_price"]),
+            "low_price": min(candle["low_price"], next_candle["low_price"]),
+            "close_price": next_candle["close_price"],
+            "volume": candle["volume"] + next_candle["volume"]
+        }
@@ -0,0 +1,254 @@
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.enums.candle_upsert_result_enum import CandleUpsertResultEnum
+from core.models.candle import Candle
+
+CANDLE_COLUMNS: Tuple[str, ...] = ("identifier", "time", "open_price", "high_price", "low_price", "close_price",
+                                   "volume")
+_INTEGER_COLUMNS: Tuple[str, ...] = ("identifier", "time")
+# Candle record type, used to store candles outside of the buffer
+CANDLE_DTYPE: np.dtype = np.dtype([(column, np.int64 if column in _INTEGER_COLUMNS else np.float64)
+                                   for column in CANDLE_COLUMNS])
+
+
+class CandleRingBuffer(object):
+    """Fixed capacity candle store, ordered by candle identifier, backed by numpy columns"""
+
+    def __init__(self, capacity: int):
+        """
+        Candle ring buffer constructor
+
+        :param capacity: Maximum number of candles kept in the buffer. Oldest candles are dropped first
+        """
+        self._capacity: int = capacity
+
+        # Each column is allocated twice: every value is written at its ring position and at its mirror position
+        # (ring position + capacity). This way, the candles are always contiguous in memory, from the oldest to the
+        # newest one, and can be exposed as numpy views without any copy
+        self._columns: Dict[str, np.ndarray] = {
+            column: np.zeros(2 * capacity, dtype=np.int64 if column in _INTEGER_COLUMNS else np.float64)
+            for column in CANDLE_COLUMNS
+        }
+        self._extra_columns: List[str] = []  # Additional float columns (computed values aligned with the candles)
+        self._start: int = 0  # Ring position of the oldest candle
+        self._size: int = 0
+        self.version: int = 0  # Incremented each time the buffer content changes
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def first_identifier(self) -> Optional[int]:
+        return int(self._columns["identifier"][self._start]) if self._size > 0 else None
+
+    @property
+    def last_identifier(self) -> Optional[int]:
+        return int(self._columns["identifier"][self._start + self._size - 1]) if self._size > 0 else None
+
+    def upsert(self, identifier: int, time: int, open_price: float, high_price: float, low_price: float,
+               close_price: float, volume: float) -> CandleUpsertResultEnum:
+        """
+        Insert a candle, or update it if a candle with the same identifier is already stored
+
+        Appending a new candle and updating the last one are O(1). Updating an older candle costs a binary search,
+        inserting a missing candle in the middle of the buffer costs a full rebuild (it should never happen with
+        ordered stock data).
+
+        :param identifier: Unique identifier of the candle
+        :param time: Time of the candle
+        :param open_price: Open price of the candle
+        :param high_price: Highest price of the candle
+        :param low_price: Lowest price of the candle
+        :param close_price: Close price of the candle
+        :param volume: Volume of the candle
+        :return: What has been done with the candle
+        """
+        row = (identifier, time, open_price, high_price, low_price, close_price, volume)
+        last_identifier = self.last_identifier
+
+        if last_identifier is None or identifier > last_identifier:
+            self._append(row)
+            return CandleUpsertResultEnum.APPENDED
+
+        if identifier == last_identifier:
+            return CandleUpsertResultEnum.LAST_UPDATED if self._update(self._size - 1, row) \
+                else CandleUpsertResultEnum.UNCHANGED
+
+        identifiers = self.identifiers
+        index = int(np.searchsorted(identifiers, identifier))
+
+        if index < self._size and identifiers[index] == identifier:
+            return CandleUpsertResultEnum.UPDATED if self._update(index, row) else CandleUpsertResultEnum.UNCHANGED
+
+        if index == 0 and self._size == self._capacity:
+            return CandleUpsertResultEnum.UNCHANGED  # Older than the oldest candle of a full buffer, nothing to keep
+
+        self._insert(index, row)
+        return CandleUpsertResultEnum.INSERTED
+
+    def add_column(self, column: str) -> None:
+        """
+        Add a float column aligned with the candles (for instance an indicator value). New candles get a NaN value
+
+        :param column: The column name
+        """
+        if column in self._columns:
+            return
+
+        self._columns[column] = np.full(2 * self._capacity, np.nan)
+        self._extra_columns.append(column)
+
+    def set_value(self, column: str, index: int, value: float) -> None:
+        """
+        Set a value of a column added with add_column
+
+        :param column: The column name
+        :param index: Logical index of the candle (0 being the oldest one, negative values count from the newest one)
+        :param value: The value to set
+        """
+        position = (self._start + (index if index >= 0 else self._size + index)) % self._capacity
+        self._columns[column][position] = value
+        self._columns[column][position + self._capacity] = value
+
+    def clear(self) -> None:
+        """Remove all the candles"""
+        self._start = 0
+        self._size = 0
+        self.version += 1
+
+    def get_column(self, column: str, depth: Optional[int] = None) -> np.ndarray:
+        """
+        Return a read only view over a column, ordered by candle identifier asc. No copy is made: the view reflects
+        the buffer content and must be copied if it has to outlive the next buffer update
+
+        :param column: The column name (see CANDLE_COLUMNS and add_column)
+        :param depth: Number of last candles to return. All the candles if None
+        :return: A read only numpy view over the column
+        """
+        size = self._size if depth is None else min(depth, self._size)
+        view = self._columns[column][self._start + self._size - size:self._start + self._size].view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def identifiers(self) -> np.ndarray:
+        return self.get_column("identifier")
+
+    @property
+    def times(self) -> np.ndarray:
+        return self.get_column("time")
+
+    @property
+    def open_prices(self) -> np.ndarray:
+        return self.get_column("open_price")
+
+    @property
+    def high_prices(self) -> np.ndarray:
+        return self.get_column("high_price")
+
+    @property
+    def low_prices(self) -> np.ndarray:
+        return self.get_column("low_price")
+
+    @property
+    def close_prices(self) -> np.ndarray:
+        return self.get_column("close_price")
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self.get_column("volume")
+
+    def to_candle_list(self, depth: Optional[int] = None) -> List[Candle]:
+        """
+        Build Candle objects from the buffer content
+
+        :param depth: Number of last candles to return. All the candles if None
+        :return: The candle list, ordered by identifier asc
+        """
+        return [Candle(*row) for row in zip(*[self.get_column(column, depth).tolist() for column in CANDLE_COLUMNS])]
+
+    def to_records(self, depth: Optional[int] = None) -> np.ndarray:
+        """
+        Copy the candles into a record array
+
+        :param depth: Number of last candles to return. All the candles if None
+        :return: The candle records (CANDLE_DTYPE), ordered by identifier asc
+        """
+        size = self._size if depth is None else min(depth, self._size)
+        records = np.empty(size, dtype=CANDLE_DTYPE)
+        for column in CANDLE_COLUMNS:
+            records[column] = self.get_column(column, depth)
+        return records
+
+    def _write(self, index: int, row: tuple) -> None:
+        """
+        Write a row at the given logical index (0 being the oldest candle) and at its mirror position
+
+        :param index: Logical index of the row
+        :param row: Row values ordered as CANDLE_COLUMNS
+        """
+        position = (self._start + index) % self._capacity
+        for column, value in zip(CANDLE_COLUMNS, row):
+            self._columns[column][position] = value
+            self._columns[column][position + self._capacity] = value
+
+    def _clear_extra_values(self, index: int) -> None:
+        """
+        Reset the extra column values of the row at the given logical index
+
+        :param index: Logical index of the row
+        """
+        for column in self._extra_columns:
+            self.set_value(column, index, np.nan)
+
+    def _append(self, row: tuple) -> None:
+        """
+        Append a row after the newest candle, dropping the oldest candle if the buffer is full
+
+        :param row: Row values ordered as CANDLE_COLUMNS
+        """
+        if self._size < self._capacity:
+            self._size += 1
+        else:
+            self._start = (self._start + 1) % self._capacity
+
+        self._write(self._size - 1, row)
+        self._clear_extra_values(self._size - 1)
+        self.version += 1
+
+    def _update(self, index: int, row: tuple) -> bool:
+        """
+        Update the row at the given logical index if its values changed
+
+        :param index: Logical index of the row
+        :param row: Row values ordered as CANDLE_COLUMNS
+        :return: True if the row changed, False otherwise
+        """
+        position = self._start + index
+        if all(self._columns[column][position] == value for column, value in zip(CANDLE_COLUMNS, row)):
+            return False
+
+        self._write(index, row)
+        self.version += 1
+        return True
+
+    def _insert(self, index: int, row: tuple) -> None:
+        """
+        Insert a row in the middle of the buffer (rebuild the whole buffer)
+
+        :param index: Logical index where to insert the row
+        :param row: Row values ordered as CANDLE_COLUMNS
+        """
+        rows = list(zip(*[self.get_column(column).tolist() for column in CANDLE_COLUMNS]))
+        rows.insert(index, row)
+
+        self._start = 0
+        self._size = 0
+        for kept_row in rows[-self._capacity:]:
+            self._append(kept_row)
@@ -0,0 +1,161 @@
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.enums.candlestick_shape_enum import CandlestickShapeEnum
+from core.models.candle import Candle
+from core.stock.stock_data_manager import StockDataManager
+
+# When a candle matches several shapes, the first one of this list is given by get_shapes
+SHAPE_PRIORITY: List[CandlestickShapeEnum] = [
+    CandlestickShapeEnum.SWALLOWING,
+    CandlestickShapeEnum.HARAMI,
+    CandlestickShapeEnum.HAMMER_OR_HANGING_MAN,
+    CandlestickShapeEnum.REVERSED_HAMMER_OR_FALLING_STAR
+]
+
+
+class CandlestickPatternScanner(object):
+    """
+    Vectorized candlestick pattern scanner. Works on a window of candles (1-D OHLC arrays) or on several markets at
+    once (2-D OHLC arrays, one market per row, candles sorted by time asc along the last axis)
+    """
+
+    def __init__(self, open_prices: np.ndarray, high_prices: np.ndarray, low_prices: np.ndarray,
+                 close_prices: np.ndarray):
+        """
+        Candlestick pattern scanner constructor
+
+        :param open_prices: Open prices of the candles
+        :param high_prices: Highest prices of the candles
+        :param low_prices: Lowest prices of the candles
+        :param close_prices: Close prices of the candles
+        """
+        self._open_prices: np.ndarray = np.asarray(open_prices, dtype=np.float64)
+        self._high_prices: np.ndarray = np.asarray(high_prices, dtype=np.float64)
+        self._low_prices: np.ndarray = np.asarray(low_prices, dtype=np.float64)
+        self._close_prices: np.ndarray = np.asarray(close_prices, dtype=np.float64)
+        self._masks: Dict[CandlestickShapeEnum, np.ndarray] = {}
+
+    @staticmethod
+    def from_stock_data_manager(stock_data_manager: StockDataManager,
+                                depth: Optional[int] = None) -> 'CandlestickPatternScanner':
+        """
+        Create a scanner over the last candles of a stock data manager
+
+        :param stock_data_manager: The stock data manager
+        :param depth: Number of last candles to scan. All the candles if None
+        :return: The scanner
+        """
+        return CandlestickPatternScanner(*[stock_data_manager.get_data_view(column, depth).copy()
+                                           for column in ["open_price", "high_price", "low_price", "close_price"]])
+
+    @staticmethod
+    def from_stock_data_managers(stock_data_managers: List[StockDataManager],
+                                 depth: int) -> 'CandlestickPatternScanner':
+        """
+        Create a scanner over the last candles of several stock data managers (one row per stock data manager).
+        Managers with less than depth candles are padded with NaN values at the beginning, that never match any shape
+
+        :param stock_data_managers: The stock data managers
+        :param depth: Number of last candles to scan for each stock data manager
+        :return: The scanner
+        """
+        columns = []
+
+        for column in ["open_price", "high_price", "low_price", "close_price"]:
+            values = np.full((len(stock_data_managers), depth), np.nan)
+            for row, stock_data_manager in enumerate(stock_data_managers):
+                view = stock_data_manager.get_data_view(column, depth)
+                values[row, depth - len(view):] = view
+            columns.append(values)
+
+        return CandlestickPatternScanner(*columns)
+
+    def get_colors(self) -> np.ndarray:
+        """
+        :return: The ColorEnum values of the candles
+        """
+        return Candle.get_colors(self._open_prices, self._close_prices)
+
+    def get_mask(self, shape: CandlestickShapeEnum) -> np.ndarray:
+        """
+        Tells which candles match a shape
+
+        :param shape: The candlestick shape
+        :return: A boolean mask, True for the candles matching the shape
+        """
+        if shape not in self._masks:
+            self._masks[shape] = self._compute_mask(shape)
+
+        return self._masks[shape]
+
+    def get_masks(self) -> Dict[CandlestickShapeEnum, np.ndarray]:
+        """
+        :return: The boolean masks of all the supported shapes
+        """
+        return {shape: self.get_mask(shape) for shape in SHAPE_PRIORITY}
+
+    def get_shapes(self) -> np.ndarray:
+        """
+        Give a shape to each candle. A candle matching several shapes gets the first one of SHAPE_PRIORITY
+
+        :return: The CandlestickShapeEnum values of the candles (UNDEFINED when there is no match)
+        """
+        shapes = np.full(self._open_prices.shape, CandlestickShapeEnum.UNDEFINED.value, dtype=np.int8)
+
+        for shape in reversed(SHAPE_PRIORITY):
+            shapes[self.get_mask(shape)] = shape.value
+
+        return shapes
+
+    def _compute_mask(self, shape: CandlestickShapeEnum) -> np.ndarray:
+        """
+        Compute the boolean mask of a shape
+
+        :param shape: The candlestick shape
+        :return: A boolean mask, True for the candles matching the shape
+        """
+        if shape is CandlestickShapeEnum.HAMMER_OR_HANGING_MAN:
+            return Candle.are_hammers_or_hanging_men(self._open_prices, self._high_prices, self._low_prices,
+                                                     self._close_prices)
+
+        if shape is CandlestickShapeEnum.REVERSED_HAMMER_OR_FALLING_STAR:
+            return Candle.are_inverted_hammers_or_shooting_stars(self._open_prices, self._high_prices,
+                                                                 self._low_prices, self._close_prices)
+
+        if shape is CandlestickShapeEnum.SWALLOWING:
+            # Body engulfs the whole previous body, with the opposite color
+            return self._compare_with_previous_candle(lambda body_low, body_high, previous_low, previous_high:
+                                                      (body_low <= previous_low) & (body_high >= previous_high)
+                                                      & (body_high - body_low > previous_high - previous_low))
+
+        if shape is CandlestickShapeEnum.HARAMI:
+            # Body is strictly inside the previous body, with the opposite color
+            return self._compare_with_previous_candle(lambda body_low, body_high, previous_low, previous_high:
+                                                      (body_low > previous_low) & (body_high < previous_high))
+
+        return np.zeros(self._open_prices.shape, dtype=bool)
+
+    def _compare_with_previous_candle(self, body_condition) -> np.ndarray:
+        """
+        Build the mask of a two candles shape. The first candle of the window never matches
+
+        :param body_condition: Function taking body low, body high, previous body low and previous body high arrays
+        and returning the body condition mask
+        :return: A boolean mask, True for the candles having the opposite color of the previous one and matching the
+        body condition
+        """
+        body_low = np.minimum(self._open_prices, self._close_prices)
+        body_high = np.maximum(self._open_prices, self._close_prices)
+        colors = self.get_colors()
+
+        mask = np.zeros(self._open_prices.shape, dtype=bool)
+        mask[..., 1:] = (colors[..., 1:] != colors[..., :-1]) & body_condition(
+            body_low[..., 1:], body_high[..., 1:], body_low[..., :-1], body_high[..., :-1])
+
+        # Padding values (NaN) never match
+        mask &= ~np.isnan(self._open_prices)
+        mask[..., 1:] &= ~np.isnan(self._open_prices[..., :-1])
+
+        return mask
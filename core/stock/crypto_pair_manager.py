@@ -1,6 +1,9 @@
 import logging
+from typing import Optional, Union
 
 from core.ftx.rest.ftx_rest_api import FtxRestApi
+from core.ftx.ws.ftx_websocket_client import FtxWebsocketClient
+from core.ftx.ws.sharded_ftx_websocket_client import ShardedFtxWebsocketClient
 from core.stock.time_frame_manager import TimeFrameManager
 from exceptions.ftx_algotrading_exception import FtxAlgotradingException
 
@@ -10,6 +13,9 @@ SUPPORTED_TIME_FRAME_LENGTH = [15, 60, 300, 900, 3600, 14400, 86400]
 class CryptoPairManager(object):
     """Crypto pair manager"""
 
+    # Only retrieve the finest running time frame from FTX and build the higher ones from it
+    derive_higher_time_frames = True
+
     def __init__(self, market: str, ftx_rest_api: FtxRestApi):
         """
         Crypto pair manager constructor
@@ -22,12 +28,15 @@ class CryptoPairManager(object):
         self._ftx_rest_api = ftx_rest_api
         logging.info(f"New crypto pair manager created! Market: {self.market}")
 
-    def add_time_frame(self, time_frame_length: int, auto_compute_indicators: bool = True) -> None:
+    def add_time_frame(self, time_frame_length: int, auto_compute_indicators: bool = True,
+                       ftx_websocket_client: Optional[Union[FtxWebsocketClient, ShardedFtxWebsocketClient]] = None
+                       ) -> None:
         """
         Add a new time frame
 
         :param time_frame_length: The length of the time frame in seconds (15, 60, 300, 900, 3600, 14400, 86400)
         :param auto_compute_indicators: automatically compute indicators or not
+        :param ftx_websocket_client: If set, candles are built live from the market trades received with this client
         """
         if time_frame_length not in SUPPORTED_TIME_FRAME_LENGTH:
             raise FtxAlgotradingException(
@@ -39,7 +48,7 @@ class CryptoPairManager(object):
             return
 
         self._time_frames[time_frame_length] = TimeFrameManager(time_frame_length, self.market, self._ftx_rest_api,
-                                                                auto_compute_indicators)
+                                                                auto_compute_indicators, ftx_websocket_client)
 
     def start_time_frame_acq(self, time_frame_length: int) -> None:
         """
@@ -52,6 +61,7 @@ class CryptoPairManager(object):
                 f"Trying to start a non existing time frame {time_frame_length} for market {self.market}")
 
         self._time_frames[time_frame_length].start()
+        self._link_derived_time_frames()
 
     def start_all_time_frame_acq(self) -> None:
         """Starts the data acquisition for all time frames"""
@@ -69,12 +79,35 @@ class CryptoPairManager(object):
                 f"Trying to stop a non existing time frame {time_frame_length} for market {self.market}")
 
         self._time_frames[time_frame_length].stop()
+        self._link_derived_time_frames()
 
     def stop_all_time_frame_acq(self):
         """Stops the data acquisition for all time frames"""
         for key in self._time_frames.keys():
             self.stop_time_frame_acq(key)
 
+    def _link_derived_time_frames(self) -> None:
+        """
+        Make the finest running time frame build the candles of the other running time frames (except the ones built
+        from trades)
+        """
+        running_time_frames = [self._time_frames[key] for key in sorted(self._time_frames.keys())
+                               if self._time_frames[key].is_running()]
+        base_time_frame = running_time_frames[0] \
+            if CryptoPairManager.derive_higher_time_frames and len(running_time_frames) > 0 else None
+
+        for time_frame in self._time_frames.values():
+            for derived_time_frame in time_frame.get_derived_time_frames():
+                if time_frame is not base_time_frame or not derived_time_frame.is_running():
+                    time_frame.remove_derived_time_frame(derived_time_frame)
+
+        if base_time_frame is not None:
+            derived_time_frames = base_time_frame.get_derived_time_frames()
+            for time_frame in running_time_frames[1:]:
+                if time_frame not in derived_time_frames and not time_frame.is_trade_streamed() \
+                        and time_frame.time_frame_length % base_time_frame.time_frame_length == 0:
+                    base_time_frame.add_derived_time_frame(time_frame)
+
     def get_time_frame(self, time_frame_length: int) -> TimeFrameManager:
         """
         Return the given time frame instance
@@ -0,0 +1,44 @@
+from typing import Optional, Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.indicators.exponential_moving_average import ExponentialMovingAverage
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+
+ATR_DEFAULT_WINDOW = 14
+
+
+class AtrIndicator(IncrementalIndicator):
+    """Average true range (atr), smoothed moving average of the true range"""
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Atr indicator constructor
+
+        :param window: The atr window. Column is named atr for the default window (14), atr_<window> otherwise
+        """
+        super(AtrIndicator, self).__init__(("atr",) if window is None else (f"atr_{window}",))
+        self._true_ranges: ExponentialMovingAverage = ExponentialMovingAverage.from_window(
+            ATR_DEFAULT_WINDOW if window is None else window)
+        self._previous_close: Optional[float] = None  # Close price of the candle before the last one
+        self._last_close: Optional[float] = None
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._previous_close = self._last_close
+        self._last_close = candle["close_price"]
+        return self._true_ranges.append(self._get_true_range(candle)),
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._last_close = candle["close_price"]
+        return self._true_ranges.update_last(self._get_true_range(candle)),
+
+    def _get_true_range(self, candle: RawStockDataDict) -> float:
+        """
+        Compute the true range of a candle. The first candle uses its own close price as previous close
+
+        :param candle: The candle
+        :return: The true range
+        """
+        previous_close = self._previous_close if self._previous_close is not None else candle["close_price"]
+        return max(candle["high_price"] - candle["low_price"],
+                   abs(candle["high_price"] - previous_close),
+                   abs(candle["low_price"] - previous_close))
@@ -0,0 +1,35 @@
+from typing import Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+from core.stock.indicators.rolling_window_statistics import RollingWindowStatistics
+
+
+class BollingerBandsIndicator(IncrementalIndicator):
+    """Bollinger bands: close price moving average (boll), upper (boll_ub) and lower (boll_lb) bands"""
+
+    BOLL_PERIOD = 20
+    BOLL_STD_TIMES = 2
+
+    def __init__(self):
+        """Bollinger bands indicator constructor"""
+        super(BollingerBandsIndicator, self).__init__(("boll", "boll_ub", "boll_lb"))
+        self._closes: RollingWindowStatistics = RollingWindowStatistics(BollingerBandsIndicator.BOLL_PERIOD)
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._closes.append(candle["close_price"])
+        return self._get_bands()
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._closes.update_last(candle["close_price"])
+        return self._get_bands()
+
+    def _get_bands(self) -> Tuple[float, ...]:
+        """
+        Compute the bands from the close price statistics
+
+        :return: Moving average, upper band and lower band
+        """
+        moving_average = self._closes.mean
+        width = BollingerBandsIndicator.BOLL_STD_TIMES * self._closes.std
+        return moving_average, moving_average + width, moving_average - width
@@ -0,0 +1,69 @@
+import math
+
+
+class ExponentialMovingAverage(object):
+    """
+    Exponential moving average updated one value at a time. Gives the same results as pandas
+    ewm(alpha=alpha, adjust=True, ignore_na=False, min_periods=0).mean(), used by stockstats
+    """
+
+    def __init__(self, alpha: float):
+        """
+        Exponential moving average constructor
+
+        :param alpha: Smoothing factor
+        """
+        self._decay: float = 1.0 - alpha
+        self._numerator: float = 0.0  # Weighted sum of the values, last value included
+        self._denominator: float = 0.0  # Sum of the weights, last value included
+        self._previous_numerator: float = 0.0  # Weighted sum of the values, last value excluded
+        self._previous_denominator: float = 0.0  # Sum of the weights, last value excluded
+        self.value: float = math.nan
+
+    @staticmethod
+    def from_span(span: int) -> 'ExponentialMovingAverage':
+        """
+        Create an exponential moving average from a span (stockstats ema)
+
+        :param span: The span
+        :return: The exponential moving average
+        """
+        return ExponentialMovingAverage(2.0 / (span + 1.0))
+
+    @staticmethod
+    def from_window(window: int) -> 'ExponentialMovingAverage':
+        """
+        Create a smoothed moving average from a window (stockstats smma, used by rsi and atr)
+
+        :param window: The window
+        :return: The smoothed moving average
+        """
+        return ExponentialMovingAverage(1.0 / window)
+
+    def append(self, value: float) -> float:
+        """
+        Add a new value
+
+        :param value: The new value (NaN values only decay the previous ones)
+        :return: The moving average value
+        """
+        self._previous_numerator = self._numerator
+        self._previous_denominator = self._denominator
+        return self.update_last(value)
+
+    def update_last(self, value: float) -> float:
+        """
+        Replace the last added value
+
+        :param value: The new last value
+        :return: The moving average value
+        """
+        self._numerator = self._previous_numerator * self._decay
+        self._denominator = self._previous_denominator * self._decay
+
+        if not math.isnan(value):
+            self._numerator += value
+            self._denominator += 1.0
+
+        self.value = self._numerator / self._denominator if self._denominator > 0 else math.nan
+        return self.value
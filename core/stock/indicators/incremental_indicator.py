@@ -0,0 +1,33 @@
+from typing import Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+
+
+class IncrementalIndicator(object):
+    """Base class for indicators updated one candle at a time"""
+
+    def __init__(self, columns: Tuple[str, ...]):
+        """
+        Incremental indicator constructor
+
+        :param columns: Names of the columns computed by the indicator
+        """
+        self.columns: Tuple[str, ...] = columns
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        """
+        Compute the indicator values for a new candle
+
+        :param candle: The new candle
+        :return: The indicator values, ordered as the columns
+        """
+        raise NotImplementedError("append method must be override")
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        """
+        Compute again the indicator values after the last candle has been updated
+
+        :param candle: The updated last candle
+        :return: The indicator values, ordered as the columns
+        """
+        raise NotImplementedError("update_last method must be override")
@@ -0,0 +1,179 @@
+import copy
+import re
+from typing import List
+
+import numpy as np
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_ring_buffer import CandleRingBuffer, CANDLE_COLUMNS
+from core.stock.indicators.atr_indicator import AtrIndicator
+from core.stock.indicators.bollinger_bands_indicator import BollingerBandsIndicator
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+from core.stock.indicators.macd_indicator import MacdIndicator
+from core.stock.indicators.moving_average_indicator import MovingAverageIndicator
+from core.stock.indicators.rsi_indicator import RsiIndicator
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
+
+DEFAULT_INDICATOR_COLUMNS: List[str] = ["rsi", "atr_14", "boll", "boll_ub", "boll_lb", "macd", "macds", "macdh",
+                                        "volume_20_sma"]
+
+_MOVING_AVERAGE_COLUMN_PATTERN = re.compile(r"^(open|high|low|close|volume)_(\d+)_(sma|ema|smma)$")
+_RSI_COLUMN_PATTERN = re.compile(r"^rsi(?:_(\d+))?$")
+_ATR_COLUMN_PATTERN = re.compile(r"^atr(?:_(\d+))?$")
+
+
+class IndicatorEngine(object):
+    """
+    Incremental indicator engine. Indicator values are updated in O(1) for each new or updated last candle and stored
+    as additional columns of the data line, aligned with the candles
+
+    Values are computed over the whole candle history, not only over the candles kept by the data line: candles dropped
+    from the data line are fed to a copy of each indicator, which rebuild starts from. An indicator column added after
+    some candles were dropped is computed from the candles still in the data line
+    """
+
+    def __init__(self, data_line: CandleRingBuffer, columns: List[str] = None):
+        """
+        Indicator engine constructor
+
+        :param data_line: The data line the indicators are computed on
+        :param columns: Indicator columns to compute (stockstats naming). DEFAULT_INDICATOR_COLUMNS if None
+        """
+        self._data_line: CandleRingBuffer = data_line
+        self._indicators: List[IncrementalIndicator] = []
+        self._history_indicators: List[IncrementalIndicator] = []  # Indicators fed with the dropped candles only
+        self.columns: List[str] = []
+
+        for column in DEFAULT_INDICATOR_COLUMNS if columns is None else columns:
+            self.add_column(column)
+
+    @staticmethod
+    def is_supported(column: str) -> bool:
+        """
+        Tells if a column can be computed by the engine
+
+        :param column: The column name
+        :return: True if the column is supported, False otherwise
+        """
+        return column in ["boll", "boll_ub", "boll_lb", "macd", "macds", "macdh"] \
+            or any(pattern.match(column) for pattern in [_MOVING_AVERAGE_COLUMN_PATTERN, _RSI_COLUMN_PATTERN,
+                                                         _ATR_COLUMN_PATTERN])
+
+    def add_column(self, column: str) -> None:
+        """
+        Start computing an indicator column. Values are computed for the candles already in the data line
+
+        :param column: The column name (stockstats naming)
+        """
+        if column in self.columns:
+            return
+
+        history_indicator = IndicatorEngine._create_indicator(column)
+        indicator = copy.deepcopy(history_indicator)
+        self._history_indicators.append(history_indicator)
+        self._indicators.append(indicator)
+        self.columns.extend(indicator.columns)
+
+        for indicator_column in indicator.columns:
+            self._data_line.add_column(indicator_column)
+
+        self._replay([indicator])
+
+    def before_upsert(self, identifier: int) -> None:
+        """
+        Feed the oldest candle of the data line to the history indicators if it is going to be dropped by the upsert of
+        a candle. Must be called before each data line upsert
+
+        :param identifier: Identifier of the candle about to be upserted
+        """
+        data_line = self._data_line
+        if len(data_line) < data_line.capacity or identifier <= data_line.first_identifier:
+            return  # Nothing is dropped when the buffer is not full, older candles than the oldest one are ignored
+
+        if identifier <= data_line.last_identifier:
+            identifiers = data_line.identifiers
+            if identifiers[int(np.searchsorted(identifiers, identifier))] == identifier:
+                return  # Update of a stored candle
+
+        oldest_candle = {column: data_line.get_column(column)[0].item() for column in CANDLE_COLUMNS}
+        for history_indicator in self._history_indicators:
+            history_indicator.append(oldest_candle)
+
+    def append(self, candle: RawStockDataDict) -> None:
+        """
+        Compute the indicator values of a candle just appended to the data line
+
+        :param candle: The appended candle
+        """
+        for indicator in self._indicators:
+            self._write_last_values(indicator, indicator.append(candle))
+
+    def update_last(self, candle: RawStockDataDict) -> None:
+        """
+        Compute again the indicator values of the last candle of the data line after it has been updated
+
+        :param candle: The updated candle
+        """
+        for indicator in self._indicators:
+            self._write_last_values(indicator, indicator.update_last(candle))
+
+    def rebuild(self) -> None:
+        """
+        Compute again all the indicator values of the data line (needed when an older candle changed), starting from
+        the history indicators so that values stay continuous with the dropped candles
+        """
+        self._indicators = [copy.deepcopy(history_indicator) for history_indicator in self._history_indicators]
+        self._replay(self._indicators)
+
+    def _write_last_values(self, indicator: IncrementalIndicator, values: tuple) -> None:
+        """
+        Write indicator values for the last candle of the data line
+
+        :param indicator: The indicator the values come from
+        :param values: The values, ordered as the indicator columns
+        """
+        for column, value in zip(indicator.columns, values):
+            self._data_line.set_value(column, -1, value)
+
+    def _replay(self, indicators: List[IncrementalIndicator]) -> None:
+        """
+        Compute the given indicators over all the candles of the data line
+
+        :param indicators: The indicators to compute
+        """
+        rows = zip(*[self._data_line.get_column(column).tolist() for column in CANDLE_COLUMNS])
+
+        for index, row in enumerate(rows):
+            candle = dict(zip(CANDLE_COLUMNS, row))
+            for indicator in indicators:
+                for column, value in zip(indicator.columns, indicator.append(candle)):
+                    self._data_line.set_value(column, index, value)
+
+    @staticmethod
+    def _create_indicator(column: str) -> IncrementalIndicator:
+        """
+        Create the indicator computing a given column
+
+        :param column: The column name (stockstats naming)
+        :return: The indicator
+        """
+        if column in ["boll", "boll_ub", "boll_lb"]:
+            return BollingerBandsIndicator()
+
+        if column in ["macd", "macds", "macdh"]:
+            return MacdIndicator()
+
+        moving_average_match = _MOVING_AVERAGE_COLUMN_PATTERN.match(column)
+        if moving_average_match:
+            return MovingAverageIndicator(moving_average_match.group(1), int(moving_average_match.group(2)),
+                                          moving_average_match.group(3))
+
+        rsi_match = _RSI_COLUMN_PATTERN.match(column)
+        if rsi_match:
+            return RsiIndicator(int(rsi_match.group(1)) if rsi_match.group(1) else None)
+
+        atr_match = _ATR_COLUMN_PATTERN.match(column)
+        if atr_match:
+            return AtrIndicator(int(atr_match.group(1)) if atr_match.group(1) else None)
+
+        raise FtxAlgotradingException(f"Indicator column {column} is not supported by the indicator engine")
@@ -0,0 +1,30 @@
+from typing import Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.indicators.exponential_moving_average import ExponentialMovingAverage
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+
+
+class MacdIndicator(IncrementalIndicator):
+    """Moving average convergence divergence: macd line (macd), signal line (macds) and histogram (macdh)"""
+
+    MACD_EMA_SHORT = 12
+    MACD_EMA_LONG = 26
+    MACD_EMA_SIGNAL = 9
+
+    def __init__(self):
+        """Macd indicator constructor"""
+        super(MacdIndicator, self).__init__(("macd", "macds", "macdh"))
+        self._short_ema: ExponentialMovingAverage = ExponentialMovingAverage.from_span(MacdIndicator.MACD_EMA_SHORT)
+        self._long_ema: ExponentialMovingAverage = ExponentialMovingAverage.from_span(MacdIndicator.MACD_EMA_LONG)
+        self._signal_ema: ExponentialMovingAverage = ExponentialMovingAverage.from_span(MacdIndicator.MACD_EMA_SIGNAL)
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        macd = self._short_ema.append(candle["close_price"]) - self._long_ema.append(candle["close_price"])
+        signal = self._signal_ema.append(macd)
+        return macd, signal, macd - signal
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        macd = self._short_ema.update_last(candle["close_price"]) - self._long_ema.update_last(candle["close_price"])
+        signal = self._signal_ema.update_last(macd)
+        return macd, signal, macd - signal
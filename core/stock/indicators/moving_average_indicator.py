@@ -0,0 +1,44 @@
+from typing import Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.indicators.exponential_moving_average import ExponentialMovingAverage
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+from core.stock.indicators.rolling_window_statistics import RollingWindowStatistics
+
+MOVING_AVERAGE_SOURCES = {
+    "open": "open_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "close_price",
+    "volume": "volume"
+}
+
+
+class MovingAverageIndicator(IncrementalIndicator):
+    """Simple (sma), exponential (ema) or smoothed (smma) moving average of a candle value"""
+
+    def __init__(self, source: str, window: int, kind: str):
+        """
+        Moving average indicator constructor
+
+        :param source: The averaged candle value: open, high, low, close or volume
+        :param window: The moving average window
+        :param kind: sma, ema or smma
+        """
+        super(MovingAverageIndicator, self).__init__((f"{source}_{window}_{kind}",))
+        self._source: str = MOVING_AVERAGE_SOURCES[source]
+        self._sma: RollingWindowStatistics = RollingWindowStatistics(window) if kind == "sma" else None
+        self._ema: ExponentialMovingAverage = ExponentialMovingAverage.from_span(window) if kind == "ema" \
+            else ExponentialMovingAverage.from_window(window) if kind == "smma" else None
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        if self._sma is not None:
+            self._sma.append(candle[self._source])
+            return self._sma.mean,
+        return self._ema.append(candle[self._source]),
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        if self._sma is not None:
+            self._sma.update_last(candle[self._source])
+            return self._sma.mean,
+        return self._ema.update_last(candle[self._source]),
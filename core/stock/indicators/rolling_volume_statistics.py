@@ -0,0 +1,122 @@
+import math
+from collections import deque
+from typing import Deque, Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+
+
+class RollingVolumeStatistics(object):
+    """
+    Volume sum, zero volume candle number and green candle number over a window of candles, updated in O(1) for each
+    new or updated last candle. The window holds the depth candles preceding the offset last candles (ie: depth=100,
+    offset=4 covers stock_data_list[-104:-4])
+    """
+
+    def __init__(self, depth: int, offset: int = 0):
+        """
+        Rolling volume statistics constructor
+
+        :param depth: Number of candles in the window
+        :param offset: Number of last candles excluded from the window
+        """
+        self.depth: int = depth
+        self.offset: int = offset
+        self._pending_candles: Deque[Tuple[float, bool]] = deque()  # (volume, is green) of the offset last candles
+        self._window_candles: Deque[Tuple[float, bool]] = deque()  # (volume, is green) of the window candles
+        self._volume_sum: float = 0.0
+        self._zero_volume_candle_number: int = 0
+        self._green_candle_number: int = 0
+        self._appended_candle_number: int = 0
+
+    @property
+    def candle_number(self) -> int:
+        """
+        :return: Number of candles in the window (less than depth while there is not enough data)
+        """
+        return len(self._window_candles)
+
+    @property
+    def is_full(self) -> bool:
+        """
+        :return: True if the window holds depth candles
+        """
+        return len(self._window_candles) == self.depth
+
+    @property
+    def volume_sum(self) -> float:
+        return self._volume_sum
+
+    @property
+    def volume_mean(self) -> float:
+        return self._volume_sum / len(self._window_candles) if len(self._window_candles) > 0 else math.nan
+
+    @property
+    def zero_volume_candle_number(self) -> int:
+        return self._zero_volume_candle_number
+
+    @property
+    def green_candle_number(self) -> int:
+        return self._green_candle_number
+
+    def reset(self) -> None:
+        """Forget every candle"""
+        self._pending_candles.clear()
+        self._window_candles.clear()
+        self._volume_sum = 0.0
+        self._zero_volume_candle_number = 0
+        self._green_candle_number = 0
+        self._appended_candle_number = 0
+
+    def append(self, candle: RawStockDataDict) -> None:
+        """
+        Add a new last candle, moving the window forward
+
+        :param candle: The new candle
+        """
+        self._pending_candles.append((candle["volume"], candle["open_price"] <= candle["close_price"]))
+
+        if len(self._pending_candles) > self.offset:
+            self._add(self._pending_candles.popleft())
+
+            if len(self._window_candles) > self.depth:
+                self._remove(self._window_candles.popleft())
+
+        # Running sums accumulate rounding errors, start again from the window values from time to time
+        self._appended_candle_number += 1
+        if self._appended_candle_number % self.depth == 0:
+            self._volume_sum = math.fsum(volume for volume, _ in self._window_candles)
+
+    def update_last(self, candle: RawStockDataDict) -> None:
+        """
+        Replace the last candle
+
+        :param candle: The new values of the last candle
+        """
+        values = (candle["volume"], candle["open_price"] <= candle["close_price"])
+
+        if self.offset > 0:
+            self._pending_candles[-1] = values
+        else:
+            self._remove(self._window_candles.pop())
+            self._add(values)
+
+    def _add(self, values: Tuple[float, bool]) -> None:
+        """
+        Add a candle to the window
+
+        :param values: Volume and color (True if green) of the candle
+        """
+        self._window_candles.append(values)
+        self._volume_sum += values[0]
+        self._zero_volume_candle_number += values[0] == 0
+        self._green_candle_number += values[1]
+
+    def _remove(self, values: Tuple[float, bool]) -> None:
+        """
+        Remove a candle from the statistics (the candle must have been removed from the window)
+
+        :param values: Volume and color (True if green) of the candle
+        """
+        self._volume_sum -= values[0]
+        self._zero_volume_candle_number -= values[0] == 0
+        self._green_candle_number -= values[1]
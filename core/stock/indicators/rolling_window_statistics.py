@@ -0,0 +1,91 @@
+import math
+from collections import deque
+from typing import Deque
+
+
+class RollingWindowStatistics(object):
+    """
+    Mean and standard deviation over the last values, updated one value at a time. Gives the same results as pandas
+    rolling(window, min_periods=1).mean() and .std(), used by stockstats
+    """
+
+    def __init__(self, window: int):
+        """
+        Rolling window statistics constructor
+
+        :param window: Number of values in the window
+        """
+        self._window: int = window
+        self._values: Deque[float] = deque()
+        self._mean: float = 0.0
+        self._sum_of_squared_deviations: float = 0.0
+        self._appended_values_number: int = 0
+
+    @property
+    def mean(self) -> float:
+        return self._mean if len(self._values) > 0 else math.nan
+
+    @property
+    def std(self) -> float:
+        if len(self._values) < 2:
+            return math.nan
+        return math.sqrt(max(self._sum_of_squared_deviations, 0.0) / (len(self._values) - 1))
+
+    def append(self, value: float) -> None:
+        """
+        Add a new value, removing the oldest one if the window is full
+
+        :param value: The new value
+        """
+        if len(self._values) == self._window:
+            self._remove(self._values.popleft(), len(self._values))
+
+        self._values.append(value)
+        self._add(value, len(self._values))
+
+        # Running updates accumulate rounding errors, start again from the window values from time to time
+        self._appended_values_number += 1
+        if self._appended_values_number % self._window == 0:
+            self._recompute()
+
+    def update_last(self, value: float) -> None:
+        """
+        Replace the last added value
+
+        :param value: The new last value
+        """
+        self._remove(self._values[-1], len(self._values) - 1)
+        self._values[-1] = value
+        self._add(value, len(self._values))
+
+    def _add(self, value: float, n: int) -> None:
+        """
+        Welford update adding a value to the statistics
+
+        :param value: The value to add
+        :param n: Number of values once the value is added
+        """
+        delta = value - self._mean
+        self._mean += delta / n
+        self._sum_of_squared_deviations += delta * (value - self._mean)
+
+    def _remove(self, value: float, n: int) -> None:
+        """
+        Welford update removing a value from the statistics
+
+        :param value: The value to remove
+        :param n: Number of values once the value is removed
+        """
+        if n <= 0:
+            self._mean = 0.0
+            self._sum_of_squared_deviations = 0.0
+            return
+
+        delta = value - self._mean
+        self._mean -= delta / n
+        self._sum_of_squared_deviations -= delta * (value - self._mean)
+
+    def _recompute(self) -> None:
+        """Recompute the statistics from the window values"""
+        self._mean = math.fsum(self._values) / len(self._values)
+        self._sum_of_squared_deviations = math.fsum((value - self._mean) ** 2 for value in self._values)
@@ -0,0 +1,61 @@
+import math
+from typing import Optional, Tuple
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.indicators.exponential_moving_average import ExponentialMovingAverage
+from core.stock.indicators.incremental_indicator import IncrementalIndicator
+
+RSI_DEFAULT_WINDOW = 14
+
+
+class RsiIndicator(IncrementalIndicator):
+    """Relative strength index (rsi), smoothed moving averages of the close price gains and losses"""
+
+    def __init__(self, window: Optional[int] = None):
+        """
+        Rsi indicator constructor
+
+        :param window: The rsi window. Column is named rsi for the default window (14), rsi_<window> otherwise
+        """
+        super(RsiIndicator, self).__init__(("rsi",) if window is None else (f"rsi_{window}",))
+        window = RSI_DEFAULT_WINDOW if window is None else window
+        self._gains: ExponentialMovingAverage = ExponentialMovingAverage.from_window(window)
+        self._losses: ExponentialMovingAverage = ExponentialMovingAverage.from_window(window)
+        self._previous_close: Optional[float] = None  # Close price of the candle before the last one
+        self._last_close: Optional[float] = None
+
+    def append(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._previous_close = self._last_close
+        self._last_close = candle["close_price"]
+        change = self._get_change()
+        return RsiIndicator._rsi(self._gains.append((change + abs(change)) / 2),
+                                 self._losses.append((-change + abs(change)) / 2)),
+
+    def update_last(self, candle: RawStockDataDict) -> Tuple[float, ...]:
+        self._last_close = candle["close_price"]
+        change = self._get_change()
+        return RsiIndicator._rsi(self._gains.update_last((change + abs(change)) / 2),
+                                 self._losses.update_last((-change + abs(change)) / 2)),
+
+    def _get_change(self) -> float:
+        """
+        Close price change of the last candle (0 for the first candle)
+
+        :return: The close price change
+        """
+        return self._last_close - self._previous_close if self._previous_close is not None else 0.0
+
+    @staticmethod
+    def _rsi(average_gain: float, average_loss: float) -> float:
+        """
+        Compute the rsi value
+
+        :param average_gain: Smoothed average gain
+        :param average_loss: Smoothed average loss
+        :return: The rsi value (NaN when there is no gain nor loss yet)
+        """
+        if average_loss == 0:
+            if average_gain == 0 or math.isnan(average_gain):
+                return math.nan
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + average_gain / average_loss)
@@ -1,6 +1,7 @@
-from typing import List
+from typing import Iterator, List, Optional
 
 from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_archive import CandleArchive
 from core.stock.time_frame_manager import TimeFrameManager
 
 
@@ -8,28 +9,51 @@ class MockedCandleInjector(object):
     """Mocked candle injector"""
 
     def __init__(self, time_frame_manager: TimeFrameManager, pending_data: List[RawStockDataDict] = None,
-                 initial_data: List[RawStockDataDict] = None):
+                 initial_data: List[RawStockDataDict] = None, candle_stream: Iterator[RawStockDataDict] = None):
         """
         Stock data manager constructor
 
         :param time_frame_manager: Time frame manager to mock data into
         :param pending_data: Data waiting to be injected within the time frame
         :param initial_data: Initial data candles to inject within the time frame
+        :param candle_stream: Candles to inject within the time frame once pending_data is empty, sorted by time asc
         """
         self.time_frame_manager = time_frame_manager
-        self.pending_data = pending_data
+        self.pending_data = pending_data if pending_data is not None else []
+        self.candle_stream: Optional[Iterator[RawStockDataDict]] = candle_stream
 
         if initial_data is not None:
             self.time_frame_manager.stock_data_manager.update_data(initial_data)
 
-    def tick(self, next_candle: RawStockDataDict = None) -> None:
+    @staticmethod
+    def from_candle_archive(time_frame_manager: TimeFrameManager, candle_archive: CandleArchive,
+                            start_time: Optional[int] = None, end_time: Optional[int] = None) -> 'MockedCandleInjector':
+        """
+        Create a candle injector streaming the archived candles of the time frame market
+
+        :param time_frame_manager: Time frame manager to mock data into
+        :param candle_archive: Archive to read the candles from
+        :param start_time: Time of the first injected candle. From the first archived candle if None
+        :param end_time: Time after the last injected candle (excluded). Up to the last archived candle if None
+        :return: The candle injector
+        """
+        return MockedCandleInjector(time_frame_manager, candle_stream=candle_archive.iter_stock_data(
+            time_frame_manager.market, time_frame_manager.time_frame_length, start_time, end_time))
+
+    def tick(self, next_candle: RawStockDataDict = None) -> bool:
         """
         Simulate a stock data reception injecting a candle within the managed time frame
 
-        :param next_candle: Next candle to be injected. Will use the pending_data if None
+        :param next_candle: Next candle to be injected. Will use the pending_data, then the candle_stream if None
+        :return: True if a candle has been injected, False if there was no more candle to inject
         """
         if next_candle is None and len(self.pending_data) > 0:
             next_candle = self.pending_data.pop()
 
+        if next_candle is None and self.candle_stream is not None:
+            next_candle = next(self.candle_stream, None)
+
         if next_candle is not None:
             self.time_frame_manager.stock_data_manager.update_data([next_candle])
+
+        return next_candle is not None
@@ -0,0 +1,82 @@
+import zlib
+from itertools import zip_longest
+from typing import Dict, List, Optional, Tuple
+
+from core.enums.side_enum import SideEnum
+from core.models.orderbook_snapshot_dict import OrderbookSnapshotDict
+from core.stock.orderbook_analytics import OrderbookAnalytics
+from core.stock.orderbook_side import OrderbookSide
+
+CHECKSUM_DEPTH = 100  # Number of levels of each side used to compute the FTX orderbook checksum
+
+
+class Orderbook(object):
+    """
+    Orderbook of a market, updated with FTX orderbook channel deltas. Levels are updated in O(log n) and the checksum is
+    computed incrementally: only the top levels from the first changed rank are formatted again
+    """
+
+    def __init__(self):
+        """Orderbook constructor"""
+        self.bids: OrderbookSide = OrderbookSide(is_bids=True)
+        self.asks: OrderbookSide = OrderbookSide(is_bids=False)
+        self.analytics: OrderbookAnalytics = OrderbookAnalytics(self.bids, self.asks)
+        self.timestamp: float = 0.0  # Time of the last applied update
+        self._checksum_parts: List[str] = []  # Checksum text of each (bid, ask) pair of the top levels
+        self._checksum: int = zlib.crc32(b'')
+
+    def update(self, bids: List[Tuple[float, float]], asks: List[Tuple[float, float]], timestamp: float) -> None:
+        """
+        Apply an orderbook update. Levels with a 0 size are removed
+
+        :param bids: The updated (price, size) bid levels
+        :param asks: The updated (price, size) ask levels
+        :param timestamp: Time of the update
+        """
+        changed_rank = max(CHECKSUM_DEPTH, self.analytics.imbalance_depth)  # Nothing changed in the top levels
+
+        for price, size in bids:
+            changed_rank = min(changed_rank, self.bids.update(price, size))
+        for price, size in asks:
+            changed_rank = min(changed_rank, self.asks.update(price, size))
+
+        self.timestamp = timestamp
+        self.analytics.update(changed_rank)
+
+        # Pairs above the first changed rank are unchanged, and the checksum is unchanged if only deep levels changed
+        if changed_rank < CHECKSUM_DEPTH:
+            checksum_parts = self._checksum_parts[:changed_rank]
+            checksum_parts.extend(
+                ':'.join(level_text for level_text in pair if level_text)
+                for pair in zip_longest(self.bids.get_level_texts(changed_rank, CHECKSUM_DEPTH),
+                                        self.asks.get_level_texts(changed_rank, CHECKSUM_DEPTH))
+            )
+            self._checksum_parts = checksum_parts
+            self._checksum = zlib.crc32(':'.join(checksum_parts).encode())
+
+    def get_checksum(self) -> int:
+        """
+        :return: The FTX checksum (crc32) of the top 100 levels of each side
+        """
+        return self._checksum
+
+    def get_snapshot(self) -> OrderbookSnapshotDict:
+        """
+        :return: Best bid / ask, spread, microprice and depth imbalance of the orderbook
+        """
+        return self.analytics.get_snapshot(self.timestamp)
+
+    def get_vwap(self, side: SideEnum, size: float) -> Optional[float]:
+        """
+        :param side: Side of the order
+        :param size: Size of the order
+        :return: The expected average fill price of a market order. None if the book does not hold enough size
+        """
+        return self.analytics.get_vwap(side, size)
+
+    def get_levels(self, depth: Optional[int] = None) -> Dict[str, List[Tuple[float, float]]]:
+        """
+        :param depth: Maximum number of levels of each side to return. All of them if None
+        :return: The (price, size) levels of each side, from the best price to the worst one { [side]: levels }
+        """
+        return {'bids': self.bids.get_levels(depth), 'asks': self.asks.get_levels(depth)}
@@ -0,0 +1,90 @@
+from typing import Optional
+
+from core.enums.side_enum import SideEnum
+from core.models.orderbook_snapshot_dict import OrderbookSnapshotDict
+from core.stock.orderbook_side import OrderbookSide
+
+IMBALANCE_DEPTH = 10  # Number of levels of each side used to compute the depth imbalance
+
+
+class OrderbookAnalytics(object):
+    """
+    Depth analytics of an orderbook: best bid / ask, spread, microprice, depth imbalance and expected fill price of an
+    order. The snapshot is only computed again after a change in the top levels
+    """
+
+    def __init__(self, bids: OrderbookSide, asks: OrderbookSide, imbalance_depth: int = IMBALANCE_DEPTH):
+        """
+        Orderbook analytics constructor
+
+        :param bids: The bids side of the orderbook
+        :param asks: The asks side of the orderbook
+        :param imbalance_depth: Number of levels of each side used to compute the depth imbalance
+        """
+        self._bids: OrderbookSide = bids
+        self._asks: OrderbookSide = asks
+        self.imbalance_depth: int = imbalance_depth
+        self._snapshot: Optional[OrderbookSnapshotDict] = None
+
+    def update(self, changed_rank: int) -> None:
+        """
+        Notify an orderbook update
+
+        :param changed_rank: Rank of the first changed level of both sides
+        """
+        if changed_rank < self.imbalance_depth:
+            self._snapshot = None
+
+    def get_snapshot(self, timestamp: float) -> OrderbookSnapshotDict:
+        """
+        :param timestamp: Time of the last orderbook update
+        :return: The orderbook snapshot
+        """
+        snapshot = self._snapshot
+
+        if snapshot is None:
+            snapshot = self._compute_snapshot()
+            self._snapshot = snapshot
+
+        return {**snapshot, "timestamp": timestamp}
+
+    def get_vwap(self, side: SideEnum, size: float) -> Optional[float]:
+        """
+        :param side: Side of the order. A buy order is filled by the asks, a sell order by the bids
+        :param size: Size of the order
+        :return: The expected average fill price of a market order. None if the book does not hold enough size
+        """
+        return (self._asks if side == SideEnum.BUY else self._bids).get_vwap(size)
+
+    def _compute_snapshot(self) -> OrderbookSnapshotDict:
+        """
+        :return: The orderbook snapshot, without timestamp
+        """
+        best_bids = self._bids.get_levels(1)
+        best_asks = self._asks.get_levels(1)
+        best_bid, best_bid_size = best_bids[0] if len(best_bids) > 0 else (None, 0.0)
+        best_ask, best_ask_size = best_asks[0] if len(best_asks) > 0 else (None, 0.0)
+
+        bid_depth_size = self._bids.get_depth_size(self.imbalance_depth)
+        ask_depth_size = self._asks.get_depth_size(self.imbalance_depth)
+        depth_size = bid_depth_size + ask_depth_size
+
+        snapshot: OrderbookSnapshotDict = {
+            "timestamp": 0.0,
+            "best_bid": best_bid,
+            "best_bid_size": best_bid_size,
+            "best_ask": best_ask,
+            "best_ask_size": best_ask_size,
+            "spread": None,
+            "mid_price": None,
+            "microprice": None,
+            "imbalance": (bid_depth_size - ask_depth_size) / depth_size if depth_size > 0 else None
+        }
+
+        if best_bid is not None and best_ask is not None:
+            snapshot["spread"] = best_ask - best_bid
+            snapshot["mid_price"] = (best_bid + best_ask) / 2
+            snapshot["microprice"] = (best_bid * best_ask_size + best_ask * best_bid_size) / \
+                (best_bid_size + best_ask_size)
+
+        return snapshot
@@ -0,0 +1,100 @@
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+
+class OrderbookSide(object):
+    """
+    One side (bids or asks) of an orderbook. Prices are kept in a sorted array, from the best one to the worst one, so
+    that a level is found by binary search and the top levels are read without sorting
+    """
+
+    def __init__(self, is_bids: bool):
+        """
+        Orderbook side constructor
+
+        :param is_bids: True for the bids side (best price is the highest one), False for the asks side
+        """
+        self._sign: float = -1.0 if is_bids else 1.0
+        self._keys: List[float] = []  # Sorted (ascending) price * sign, the best price first
+        self._sizes: Dict[float, float] = {}  # { [price]: size }
+        self._level_texts: Dict[float, str] = {}  # { [price]: "price:size" } (checksum text of each level)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def update(self, price: float, size: float) -> int:
+        """
+        Set the size of a price level. The level is removed if the size is 0
+
+        :param price: The price of the level
+        :param size: The new size of the level
+        :return: Rank of the updated level (0 for the best price). Levels from this rank may have changed
+        """
+        key = price * self._sign
+        rank = bisect_left(self._keys, key)
+        is_known_price = rank < len(self._keys) and self._keys[rank] == key
+
+        if size:
+            if not is_known_price:
+                self._keys.insert(rank, key)
+            self._sizes[price] = size
+            self._level_texts[price] = f'{float(price)}:{float(size)}'
+        elif is_known_price:
+            del self._keys[rank]
+            self._sizes.pop(price, None)
+            self._level_texts.pop(price, None)
+
+        return rank
+
+    def get_levels(self, depth: Optional[int] = None) -> List[Tuple[float, float]]:
+        """
+        :param depth: Maximum number of levels to return. All of them if None
+        :return: The (price, size) levels, from the best price to the worst one
+        """
+        sizes = self._sizes
+        levels = []
+
+        for key in self._keys[:depth]:
+            price = key * self._sign
+            size = sizes.get(price)
+            if size:  # The level may have been removed while reading it from another thread
+                levels.append((price, size))
+
+        return levels
+
+    def get_depth_size(self, depth: int) -> float:
+        """
+        :param depth: Number of levels
+        :return: The total size of the top levels
+        """
+        sizes = self._sizes
+        return sum(sizes.get(key * self._sign, 0.0) for key in self._keys[:depth])
+
+    def get_vwap(self, size: float) -> Optional[float]:
+        """
+        Compute the average price an order of a given size would be filled at, taking the levels from the best one
+
+        :param size: Size of the order
+        :return: The volume weighted average fill price. None if the side does not hold enough size
+        """
+        sizes = self._sizes
+        remaining_size = size
+        cost = 0.0
+
+        for key in self._keys:
+            price = key * self._sign
+            filled_size = min(sizes.get(price, 0.0), remaining_size)
+            cost += filled_size * price
+            remaining_size -= filled_size
+            if remaining_size <= 0:
+                return cost / size if size > 0 else price
+
+        return None
+
+    def get_level_texts(self, start: int, stop: int) -> List[str]:
+        """
+        :param start: Rank of the first level
+        :param stop: Rank after the last level
+        :return: The "price:size" checksum texts of the levels between the two ranks
+        """
+        return [self._level_texts[key * self._sign] for key in self._keys[start:stop]]
@@ -1,10 +1,17 @@
-from typing import Set, List, Optional
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
 
-import pandas as pd
-import stockstats
+import numpy as np
 
+from core.enums.candle_upsert_result_enum import CandleUpsertResultEnum
 from core.models.candle import Candle
 from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.candle_ring_buffer import CandleRingBuffer
+from core.stock.indicators.indicator_engine import IndicatorEngine
+from core.stock.indicators.rolling_volume_statistics import RollingVolumeStatistics
+from core.stock.stock_indicators_accessor import StockIndicatorsAccessor
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
 
 MAX_ITEM_IN_IND_LIST: int = 200
 MAX_ITEM_IN_DATA_SET: int = 300
@@ -20,42 +27,121 @@ class StockDataManager(object):
         :param data_list: Data candle list
         :param auto_compute_indicators: automatically compute indicators or not
         """
-        self._data_line: Set[Candle] = set()
+        self._data_line: CandleRingBuffer = CandleRingBuffer(MAX_ITEM_IN_DATA_SET)
         self._data_line_cursor: int = -1  # Last candle identifier performed
-        self.stock_data_list: List[Candle] = []  # Last candle values
-        self.stock_indicators: Optional[stockstats.StockDataFrame] = None
+        self._stock_data_list: List[Candle] = []  # Last candle values
+        self._stock_data_list_version: int = -1  # Data line version used to build the last candle values
+        self._oldest_changed_identifier: Optional[int] = None  # Oldest candle changed since the last values build
+        self._lock: threading.RLock = threading.RLock()
         self._auto_compute_indicators = auto_compute_indicators  # Indicate if the stock_indicators should be computed
+        # Indicators are only computed once read through stock_indicators, then kept up to date incrementally
+        self._indicator_engine: Optional[IndicatorEngine] = IndicatorEngine(self._data_line, []) \
+            if auto_compute_indicators else None
+        self._stock_indicators: Optional[StockIndicatorsAccessor] = \
+            StockIndicatorsAccessor(self._data_line, self._indicator_engine, self._lock) \
+            if auto_compute_indicators else None
+        # Rolling volume statistics: { [(depth, offset)]: statistics }
+        self._volume_statistics: Dict[Tuple[int, int], RollingVolumeStatistics] = {}
 
         if data_list is not None:
             self.update_data(data_list)
 
+    @property
+    def stock_data_list(self) -> List[Candle]:
+        """
+        Last MAX_ITEM_IN_IND_LIST candles as Candle objects, sorted by identifier asc. The list is only rebuilt when
+        the data line changed since the last call, and only the changed candles are created again. Prefer
+        get_data_view for numeric computations
+
+        :return: The last candles
+        """
+        with self._lock:
+            if self._stock_data_list_version != self._data_line.version:
+                depth = min(MAX_ITEM_IN_IND_LIST, len(self._data_line))
+                first_identifier = int(self._data_line.get_column("identifier", depth)[0]) if depth > 0 else 0
+                identifiers = [candle.identifier for candle in self._stock_data_list]
+
+                # Candles older than the oldest changed one are still valid
+                kept_candles = self._stock_data_list[
+                    bisect.bisect_left(identifiers, first_identifier):
+                    bisect.bisect_left(identifiers, self._oldest_changed_identifier)
+                ] if self._oldest_changed_identifier is not None else []
+
+                self._stock_data_list = kept_candles + self._data_line.to_candle_list(depth - len(kept_candles))
+                self._stock_data_list_version = self._data_line.version
+                self._oldest_changed_identifier = None
+
+            return self._stock_data_list
+
+    @property
+    def stock_indicators(self) -> Optional[StockIndicatorsAccessor]:
+        """
+        Lazy technical indicators accessor. Read columns with stockstats names, ie: stock_indicators["rsi"]
+
+        :return: The indicators accessor, None if there is no data yet or if indicators are disabled
+        """
+        return self._stock_indicators if len(self._data_line) > 0 else None
+
+    def get_volume_statistics(self, depth: int, offset: int = 0) -> RollingVolumeStatistics:
+        """
+        Return volume statistics over a window of candles, kept up to date in O(1) for each new candle. Statistics are
+        computed from the data line on first call
+
+        :param depth: Number of candles in the window
+        :param offset: Number of last candles excluded from the window (ie: depth=100, offset=4 covers
+        stock_data_list[-104:-4])
+        :return: The rolling volume statistics (volume_sum, zero_volume_candle_number, green_candle_number, ...)
+        """
+        with self._lock:
+            if (depth, offset) not in self._volume_statistics:
+                if depth <= 0 or offset < 0:
+                    raise FtxAlgotradingException(f"Invalid volume statistics window: depth {depth}, offset {offset}")
+
+                volume_statistics = RollingVolumeStatistics(depth, offset)
+                self._replay_volume_statistics(volume_statistics)
+                self._volume_statistics[(depth, offset)] = volume_statistics
+
+            return self._volume_statistics[(depth, offset)]
+
+    def get_data_view(self, column: str, depth: Optional[int] = None) -> np.ndarray:
+        """
+        Return a read only view over a data line column, sorted by identifier asc. The view is not a copy: it is only
+        valid until the next data update and must be copied to be kept
+
+        :param column: identifier, time, open_price, high_price, low_price, close_price or volume
+        :param depth: Number of last candles to return. All the data line if None
+        :return: A read only numpy view over the column
+        """
+        with self._lock:
+            return self._data_line.get_column(column, depth)
+
+    def to_records(self) -> np.ndarray:
+        """
+        Copy the data line into a record array
+
+        :return: The candle records (see CANDLE_DTYPE), sorted by identifier asc
+        """
+        with self._lock:
+            return self._data_line.to_records()
+
     def update_data(self, data_list: List[RawStockDataDict]) -> None:
         """
-        Update the data line and compute indicators
+        Update the data line
 
         :param data_list: The raw data list
         """
+        with self._lock:
+            # Add new stock data (can be 0, one or several)
+            self._update_data_line(data_list)
 
-        # Add new stock data (can be 0, one or several)
-        self._update_data_line(data_list)
-        self.stock_data_list = self._get_data_line()
+            if len(self._data_line) == 0:
+                return
 
-        if len(self.stock_data_list) > 0:
             if self._data_line_cursor == -1:
                 # Put the cursor at the position just before the first candle
-                self._data_line_cursor = self.stock_data_list[0].identifier - 1
-
-            # auto compute indicators if set
-            if self._auto_compute_indicators:
-                self._compute_indicators()
-
-        if len(self.stock_data_list) > MAX_ITEM_IN_IND_LIST:
-            self.stock_data_list = self.stock_data_list[-MAX_ITEM_IN_IND_LIST:]
+                self._data_line_cursor = self._data_line.first_identifier - 1
 
-        if len(self._data_line) > MAX_ITEM_IN_DATA_SET:
-            self._data_line = set(self._get_data_line()[-MAX_ITEM_IN_DATA_SET:])
-
-        self._data_line_cursor = self.stock_data_list[-1].identifier  # Update the cursor position
+            self._data_line_cursor = self._data_line.last_identifier  # Update the cursor position
 
     def _update_data_line(self, data_list: List[RawStockDataDict]) -> None:
         """
@@ -63,31 +149,58 @@ class StockDataManager(object):
 
         :param data_list: The raw data list
         """
+        indicators_need_rebuild = False
+        volume_statistics_need_rebuild = False
+
         if data_list is not None:
             for data in data_list:
-                self._data_line.add(
-                    Candle(data["id"], data["time"], data["open_price"], data["high_price"], data["low_price"],
-                           data["close_price"], data["volume"])
-                )
-
-    def _compute_indicators(self) -> None:
-        """Compute indicators"""
+                if self._indicator_engine is not None:
+                    self._indicator_engine.before_upsert(data["id"])  # Keep the candle history of the indicators
 
-        data_line_dict_list = [{
-            "date": data_item.time,
-            "open": data_item.open_price,
-            "high": data_item.high_price,
-            "low": data_item.low_price,
-            "close": data_item.close_price,
-            "volume": data_item.volume
-        } for data_item in self.stock_data_list]
-
-        self.stock_indicators = stockstats.StockDataFrame.retype(pd.DataFrame(data_line_dict_list))
+                upsert_result = self._data_line.upsert(
+                    data["id"], data["time"], data["open_price"], data["high_price"], data["low_price"],
+                    data["close_price"], data["volume"]
+                )
 
-    def _get_data_line(self) -> List[Candle]:
+                if upsert_result is not CandleUpsertResultEnum.UNCHANGED:
+                    self._oldest_changed_identifier = data["id"] if self._oldest_changed_identifier is None \
+                        else min(self._oldest_changed_identifier, data["id"])
+
+                # Keep incremental indicators in sync with the data line
+                if self._indicator_engine is not None and not indicators_need_rebuild:
+                    if upsert_result is CandleUpsertResultEnum.APPENDED:
+                        self._indicator_engine.append(data)
+                    elif upsert_result is CandleUpsertResultEnum.LAST_UPDATED:
+                        self._indicator_engine.update_last(data)
+                    elif upsert_result is not CandleUpsertResultEnum.UNCHANGED:
+                        indicators_need_rebuild = True  # An older candle changed
+
+                if not volume_statistics_need_rebuild:
+                    for volume_statistics in self._volume_statistics.values():
+                        if upsert_result is CandleUpsertResultEnum.APPENDED:
+                            volume_statistics.append(data)
+                        elif upsert_result is CandleUpsertResultEnum.LAST_UPDATED:
+                            volume_statistics.update_last(data)
+                        elif upsert_result is not CandleUpsertResultEnum.UNCHANGED:
+                            volume_statistics_need_rebuild = True
+
+        if indicators_need_rebuild:
+            self._indicator_engine.rebuild()
+
+        if volume_statistics_need_rebuild:
+            for volume_statistics in self._volume_statistics.values():
+                self._replay_volume_statistics(volume_statistics)
+
+    def _replay_volume_statistics(self, volume_statistics: RollingVolumeStatistics) -> None:
         """
-        Return the data line sorted by identifier asc
+        Compute volume statistics from the last candles of the data line
 
-        :return: The data line sorted by identifier asc
+        :param volume_statistics: The volume statistics
         """
-        return sorted(self._data_line, key=lambda k: k.identifier)
+        depth = volume_statistics.depth + volume_statistics.offset
+        volume_statistics.reset()
+
+        for volume, open_price, close_price in zip(self._data_line.get_column("volume", depth).tolist(),
+                                                   self._data_line.get_column("open_price", depth).tolist(),
+                                                   self._data_line.get_column("close_price", depth).tolist()):
+            volume_statistics.append({"volume": volume, "open_price": open_price, "close_price": close_price})
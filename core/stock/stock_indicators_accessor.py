@@ -0,0 +1,118 @@
+import threading
+from typing import Dict, List, Optional
+
+import pandas as pd
+import stockstats
+
+from core.stock.candle_ring_buffer import CandleRingBuffer
+from core.stock.indicators.indicator_engine import IndicatorEngine
+
+_STOCKSTATS_BASE_COLUMNS: Dict[str, str] = {
+    "open": "open_price",
+    "high": "high_price",
+    "low": "low_price",
+    "close": "close_price",
+    "volume": "volume"
+}
+
+
+class StockIndicatorsAccessor(object):
+    """
+    Lazy access to the technical indicators of a data line, using stockstats column names. Only the columns that are
+    read are computed. Computed columns are cached until the data line changes
+    """
+
+    def __init__(self, data_line: CandleRingBuffer, indicator_engine: IndicatorEngine, lock: threading.RLock):
+        """
+        Stock indicators accessor constructor
+
+        :param data_line: The data line the indicators are computed on
+        :param indicator_engine: The engine used to compute the supported indicators incrementally
+        :param lock: The lock guarding the data line
+        """
+        self._data_line: CandleRingBuffer = data_line
+        self._indicator_engine: IndicatorEngine = indicator_engine
+        self._lock: threading.RLock = lock
+        self._cache: Dict[str, pd.Series] = {}
+        self._cache_version: int = -1  # Data line version the cache has been built with
+        self._stock_data_frame: Optional[stockstats.StockDataFrame] = None  # Used for unsupported engine columns
+
+    def __getitem__(self, column: str) -> pd.Series:
+        """
+        Get an indicator column. Columns supported by the indicator engine are then kept up to date incrementally,
+        other ones are computed by stockstats
+
+        :param column: The column name (stockstats naming)
+        :return: The indicator values indexed by candle time
+        """
+        with self._lock:
+            self._check_cache_version()
+
+            if column not in self._cache:
+                if column in _STOCKSTATS_BASE_COLUMNS:
+                    self._cache[column] = self._build_series(column, _STOCKSTATS_BASE_COLUMNS[column])
+                elif IndicatorEngine.is_supported(column):
+                    self._indicator_engine.add_column(column)
+                    self._cache[column] = self._build_series(column, column)
+                else:
+                    self._cache[column] = self._get_stock_data_frame()[column].copy()
+
+            return self._cache[column]
+
+    @property
+    def cached_columns(self) -> List[str]:
+        """
+        :return: Columns computed since the last data line change
+        """
+        with self._lock:
+            self._check_cache_version()
+            return list(self._cache.keys())
+
+    def to_stock_data_frame(self) -> stockstats.StockDataFrame:
+        """
+        Build a full stockstats data frame. Columns already computed are included, any other stockstats column is
+        computed by stockstats when read
+
+        :return: A stockstats data frame, copy of the data line
+        """
+        with self._lock:
+            self._check_cache_version()
+            return self._get_stock_data_frame().copy()
+
+    def _check_cache_version(self) -> None:
+        """Drop the cached columns if the data line changed since they have been computed"""
+        if self._cache_version != self._data_line.version:
+            self._cache = {}
+            self._stock_data_frame = None
+            self._cache_version = self._data_line.version
+
+    def _build_series(self, column: str, data_line_column: str) -> pd.Series:
+        """
+        Build a pandas series from a data line column
+
+        :param column: The series name
+        :param data_line_column: The data line column
+        :return: The series (copy of the data line values) indexed by candle time
+        """
+        return pd.Series(self._data_line.get_column(data_line_column).copy(), name=column,
+                         index=pd.Index(self._data_line.times.copy(), name="date"))
+
+    def _get_stock_data_frame(self) -> stockstats.StockDataFrame:
+        """
+        Get the stockstats data frame of the current data line version, built with the columns already computed by
+        the indicator engine so that stockstats does not compute them again
+
+        :return: The stockstats data frame
+        """
+        if self._stock_data_frame is None:
+            columns = {"date": self._data_line.times.copy()}
+
+            for column, data_line_column in _STOCKSTATS_BASE_COLUMNS.items():
+                columns[column] = self._data_line.get_column(data_line_column).copy()
+
+            for column in self._indicator_engine.columns:
+                columns[column] = self._data_line.get_column(column).copy()
+
+            self._stock_data_frame = stockstats.StockDataFrame.retype(pd.DataFrame(columns))
+
+        return self._stock_data_frame
@@ -2,24 +2,42 @@ import logging
 import math
 import threading
 import time
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple, Union
 
 from core.ftx.rest.ftx_rest_api import FtxRestApi
+from core.ftx.ws.ftx_websocket_client import FtxWebsocketClient
+from core.ftx.ws.sharded_ftx_websocket_client import ShardedFtxWebsocketClient
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.acquisition_scheduler import AcquisitionScheduler
+from core.stock.candle_cache import CandleCache
+from core.stock.candle_resampler import CandleResampler
 from core.stock.stock_data_manager import MAX_ITEM_IN_DATA_SET
 from core.stock.stock_data_manager import StockDataManager
+from core.stock.trade_candle_aggregator import TradeCandleAggregator
 from exceptions.ftx_rest_api_exception import FtxRestApiException
-from tools.utils import format_ohlcv_raw_data
+from tools.utils import format_ohlcv_raw_data_list
 
 SUPPORTED_TIME_FRAME_LENGTH = [15, 60, 300, 900, 3600, 14400, 86400]
+MIN_RETRY_DELAY = 5
 MAX_RETRY_DELAY = 120
+EMPTY_ACQUISITION_RETRY_DELAY = 15
+MIN_MISSING_CANDLE_RETRY_DELAY = 0.5
+MAX_MISSING_CANDLE_RETRY_DELAY = 8
+LATENCY_HISTORY_SIZE = 100
 
 
 class TimeFrameManager(object):
     """Time frame manager"""
 
     log_received_stock_data = True
+    align_on_candle_close = True  # Request data right after each candle close instead of polling at fixed intervals
+    candle_close_grace_period = 1.0  # Time (in sec) left to FTX to make a new candle available after its start
+    candle_cache: Optional[CandleCache] = None  # If set, candles are saved on disk and reloaded on start
 
     def __init__(self, time_frame_length: int, market: str, ftx_rest_api: FtxRestApi,
-                 auto_compute_indicators: bool = True):
+                 auto_compute_indicators: bool = True,
+                 ftx_websocket_client: Optional[Union[FtxWebsocketClient, ShardedFtxWebsocketClient]] = None):
         """
         Time frame manager constructor
 
@@ -27,96 +45,323 @@ class TimeFrameManager(object):
         :param market: Name of the market (ex: BTC-PERP)
         :param ftx_rest_api: Instance of FtxRestApi
         :param auto_compute_indicators: automatically compute indicators or not
+        :param ftx_websocket_client: If set, candles are built live from the market trades received with this client.
+        FTX REST api is then only used to retrieve history and missing candles after a reconnection
         """
         self.stock_data_manager: StockDataManager = StockDataManager(auto_compute_indicators=auto_compute_indicators)
         self.market: str = market
         self._time_frame_length: int = time_frame_length
-        self._t_run: bool = True
-        self._t: threading.Thread = threading.Thread(target=self._worker)
         self._last_retrieved_data_timestamp: int = math.floor(time.time() - time_frame_length * MAX_ITEM_IN_DATA_SET)
         self._last_acq_size: int = 0
+        self._retry_delay: int = 0  # Delay before retrying a failed acquisition (0 if the last one succeeded)
+        self._missing_candle_retry_delay: float = 0  # Delay before retrying when the expected candle is missing
+        self._expected_candle_timestamp: Optional[int] = None  # Start time of the candle expected after a close
+        # Times (in sec) between candle closes and the availability of the next candles
+        self.candle_availability_latencies: Deque[float] = deque(maxlen=LATENCY_HISTORY_SIZE)
         self._ftx_rest_api: FtxRestApi = ftx_rest_api
+        self._running: bool = False
+        # Higher time frames built from this time frame candles: { [time frame length]: (resampler, time frame) }
+        self._derived_time_frames: Dict[int, Tuple[CandleResampler, 'TimeFrameManager']] = {}
+        self._derived_time_frames_lock: threading.Lock = threading.Lock()
+        self._ftx_websocket_client: Optional[Union[FtxWebsocketClient, ShardedFtxWebsocketClient]] = \
+            ftx_websocket_client
+        self._trade_candle_aggregator: Optional[TradeCandleAggregator] = \
+            TradeCandleAggregator(time_frame_length) if ftx_websocket_client is not None else None
+        self._last_cached_identifier: Optional[int] = None  # Last candle identifier saved in the candle cache
 
         logging.info(
             f"Market: {self.market}, time frame: {self._time_frame_length} sec. New time frame manager created!")
 
+        if TimeFrameManager.candle_cache is not None:
+            self._load_from_cache()
+
+    @property
+    def time_frame_length(self) -> int:
+        return self._time_frame_length
+
+    @property
+    def mean_candle_availability_latency(self) -> Optional[float]:
+        """
+        :return: Mean time (in sec) between the last candle closes and the availability of the next candles
+        """
+        latencies = list(self.candle_availability_latencies)
+        return sum(latencies) / len(latencies) if len(latencies) > 0 else None
+
     def feed(self) -> None:
         """Feed the stock data managers with new values"""
 
         response = self._feed()
+        if response is None:
+            return
+
+        reception_time = time.time()
         self._last_acq_size = len(response)
 
         logging.debug(
             f"Market: {self.market}, time frame: {self._time_frame_length} sec. "
             f"Last acquisition size: {self._last_acq_size}")
 
-        if self._last_acq_size > 0:
-            self.stock_data_manager.update_data([format_ohlcv_raw_data(r, self._time_frame_length) for r in response])
-            self._last_retrieved_data_timestamp = max([math.floor(r["time"] / 1000) for r in response])
+        records = format_ohlcv_raw_data_list(response, self._time_frame_length)
+        if len(records) > 0:
+            stock_data = CandleCache.to_stock_data(records)
+            self.stock_data_manager.update_data(stock_data)
+            self._last_retrieved_data_timestamp = int(records["time"].max())
 
             if TimeFrameManager.log_received_stock_data:
                 logging.info(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Last received point")
                 logging.info(response[-1])
 
+            self._feed_derived_time_frames(stock_data)
+            self._save_to_cache()
+
+        self._check_expected_candle(reception_time)
+
+    def _load_from_cache(self) -> None:
+        """Load the cached candles so that only the missing ones are retrieved from FTX"""
+        records = TimeFrameManager.candle_cache.load(self.market, self._time_frame_length)
+
+        # Ignore candles too old to be kept in the data set
+        records = records[records["time"] > self._last_retrieved_data_timestamp]
+        if len(records) == 0:
+            return
+
+        self.stock_data_manager.update_data(CandleCache.to_stock_data(records))
+        self._last_retrieved_data_timestamp = int(records["time"][-1])
+        self._last_cached_identifier = int(records["identifier"][-1])
+
+        logging.info(f"Market: {self.market}, time frame: {self._time_frame_length} sec. {len(records)} candles "
+                     f"loaded from the candle cache")
+
+    def _save_to_cache(self, force: bool = False) -> None:
+        """
+        Save the candles in the candle cache, once per new candle
+
+        :param force: Save even if there is no new candle since the last save
+        """
+        if TimeFrameManager.candle_cache is None:
+            return
+
+        records = self.stock_data_manager.to_records()
+        if len(records) == 0 or (not force and int(records["identifier"][-1]) == self._last_cached_identifier):
+            return
+
+        try:
+            TimeFrameManager.candle_cache.save(self.market, self._time_frame_length, records)
+            self._last_cached_identifier = int(records["identifier"][-1])
+        except OSError as e:
+            logging.error(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Candle cache save "
+                          f"failed. Details: {str(e)}")
+
+    def _check_expected_candle(self, reception_time: float) -> None:
+        """
+        Check if the candle expected after the last candle close has been received. Record its availability latency
+        if so, increase the missing candle retry delay otherwise
+
+        :param reception_time: Time the last acquisition has been received
+        """
+        expected_candle_timestamp = self._expected_candle_timestamp
+
+        if expected_candle_timestamp is not None and self._last_retrieved_data_timestamp < expected_candle_timestamp:
+            if reception_time >= expected_candle_timestamp + TimeFrameManager.candle_close_grace_period:
+                self._missing_candle_retry_delay = MIN_MISSING_CANDLE_RETRY_DELAY \
+                    if self._missing_candle_retry_delay == 0 \
+                    else min(self._missing_candle_retry_delay * 2, MAX_MISSING_CANDLE_RETRY_DELAY)
+                logging.debug(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Candle not "
+                              f"available yet, trying again in {self._missing_candle_retry_delay} sec")
+            return
+
+        if expected_candle_timestamp is not None and self._last_retrieved_data_timestamp == expected_candle_timestamp:
+            latency = reception_time - expected_candle_timestamp
+            self.candle_availability_latencies.append(latency)
+            logging.debug(f"Market: {self.market}, time frame: {self._time_frame_length} sec. "
+                          f"Candle available {latency:.3f} sec after the previous candle close")
+
+        self._missing_candle_retry_delay = 0
+        self._expected_candle_timestamp = self._last_retrieved_data_timestamp + self._time_frame_length
+
     def _feed(self) -> [dict]:
         """
-        Feed the stock data managers with new values
+        Retrieve new stock data values. A failed acquisition is retried by the acquisition scheduler after a delay
+        doubled on each consecutive failure
 
-        :return: A list containing the raw stock data
+        :return: A list containing the raw stock data, None if the acquisition failed
         """
-        retry_delay = 5
+        try:
+            logging.debug(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Retrieving OHLC data")
 
-        while True:
-            try:
-                logging.debug(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Retrieving OHLC data")
+            response = self._ftx_rest_api.get(f"markets/{self.market}/candles", {
+                "resolution": self._time_frame_length,
+                "limit": MAX_ITEM_IN_DATA_SET,
+                # Last retrieved candle is requested again to get its final values
+                "start_time": self._last_retrieved_data_timestamp
+            })
+            self._retry_delay = 0
+            return response
 
-                return self._ftx_rest_api.get(f"markets/{self.market}/candles", {
-                    "resolution": self._time_frame_length,
-                    "limit": MAX_ITEM_IN_DATA_SET,
-                    "start_time": self._last_retrieved_data_timestamp + 1
-                })
+        except FtxRestApiException as ftx_rest_api_ex:
+            self._increase_retry_delay()
+            logging.error(f"FTX API: Http request failed, trying again in {self._retry_delay} sec. "
+                          f"Details: {str(ftx_rest_api_ex)}")
+        except KeyError as key_err:
+            self._increase_retry_delay()
+            logging.error(f"FTX API: Data format error, trying again in {self._retry_delay} sec. "
+                          f"Details: {str(key_err)}")
+        except Exception as e:
+            self._increase_retry_delay()
+            logging.error(f"FTX API: Unknown error, trying again in {self._retry_delay} sec. Details: {str(e)}")
 
-            except FtxRestApiException as ftx_rest_api_ex:
-                logging.error(
-                    f"FTX API: Http request failed, trying again in {retry_delay} sec. Details: {str(ftx_rest_api_ex)}")
-                time.sleep(retry_delay)
-            except KeyError as key_err:
-                logging.error(f"FTX API: Data format error, trying again in {retry_delay} sec. Details: {str(key_err)}")
-                time.sleep(retry_delay)
-            except Exception as e:
-                logging.error(f"FTX API: Unknown error, trying again in {retry_delay} sec. Details: {str(e)}")
-                time.sleep(retry_delay)
-            finally:
-                retry_delay = retry_delay * 2 if retry_delay * 2 < MAX_RETRY_DELAY else MAX_RETRY_DELAY
+        return None
 
-    def start(self) -> None:
-        """Starts the time frame manager (worker)"""
+    def _increase_retry_delay(self) -> None:
+        """Double the retry delay (starting at MIN_RETRY_DELAY and up to MAX_RETRY_DELAY)"""
+        self._retry_delay = MIN_RETRY_DELAY if self._retry_delay == 0 \
+            else min(self._retry_delay * 2, MAX_RETRY_DELAY)
 
-        self._t.start()
+    def get_next_acquisition_time(self) -> float:
+        """
+        Compute when the next acquisition should be done: right after the last candle close (plus a grace period), as
+        soon as possible while the data set is not complete, or later if the last acquisition failed or if the
+        expected candle is missing
 
-    def stop(self) -> None:
-        """Stops the time frame manager (worker)"""
+        :return: The next acquisition timestamp
+        """
+        now = time.time()
+
+        if self._retry_delay > 0:
+            return now + self._retry_delay
+
+        if self._last_acq_size == MAX_ITEM_IN_DATA_SET:
+            return now  # More data to retrieve
 
-        self._t_run = False
+        if not TimeFrameManager.align_on_candle_close:
+            return now + (EMPTY_ACQUISITION_RETRY_DELAY if self._last_acq_size == 0 else self._time_frame_length)
 
-    def _worker(self) -> None:
-        """Threaded function that retrieve the OHLC data"""
+        if self._missing_candle_retry_delay > 0:
+            return now + self._missing_candle_retry_delay
 
-        while self._t_run:
-            self.feed()
+        # The last retrieved candle closes (and the next one starts) one time frame after its start time
+        return max(now, self._expected_candle_timestamp + TimeFrameManager.candle_close_grace_period) \
+            if self._expected_candle_timestamp is not None else now + EMPTY_ACQUISITION_RETRY_DELAY
+
+    def add_derived_time_frame(self, time_frame_manager: 'TimeFrameManager') -> None:
+        """
+        Build the candles of a higher time frame from this time frame candles. The higher time frame keeps retrieving
+        its data from FTX until a full candle has been built locally
+
+        :param time_frame_manager: The higher time frame (its length must be a multiple of this time frame length)
+        """
+        with self._derived_time_frames_lock:
+            self._derived_time_frames[time_frame_manager.time_frame_length] = \
+                (CandleResampler(time_frame_manager.time_frame_length, self._time_frame_length), time_frame_manager)
+
+    def remove_derived_time_frame(self, time_frame_manager: 'TimeFrameManager') -> None:
+        """
+        Stop building the candles of a higher time frame. If it is running, it retrieves its data from FTX again
+
+        :param time_frame_manager: The higher time frame
+        """
+        with self._derived_time_frames_lock:
+            self._derived_time_frames.pop(time_frame_manager.time_frame_length, None)
+
+        if time_frame_manager.is_running() \
+                and not AcquisitionScheduler.get_instance().is_subscribed(time_frame_manager):
+            AcquisitionScheduler.get_instance().subscribe(time_frame_manager)
+
+    def get_derived_time_frames(self) -> List['TimeFrameManager']:
+        """
+        :return: The higher time frames built from this time frame candles
+        """
+        with self._derived_time_frames_lock:
+            return [time_frame_manager for _, time_frame_manager in self._derived_time_frames.values()]
+
+    def _feed_derived_time_frames(self, stock_data: List[RawStockDataDict]) -> None:
+        """
+        Build the higher time frames candles from new or updated candles
+
+        :param stock_data: The new or updated candles
+        """
+        with self._derived_time_frames_lock:
+            derived_time_frames = list(self._derived_time_frames.values())
+
+        for resampler, time_frame_manager in derived_time_frames:
+            time_frame_manager.feed_built_data(resampler.resample(stock_data), resampler.closed_candle_number > 0)
+
+    def feed_built_data(self, stock_data: List[RawStockDataDict], complete: bool) -> None:
+        """
+        Feed the stock data manager with candles built locally (from a lower time frame or from trades)
+
+        :param stock_data: The built candles
+        :param complete: True once a full candle has been built. FTX data acquisition is then stopped for this time
+        frame (once its history has been retrieved)
+        """
+        if not self._running:
+            return
+
+        if len(stock_data) > 0:
+            self.stock_data_manager.update_data(stock_data)
+            self._save_to_cache()
+
+        history_retrieved = self._expected_candle_timestamp is not None and self._last_acq_size < MAX_ITEM_IN_DATA_SET
+        if complete and history_retrieved and AcquisitionScheduler.get_instance().is_subscribed(self):
+            AcquisitionScheduler.get_instance().unsubscribe(self)
+            logging.info(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Candles are now built "
+                         f"locally")
+
+    def is_trade_streamed(self) -> bool:
+        """
+        :return: True if the candles are built from the market trades, False otherwise
+        """
+        return self._trade_candle_aggregator is not None
+
+    def _on_trades(self, trades: List[dict]) -> None:
+        """
+        Build candles from trades received by the websocket client
+
+        :param trades: The received trades
+        """
+        stock_data = self._trade_candle_aggregator.add_trades(trades)
+        self.feed_built_data(stock_data, self._trade_candle_aggregator.closed_candle_number > 0)
+
+        if self._running and len(stock_data) > 0:
+            self._feed_derived_time_frames(stock_data)
+
+    def _on_trade_stream_reconnect(self) -> None:
+        """Retrieve missing candles from FTX REST api until a full candle has been built from trades again"""
+        self._trade_candle_aggregator.reset()
+
+        if self._running and not AcquisitionScheduler.get_instance().is_subscribed(self):
+            logging.info(f"Market: {self.market}, time frame: {self._time_frame_length} sec. Trade stream "
+                         f"reconnected, retrieving missing candles")
+            AcquisitionScheduler.get_instance().subscribe(self)
+
+    def is_running(self) -> bool:
+        """
+        :return: True if the time frame manager is started, False otherwise
+        """
+        return self._running
+
+    def start(self) -> None:
+        """Starts the time frame manager (data acquisition is done by the shared acquisition scheduler)"""
+
+        self._running = True
+        AcquisitionScheduler.get_instance().subscribe(self)
+
+        if self._ftx_websocket_client is not None:
+            self._trade_candle_aggregator.reset()
+            self._ftx_websocket_client.add_reconnect_listener(self._on_trade_stream_reconnect, self.market)
+            self._ftx_websocket_client.add_trades_listener(self.market, self._on_trades)
+
+    def stop(self) -> None:
+        """Stops the time frame manager"""
 
-            time_to_sleep = 15 if self._last_acq_size == 0 or self._last_acq_size == MAX_ITEM_IN_DATA_SET \
-                else self._time_frame_length
+        self._running = False
+        AcquisitionScheduler.get_instance().unsubscribe(self)
+        self._save_to_cache(True)
 
-            logging.debug(
-                f"Market: {self.market}, time frame: {self._time_frame_length} sec. Next data acquisition in "
-                f"{time_to_sleep} sec")
-            for i in range(time_to_sleep):
-                if self._t_run:
-                    time.sleep(1)
-                else:
-                    break
+        if self._ftx_websocket_client is not None:
+            self._ftx_websocket_client.remove_trades_listener(self.market, self._on_trades)
+            self._ftx_websocket_client.remove_reconnect_listener(self._on_trade_stream_reconnect, self.market)
         logging.debug(
             f"Market: {self.market}, time frame: {self._time_frame_length} sec. "
-            f"Ending time frame manager thread for data acquisition."
+            f"Time frame manager data acquisition stopped."
         )
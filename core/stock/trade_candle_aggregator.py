@@ -0,0 +1,105 @@
+import datetime
+from typing import Dict, List, Optional
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+
+
+class TradeCandleAggregator(object):
+    """
+    Build live candles of a time frame from FTX websocket trades. Only the candles whose trades have all been received
+    (the ones starting after the first received trade) are built
+    """
+
+    def __init__(self, time_frame_length: int):
+        """
+        Trade candle aggregator constructor
+
+        :param time_frame_length: The length of the built candles in seconds
+        """
+        self.time_frame_length: int = time_frame_length
+        self._first_candle_time: Optional[int] = None  # Time of the candle of the first received trade (partial)
+        self._candle: Optional[RawStockDataDict] = None  # Candle being built
+        self.closed_candle_number: int = 0  # Number of fully covered candles built and closed
+
+    def reset(self) -> None:
+        """Forget the candle being built (to be called when some trades may have been missed, ie: on reconnection)"""
+        self._first_candle_time = None
+        self._candle = None
+        self.closed_candle_number = 0
+
+    def add_trades(self, trades: List[dict]) -> List[RawStockDataDict]:
+        """
+        Update the candles with new trades
+
+        :param trades: FTX websocket trades (with price, size and time fields), sorted by time asc
+        :return: The candles that have been created or updated, sorted by time asc. The last one is partial (open)
+        """
+        updated_candles: Dict[int, RawStockDataDict] = {}
+
+        for trade in trades:
+            price = float(trade["price"])
+            timestamp = TradeCandleAggregator.parse_trade_time(trade["time"])
+            candle_time = int(timestamp - timestamp % self.time_frame_length)
+
+            if self._candle is None:
+                self._first_candle_time = candle_time
+                self._candle = self._new_candle(candle_time, price)
+            elif candle_time > self._candle["time"]:
+                if self._is_covered(self._candle):
+                    self.closed_candle_number += 1
+
+                # Candles without any trade keep the previous close price
+                for empty_candle_time in range(self._candle["time"] + self.time_frame_length, candle_time,
+                                               self.time_frame_length):
+                    empty_candle = self._new_candle(empty_candle_time, self._candle["close_price"])
+                    updated_candles[empty_candle_time] = empty_candle
+                    self.closed_candle_number += 1
+
+                self._candle = self._new_candle(candle_time, price)
+            elif candle_time < self._candle["time"]:
+                continue  # Candle already closed
+
+            self._candle["high_price"] = max(self._candle["high_price"], price)
+            self._candle["low_price"] = min(self._candle["low_price"], price)
+            self._candle["close_price"] = price
+            self._candle["volume"] += price * float(trade["size"])  # FTX candle volumes are quote volumes
+
+            if self._is_covered(self._candle):
+                updated_candles[candle_time] = dict(self._candle)
+
+        return [updated_candles[candle_time] for candle_time in sorted(updated_candles)]
+
+    def _is_covered(self, candle: RawStockDataDict) -> bool:
+        """
+        :param candle: A built candle
+        :return: True if all the trades of the candle have been received
+        """
+        return candle["time"] > self._first_candle_time
+
+    def _new_candle(self, candle_time: int, price: float) -> RawStockDataDict:
+        """
+        Create a candle without any volume
+
+        :param candle_time: Start time of the candle
+        :param price: Open price of the candle
+        :return: The candle
+        """
+        return {
+            "id": candle_time // self.time_frame_length,
+            "time": candle_time,
+            "open_price": price,
+            "high_price": price,
+            "low_price": price,
+            "close_price": price,
+            "volume": 0.0
+        }
+
+    @staticmethod
+    def parse_trade_time(trade_time: str) -> float:
+        """
+        Parse an FTX trade time
+
+        :param trade_time: The trade time (ISO 8601 format, ie: 2021-05-26T16:30:15.123456+00:00)
+        :return: The trade timestamp
+        """
+        return datetime.datetime.fromisoformat(trade_time).timestamp()
@@ -1,9 +1,14 @@
 import logging
 
+from tools.system_clock import SystemClock
+
 
 class Strategy(object):
     """Base class for strategies"""
 
+    # Clock to use instead of the time module so that the strategy can be run on a virtual clock (backtest)
+    clock: SystemClock = SystemClock()
+
     def __init__(self):
         """Strategy constructor"""
 
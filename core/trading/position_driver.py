@@ -1,6 +1,5 @@
 import logging
 import threading
-import time
 from typing import Optional
 
 from core.enums.order_type_enum import OrderTypeEnum
@@ -9,6 +8,7 @@ from core.enums.side_enum import SideEnum
 from core.ftx.rest.ftx_rest_api import FtxRestApi
 from core.models.position_config_dict import PositionConfigDict
 from core.models.position_data_dict import PositionDataDict
+from tools.system_clock import SystemClock
 from tools.utils import get_trigger_order_type, format_position_raw_data
 
 _WORKER_SLEEP_TIME_BETWEEN_LOOPS = 10
@@ -18,12 +18,15 @@ class PositionDriver(object):
     """Position driver"""
 
     def __init__(self, ftx_rest_api: FtxRestApi,
-                 worker_sleep_time_between_loops: int = _WORKER_SLEEP_TIME_BETWEEN_LOOPS):
+                 worker_sleep_time_between_loops: int = _WORKER_SLEEP_TIME_BETWEEN_LOOPS,
+                 clock: Optional[SystemClock] = None):
         """
         Position driver constructor
 
         :param ftx_rest_api: Instance of FtxRestApi
         :param worker_sleep_time_between_loops: Time to wait before looking for market and orders again
+        :param clock: Clock used to wait and to measure the position open duration (the strategy clock). The system
+        clock if None
         """
         self.ftx_rest_api: FtxRestApi = ftx_rest_api
         self.market: str = ""
@@ -31,6 +34,7 @@ class PositionDriver(object):
         self.position_size: int = 0
         self.position_side: Optional[SideEnum] = None
         self._worker_sleep_time_between_loops = worker_sleep_time_between_loops
+        self._clock: SystemClock = clock if clock is not None else SystemClock()
         self._t_run: bool = True
         self._t: Optional[threading.Thread] = None
         logging.debug(f"New position driver created!")
@@ -69,8 +73,6 @@ class PositionDriver(object):
                     logging.error("An error occurred when opening position:")
                     logging.error(e)
 
-                time.sleep(0.25)
-
             # Apply trigger orders
             for trigger_order in position_config["trigger_orders"]:
 
@@ -93,8 +95,6 @@ class PositionDriver(object):
                     logging.error("An error occurred when opening position:")
                     logging.error(e)
 
-                time.sleep(0.25)
-
             self.position_state = PositionStateEnum.OPENED
             self._watch_market(position_config["max_open_duration"])
         else:
@@ -119,7 +119,7 @@ class PositionDriver(object):
                 logging.error("An error occurred when closing position:")
                 logging.error(e)
 
-            time.sleep(0.25)
+            self._clock.sleep(0.25)
 
             try:
                 logging.info(f"Canceling all orders")
@@ -138,8 +138,12 @@ class PositionDriver(object):
         :param max_open_duration: Close the order regardless of the market after a max open duration"""
 
         self._t_run = True
-        self._t = threading.Thread(target=self._worker, args=[max_open_duration])
-        self._t.start()
+        self._t = self._clock.start_thread(self._worker, [max_open_duration, self._clock.time()])
+
+    def wait_for_close(self) -> None:
+        """Wait for the market watching thread to end (the position is closed)"""
+        if self._t is not None:
+            self._t.join()
 
     def _reset_driver(self):
         """Reset the worker"""
@@ -147,24 +151,26 @@ class PositionDriver(object):
         self._t_run = False
         self.position_state = PositionStateEnum.NOT_OPENED
 
-    def _worker(self, max_open_duration: int) -> None:
+    def _worker(self, max_open_duration: int, opened_at: float) -> None:
         """
         Threaded function that drive the opened position
 
         :param max_open_duration: Close the order regardless of the market after a max open duration
+        :param opened_at: Time the position has been opened (clock time)
         """
 
-        opened_duration = 0
         position: Optional[PositionDataDict] = None
 
         while self._t_run:
             for i in range(self._worker_sleep_time_between_loops):
-                if self._t_run:
-                    time.sleep(1)
-                    opened_duration += 1
+                if self._t_run and not self._clock.is_stopped():
+                    self._clock.sleep(1)
                 else:
                     break
 
+            # Computed from the clock: a virtual clock may jump more than one second during a sleep
+            opened_duration = self._clock.time() - opened_at
+
             try:
                 logging.info("Retrieving trigger orders")
                 response = self.ftx_rest_api.get("conditional_orders", {"market": self.market})
@@ -196,6 +202,10 @@ class PositionDriver(object):
             if position is not None and position["open_size"] == 0:
                 logging.info("Position open size is 0")
 
-            if opened_duration >= max_open_duration or (position is not None and position["open_size"] == 0):
+            if self._clock.is_stopped():
+                logging.info("Clock stopped (end of backtest) !")
+
+            if opened_duration >= max_open_duration or (position is not None and position["open_size"] == 0) \
+                    or self._clock.is_stopped():
                 self.close_position_and_cancel_orders()
                 break
@@ -11,6 +11,7 @@ from core.enums.position_state_enum import PositionStateEnum
 from core.enums.side_enum import SideEnum
 from core.enums.trigger_order_type_enum import TriggerOrderTypeEnum
 from core.ftx.rest.ftx_rest_api import FtxRestApi
+from core.ftx.rest.response_cache import ResponseCache
 from core.models.opening_config_dict import OpeningConfigDict
 from core.models.position_config_dict import PositionConfigDict
 from core.models.trigger_order_config_dict import TriggerOrderConfigDict
@@ -59,7 +60,8 @@ class CryptofeedStrategy(Strategy):
         logging.info("TestStrategy run strategy")
         super(CryptofeedStrategy, self).__init__()
 
-        self.ftx_rest_api: FtxRestApi = FtxRestApi()
+        # Market prices and wallet balances are read for every pair and exchange of an analysis
+        self.ftx_rest_api: FtxRestApi = FtxRestApi(response_cache=ResponseCache())
 
         # Array liquidation data
         self.liquidations: List[Liquidation] = []
@@ -8,7 +8,7 @@ import stockstats
 from core.ftx.rest.ftx_rest_api import FtxRestApi
 from core.models.candle import Candle
 from core.models.market_data_dict import MarketDataDict
-from tools.utils import format_wallet_raw_data, format_market_raw_data, format_ohlcv_raw_data
+from tools.utils import format_wallet_raw_data, format_market_raw_data, format_ohlcv_raw_data_list
 
 
 class StockUtils(object):
@@ -43,9 +43,7 @@ class StockUtils(object):
             "start_time": math.floor(time.time() - 60 * x)
         })
 
-        candles = [format_ohlcv_raw_data(candle, 60) for candle in candles]
-        candles = [Candle(candle["id"], candle["time"], candle["open_price"], candle["high_price"], candle["low_price"],
-                          candle["close_price"], candle["volume"]) for candle in candles]
+        candles = [Candle(*candle) for candle in format_ohlcv_raw_data_list(candles, 60).tolist()]
 
         return [{
             "date": candle.time,
@@ -1,12 +1,11 @@
 import logging
 import time
 
-import stockstats
-
 from core.ftx.rest.ftx_rest_api import FtxRestApi
 from core.models.candle import Candle
 from core.stock.crypto_pair_manager import CryptoPairManager
 from core.stock.stock_data_manager import StockDataManager
+from core.stock.stock_indicators_accessor import StockIndicatorsAccessor
 from core.strategy.strategy import Strategy
 from tools.utils import format_wallet_raw_data
 
@@ -52,10 +51,10 @@ class DemoStrategy(Strategy):
             last_3_candle_volumes = sum([d.volume for d in stock_data_manager.stock_data_list[-3:]])
             logging.info(f"Last 3 candles average volume: {last_3_candle_volumes / 3}")
 
-        # Use stockstats to display RSI_14 indicator values
-        indicators_dataframe: stockstats.StockDataFrame = stock_data_manager.stock_indicators
-        if indicators_dataframe is not None:
-            logging.info(indicators_dataframe['rsi'])
+        # Display RSI_14 indicator values
+        stock_indicators: StockIndicatorsAccessor = stock_data_manager.stock_indicators
+        if stock_indicators is not None:
+            logging.info(stock_indicators['rsi'])
 
         # -------------
         # FTX API Calls
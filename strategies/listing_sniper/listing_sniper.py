@@ -1,6 +1,7 @@
 import logging
 import time
 
+from core.enums.request_priority_enum import RequestPriorityEnum
 from core.strategy.strategy import Strategy
 from core.ftx.rest.ftx_rest_api import FtxRestApi
 
@@ -51,7 +52,7 @@ class ListingSniper(Strategy):
             return
 
         try:
-            m_response = self.ftx_rest_api.get("markets/" + MARKET_PAIR_TO_SNIPE)
+            m_response = self.ftx_rest_api.get("markets/" + MARKET_PAIR_TO_SNIPE, priority=RequestPriorityEnum.ORDER)
             logging.info(f"FTX API response: {str(m_response)}")
 
             market_enabled = m_response["enabled"]
@@ -150,8 +151,6 @@ class ListingSniper(Strategy):
                     logging.error("An error occurred when opening position:")
                     logging.error(e)
 
-                time.sleep(0.25)
-
         except Exception as e:
             logging.error(e)
 
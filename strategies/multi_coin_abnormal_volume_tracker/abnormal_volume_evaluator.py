@@ -0,0 +1,145 @@
+from typing import Dict, List
+
+import numpy as np
+
+from core.stock.stock_data_manager import StockDataManager
+from strategies.multi_coin_abnormal_volume_tracker.enums.volume_check_failure_enum import VolumeCheckFailureEnum
+from strategies.multi_coin_abnormal_volume_tracker.models.volume_evaluation_dict import VolumeEvaluationDict
+
+# Checks evaluated by the evaluator, in check order
+_CHECKS = [
+    VolumeCheckFailureEnum.NOT_ENOUGH_DATA,
+    VolumeCheckFailureEnum.TOO_MANY_ZERO_VOLUME_CANDLES,
+    VolumeCheckFailureEnum.VOLUME_FACTOR,
+    VolumeCheckFailureEnum.INDIVIDUAL_CANDLE_VOLUME_FACTOR,
+    VolumeCheckFailureEnum.MINIMUM_VOLUME,
+    VolumeCheckFailureEnum.GREEN_CANDLE_DOMINANCE,
+    VolumeCheckFailureEnum.MINIMUM_PRICE_VARIATION
+]
+
+
+class AbnormalVolumeEvaluator(object):
+    """
+    Vectorized abnormal volume checks. The window statistics and last candles of every pair are stacked in arrays (one
+    row per pair) so that the market volume indicator and all the per pair checks are computed at once
+    """
+
+    def __init__(self, long_ma_volume_depth: int, short_ma_volume_depth: int, volume_check_factor_size: float,
+                 green_candle_dominance_min_ratio: float, minimum_average_volume: float,
+                 minimum_price_variation: float):
+        """
+        Abnormal volume evaluator constructor
+
+        :param long_ma_volume_depth: The number of candles used as volume comparison base
+        :param short_ma_volume_depth: The number of last candles whose volume is compared to the base
+        :param volume_check_factor_size: Factor by which the short ma volume must be higher than the long ma volume
+        :param green_candle_dominance_min_ratio: Minimum ratio of green candles among the short ma candles
+        :param minimum_average_volume: Minimum volume of each short ma candle
+        :param minimum_price_variation: Minimum price variation (in percent) during the short ma candles
+        """
+        self.long_ma_volume_depth: int = long_ma_volume_depth
+        self.short_ma_volume_depth: int = short_ma_volume_depth
+        self.volume_check_factor_size: float = volume_check_factor_size
+        self.green_candle_dominance_min_ratio: float = green_candle_dominance_min_ratio
+        self.minimum_average_volume: float = minimum_average_volume
+        self.minimum_price_variation: float = minimum_price_variation
+
+    def evaluate(self, stock_data_managers: Dict[str, StockDataManager]) -> VolumeEvaluationDict:
+        """
+        Evaluate the last candles of every pair. Window sums and counts are read from the rolling volume statistics of
+        the stock data managers, so the evaluation cost does not depend on the window sizes
+
+        :param stock_data_managers: The stock data managers of the pairs { [pair]: stock data manager }
+        :return: The evaluation
+        """
+        long_depth, short_depth = self.long_ma_volume_depth, self.short_ma_volume_depth
+        pair_number = len(stock_data_managers)
+        has_data = np.zeros(pair_number, dtype=bool)
+        long_sum_volumes = np.full(pair_number, np.nan)
+        zero_volume_candle_numbers = np.zeros(pair_number, dtype=np.int64)
+        green_candle_numbers = np.zeros(pair_number, dtype=np.int64)
+        short_volumes = np.full((pair_number, short_depth), np.nan)
+        previous_open_prices = np.full(pair_number, np.nan)
+        last_close_prices = np.full(pair_number, np.nan)
+
+        for row, stock_data_manager in enumerate(stock_data_managers.values()):
+            long_volume_statistics = stock_data_manager.get_volume_statistics(long_depth, short_depth)
+            short_volume_statistics = stock_data_manager.get_volume_statistics(short_depth)
+
+            if not long_volume_statistics.is_full:
+                continue  # Not enough data
+
+            has_data[row] = True
+            long_sum_volumes[row] = long_volume_statistics.volume_sum
+            zero_volume_candle_numbers[row] = long_volume_statistics.zero_volume_candle_number
+            green_candle_numbers[row] = short_volume_statistics.green_candle_number
+            short_volumes[row] = stock_data_manager.get_data_view("volume", short_depth)
+            previous_open_prices[row] = stock_data_manager.get_data_view("open_price", short_depth + 1)[0]
+            last_close_prices[row] = stock_data_manager.get_data_view("close_price", 1)[0]
+
+        return self._evaluate(list(stock_data_managers), has_data, long_sum_volumes, zero_volume_candle_numbers,
+                              short_volumes, green_candle_numbers, previous_open_prices, last_close_prices)
+
+    def _evaluate(self, pairs: List[str], has_data: np.ndarray, long_sum_volumes: np.ndarray,
+                  zero_volume_candle_numbers: np.ndarray, short_volumes: np.ndarray,
+                  green_candle_numbers: np.ndarray, previous_open_prices: np.ndarray,
+                  last_close_prices: np.ndarray) -> VolumeEvaluationDict:
+        """
+        Run every check at once
+
+        :param pairs: The pairs
+        :param has_data: Tells which pairs have enough candles
+        :param long_sum_volumes: Volume sum of the long ma candles of each pair
+        :param zero_volume_candle_numbers: Number of zero volume candles among the long ma candles of each pair
+        :param short_volumes: Volumes of the short ma candles, one row per pair
+        :param green_candle_numbers: Number of green candles among the short ma candles of each pair
+        :param previous_open_prices: Open price of the candle preceding the short ma candles of each pair
+        :param last_close_prices: Close price of the last candle of each pair
+        :return: The evaluation
+        """
+        long_depth, short_depth = self.long_ma_volume_depth, self.short_ma_volume_depth
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            short_avg_volumes = short_volumes.sum(axis=1) / short_depth
+
+            # Overall market volume indicator, volume factors capped between 0.5 and 4
+            long_avg_volumes = long_sum_volumes / long_depth
+            counted = has_data & (long_avg_volumes > 0) & (short_avg_volumes > 0)
+            market_volume_factors = np.clip(short_avg_volumes[counted] / long_avg_volumes[counted], 0.5, 4)
+            market_volume_indicator = round(float(market_volume_factors.sum()) / len(market_volume_factors), 2) \
+                if len(market_volume_factors) > 0 else 1
+
+            applied_volume_factor = max(self.volume_check_factor_size,
+                                        self.volume_check_factor_size * market_volume_indicator)
+
+            # Zero volume candles are not considered in the long ma volume
+            long_avg_volumes = long_sum_volumes / (long_depth - zero_volume_candle_numbers)
+            volume_factors = short_avg_volumes / long_avg_volumes
+
+            # Individual candle checks, from the last candle to the first one
+            last_volumes = short_volumes[:, ::-1]
+            individual_factor_failures = last_volumes / long_avg_volumes[:, np.newaxis] < applied_volume_factor
+            individual_failures = individual_factor_failures | (last_volumes < self.minimum_average_volume)
+            first_individual_failures = individual_failures.argmax(axis=1)
+            is_individual_factor_failure = individual_factor_failures[np.arange(len(pairs)),
+                                                                      first_individual_failures]
+
+            minimum_close_prices = previous_open_prices * (1 + self.minimum_price_variation / 100)
+
+            failure_indexes = np.select([
+                ~has_data,
+                zero_volume_candle_numbers > long_depth / 3,
+                (short_avg_volumes == 0) | (volume_factors < applied_volume_factor),
+                individual_failures.any(axis=1) & is_individual_factor_failure,
+                individual_failures.any(axis=1),
+                green_candle_numbers / short_depth < self.green_candle_dominance_min_ratio,
+                last_close_prices < minimum_close_prices
+            ], np.arange(len(_CHECKS)), -1)
+
+        return {
+            "market_volume_indicator": market_volume_indicator,
+            "candidates": [pair for pair, index in zip(pairs, failure_indexes) if index == -1],
+            "failures": {pair: _CHECKS[index] for pair, index in zip(pairs, failure_indexes) if index != -1},
+            "volume_factors": {pair: float(volume_factor) for pair, volume_factor, is_valid
+                               in zip(pairs, volume_factors, has_data) if is_valid}
+        }
@@ -0,0 +1,38 @@
+from typing import Any, Dict
+
+from core.backtest.backtest_engine import BacktestEngine
+from core.backtest.simulated_exchange import SimulatedExchange
+from core.stock.candle_archive import CandleArchive
+from strategies.multi_coin_abnormal_volume_tracker import multi_coin_abnormal_volume_tracker
+from strategies.multi_coin_abnormal_volume_tracker.multi_coin_abnormal_volume_tracker import \
+    MultiCoinAbnormalVolumeTracker
+
+
+def run_backtest(candle_archive: CandleArchive, start_time: int, end_time: int,
+                 initial_balance: float = 1000) -> Dict[str, Any]:
+    """
+    Backtest the multi coin abnormal volume tracker strategy on a simulated exchange
+
+    :param candle_archive: Archive holding the one minute candles of the tracked pairs
+    :param start_time: Backtest start time
+    :param end_time: Backtest end time
+    :param initial_balance: Initial USD balance
+    :return: The trade statistics followed by the backtest report
+    """
+    backtest_engine = BacktestEngine(start_time, end_time, candle_archive)
+    simulated_exchange = SimulatedExchange(initial_balance, clock=backtest_engine.clock, time_frame_length=60)
+    backtest_engine.add_candle_listener(simulated_exchange.update_candles)
+
+    strategy = MultiCoinAbnormalVolumeTracker(ftx_rest_api=simulated_exchange, acquire_stock_data=False)
+    for pair in multi_coin_abnormal_volume_tracker.PAIRS_TO_TRACK:
+        backtest_engine.add_time_frame_manager(
+            strategy.pair_manager_list[pair]["crypto_pair_manager"].get_time_frame(60))
+
+    report = backtest_engine.run(strategy)
+
+    # Positions still opened are closed by their position driver once the backtest is over
+    for pair_manager in strategy.pair_manager_list.values():
+        if pair_manager["position_driver"] is not None:
+            pair_manager["position_driver"].wait_for_close()
+
+    return dict(simulated_exchange.get_statistics(), **report)
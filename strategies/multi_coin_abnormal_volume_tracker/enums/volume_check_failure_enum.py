@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class VolumeCheckFailureEnum(Enum):
+    """Reason why a pair did not pass the abnormal volume checks (in check order)"""
+
+    NOT_ENOUGH_DATA = "not_enough_data"
+    TOO_MANY_ZERO_VOLUME_CANDLES = "too_many_zero_volume_candles"
+    VOLUME_FACTOR = "volume_factor"
+    INDIVIDUAL_CANDLE_VOLUME_FACTOR = "individual_candle_volume_factor"
+    MINIMUM_VOLUME = "minimum_volume"
+    GREEN_CANDLE_DOMINANCE = "green_candle_dominance"
+    MINIMUM_PRICE_VARIATION = "minimum_price_variation"
@@ -0,0 +1,12 @@
+from typing import Dict, List, TypedDict
+
+from strategies.multi_coin_abnormal_volume_tracker.enums.volume_check_failure_enum import VolumeCheckFailureEnum
+
+
+class VolumeEvaluationDict(TypedDict):
+    """Abnormal volume evaluation of all the tracked pairs"""
+
+    market_volume_indicator: float
+    candidates: List[str]  # Pairs passing every check
+    failures: Dict[str, VolumeCheckFailureEnum]  # { [pair]: first failed check }
+    volume_factors: Dict[str, float]  # { [pair]: short ma volume / long ma volume (without zero volume candles) }
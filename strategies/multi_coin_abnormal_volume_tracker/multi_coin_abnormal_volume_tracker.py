@@ -1,8 +1,6 @@
 import logging
 import math
-import time
 
-from core.enums.color_enum import ColorEnum
 from core.enums.order_type_enum import OrderTypeEnum
 from core.enums.position_state_enum import PositionStateEnum
 from core.enums.side_enum import SideEnum
@@ -16,7 +14,10 @@ from core.stock.crypto_pair_manager import CryptoPairManager
 from core.stock.time_frame_manager import TimeFrameManager
 from core.strategy.strategy import Strategy
 from core.trading.position_driver import PositionDriver
+from strategies.multi_coin_abnormal_volume_tracker.abnormal_volume_evaluator import AbnormalVolumeEvaluator
+from strategies.multi_coin_abnormal_volume_tracker.enums.volume_check_failure_enum import VolumeCheckFailureEnum
 from strategies.multi_coin_abnormal_volume_tracker.models.pair_manager_dict import PairManagerDict
+from strategies.multi_coin_abnormal_volume_tracker.models.volume_evaluation_dict import VolumeEvaluationDict
 from tools.utils import format_wallet_raw_data, format_market_raw_data
 
 PAIRS_TO_TRACK = [
@@ -40,9 +41,6 @@ PAIRS_TO_TRACK = [
     "MOB-PERP", "BTT-PERP", "MEDIA-PERP", "IOST-PERP", "JASMY-PERP", "GAL-PERP", "GST-PERP"
 ]
 
-# FTX api rate limit is 10 requests per second
-TIME_TO_SLEEP_BETWEEN_TIMEFRAME_LAUNCH = 0.25  # Sleeping 250 ms will avoid errors with a reasonable tolerance
-
 LONG_MA_VOLUME_DEPTH = 100  # The number of candles to be used as volume comparison base
 SHORT_MA_VOLUME_DEPTH = 4  # The number of candles used to compare volume on (must be < than LONG_MA_VOLUME_DEPTH)
 
@@ -66,8 +64,14 @@ JAIL_DURATION = 60 * 60  # Time for wish a coin can't be re bought after a posit
 class MultiCoinAbnormalVolumeTracker(Strategy):
     """Multi coin abnormal volume tracker"""
 
-    def __init__(self):
-        """The multi coin abnormal volume tracker strategy constructor"""
+    def __init__(self, ftx_rest_api: FtxRestApi = None, acquire_stock_data: bool = True):
+        """
+        The multi coin abnormal volume tracker strategy constructor
+
+        :param ftx_rest_api: FTX rest api. A new one is created if None
+        :param acquire_stock_data: Start the data acquisition of the tracked pairs. Set to False when the stock data
+        is fed by something else (ie: a backtest engine)
+        """
 
         logging.info("MultiCoinAbnormalVolumeTracker run strategy")
         super(MultiCoinAbnormalVolumeTracker, self).__init__()
@@ -75,7 +79,7 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
         # Deactivate stock data log for readability purposes
         TimeFrameManager.log_received_stock_data = False
 
-        self.ftx_rest_api: FtxRestApi = FtxRestApi()
+        self.ftx_rest_api: FtxRestApi = ftx_rest_api if ftx_rest_api is not None else FtxRestApi()
         self.pair_manager_list = {}  # { [pair]: pair_manager }
 
         self.total_invested = 0
@@ -91,7 +95,8 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
             print(f"Initializing pair {i} of {len(PAIRS_TO_TRACK)}: {pair_to_track}")
             crypto_pair_manager = CryptoPairManager(pair_to_track, self.ftx_rest_api)
             crypto_pair_manager.add_time_frame(60, False)
-            crypto_pair_manager.start_all_time_frame_acq()
+            if acquire_stock_data:
+                crypto_pair_manager.start_all_time_frame_acq()
 
             pair_manager: PairManagerDict = {
                 "crypto_pair_manager": crypto_pair_manager,
@@ -102,7 +107,6 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
             }
 
             self.pair_manager_list[pair_to_track] = pair_manager
-            time.sleep(TIME_TO_SLEEP_BETWEEN_TIMEFRAME_LAUNCH)
 
     def before_loop(self) -> None:
         pass
@@ -110,20 +114,21 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
     def loop(self) -> None:
         """The strategy core"""
 
-        logging.info("Compute overall market volume indicator ...")
+        logging.info("Scanning markets ...")
+
+        # Market volume indicator and volume checks of every coin, computed at once
+        evaluation = self.evaluate_markets()
 
         # This indicator will help to not trigger too many coin position openings when the whole market is pumping
-        self.compute_all_market_volume_indicator()
+        self.current_market_volume_indicator = evaluation["market_volume_indicator"]
         logging.info(f"Overall market volume indicator = {self.current_market_volume_indicator}")
 
-        logging.info("Scanning markets ...")
-
         # For each coin
         for pair_to_track in PAIRS_TO_TRACK:
             try:
                 pair_manager: PairManagerDict = self.pair_manager_list[pair_to_track]
 
-                if self.decide(pair_to_track):
+                if self.decide(pair_to_track, evaluation):
                     logging.info(f"Market:{pair_to_track}, all decision checks passed ! Let's buy this :)")
 
                     if self.open_position(pair_to_track):
@@ -136,7 +141,7 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
         logging.info("Markets scanned !")
 
     def after_loop(self) -> None:
-        time.sleep(10)
+        self.clock.sleep(10)
 
     def cleanup(self) -> None:
         """Clean strategy execution"""
@@ -148,50 +153,27 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
             logging.info(f"Stopping time frame acquisition on pair {i} of {len(PAIRS_TO_TRACK)}: {pair_to_track}")
             self.pair_manager_list[pair_to_track]["crypto_pair_manager"].stop_all_time_frame_acq()
 
-    def compute_all_market_volume_indicator(self):
+    def evaluate_markets(self) -> VolumeEvaluationDict:
         """
-        Compute an indicator of how much the short ma on every coin volume is more (indicator > 1)
-        or less (indicator < 1) than the long ma volume
+        Compute the overall market volume indicator and check the volumes of every coin
+
+        :return: The evaluation
         """
-        all_pairs_volume_factor_sum = 0
-        all_pairs_number = 0
+        evaluator = AbnormalVolumeEvaluator(LONG_MA_VOLUME_DEPTH, SHORT_MA_VOLUME_DEPTH, VOLUME_CHECK_FACTOR_SIZE,
+                                            SHORT_MA_GREEN_CANDLE_DOMINANCE_MIN_RATIO, MINIMUM_AVERAGE_VOLUME,
+                                            MINIMUM_PRICE_VARIATION)
 
-        # For each coin
-        for pair_to_track in PAIRS_TO_TRACK:
-            pair_manager: PairManagerDict = self.pair_manager_list[pair_to_track]
-            stock_data_manager = pair_manager["crypto_pair_manager"].get_time_frame(60).stock_data_manager
-
-            # Not enough data
-            if len(stock_data_manager.stock_data_list) < LONG_MA_VOLUME_DEPTH + SHORT_MA_VOLUME_DEPTH:
-                continue
-
-            lma_sum_volume = sum([d.volume for d in stock_data_manager.stock_data_list[
-                                                    -(LONG_MA_VOLUME_DEPTH + SHORT_MA_VOLUME_DEPTH):
-                                                    -SHORT_MA_VOLUME_DEPTH]])
-            lma_avg_volume = lma_sum_volume / LONG_MA_VOLUME_DEPTH
-
-            sma_sum_volume = sum([d.volume for d in stock_data_manager.stock_data_list[-SHORT_MA_VOLUME_DEPTH:]])
-            sma_avg_volume = sma_sum_volume / SHORT_MA_VOLUME_DEPTH
-
-            # Don't consider coins without sma avg volume as well
-            if lma_avg_volume > 0 and sma_avg_volume > 0:
-                all_pairs_number += 1
-                # Avoid having too high or too low volume factor values by capping the factor between 0.5 and 4
-                if sma_avg_volume / lma_avg_volume < 0.5:
-                    all_pairs_volume_factor_sum += 0.5
-                elif sma_avg_volume / lma_avg_volume > 4:
-                    all_pairs_volume_factor_sum += 4
-                else:
-                    all_pairs_volume_factor_sum += sma_avg_volume / lma_avg_volume
-
-        self.current_market_volume_indicator = round(all_pairs_volume_factor_sum / all_pairs_number, 2) \
-            if all_pairs_number != 0 else 1
-
-    def decide(self, pair: str) -> bool:
+        return evaluator.evaluate({
+            pair_to_track: self.pair_manager_list[pair_to_track]["crypto_pair_manager"].get_time_frame(60)
+            .stock_data_manager for pair_to_track in PAIRS_TO_TRACK
+        })
+
+    def decide(self, pair: str, evaluation: VolumeEvaluationDict) -> bool:
         """
         Decide to open or not a position on a given pair
 
         :param pair: The pair to open a position on
+        :param evaluation: The volume evaluation of every coin
         :return: True if the position is successfully opened, False otherwise
         """
 
@@ -206,99 +188,26 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
         if pair_manager["last_position_driver_state"] == PositionStateEnum.OPENED:
             self.total_invested = self.total_invested - pair_manager["invested"]
             pair_manager["last_position_driver_state"] = PositionStateEnum.NOT_OPENED
-            pair_manager["jail_start_timestamp"] = int(time.time())
+            pair_manager["jail_start_timestamp"] = int(self.clock.time())
 
         # Coin is in jail after a position was closed
-        if int(time.time()) < pair_manager["jail_start_timestamp"] + JAIL_DURATION:
-            return False  # Skip this coin
-
-        stock_data_manager = pair_manager["crypto_pair_manager"].get_time_frame(60).stock_data_manager
-
-        # Not enough data
-        if len(stock_data_manager.stock_data_list) < LONG_MA_VOLUME_DEPTH + SHORT_MA_VOLUME_DEPTH:
-            return False
-
-        # Compute zero volume candles number
-        zero_volume_candles_number = sum(map(
-            lambda x: x == 0,
-            [d.volume for d in stock_data_manager.stock_data_list[-(LONG_MA_VOLUME_DEPTH + SHORT_MA_VOLUME_DEPTH):
-                                                                  -SHORT_MA_VOLUME_DEPTH]]
-        ))
-
-        # Too many zero volume candles
-        if zero_volume_candles_number > LONG_MA_VOLUME_DEPTH / 3:
+        if int(self.clock.time()) < pair_manager["jail_start_timestamp"] + JAIL_DURATION:
             return False  # Skip this coin
 
-        # Check average LONG_MA_VOLUME_DEPTH (lma) candles volume is VOLUME_CHECK_FACTOR_SIZE times more
-        # than the average SHORT_MA_VOLUME_DEPTH (sma)
-        lma_sum_volume = sum([d.volume for d in stock_data_manager.stock_data_list[
-                                                -(LONG_MA_VOLUME_DEPTH + SHORT_MA_VOLUME_DEPTH):
-                                                -SHORT_MA_VOLUME_DEPTH]])
+        failure = evaluation["failures"].get(pair)
 
-        # Don't consider zero volume candles
-        lma_avg_volume = lma_sum_volume / (LONG_MA_VOLUME_DEPTH - zero_volume_candles_number)
-
-        sma_sum_volume = sum([d.volume for d in stock_data_manager.stock_data_list[-SHORT_MA_VOLUME_DEPTH:]])
-        sma_avg_volume = sma_sum_volume / SHORT_MA_VOLUME_DEPTH
-
-        # Increase VOLUME_CHECK_FACTOR_SIZE applied value using current_market_indicator (if indicator is more than 1)
-        applied_volume_factor = max(VOLUME_CHECK_FACTOR_SIZE,
-                                    VOLUME_CHECK_FACTOR_SIZE * self.current_market_volume_indicator)
-
-        # If recent volume are not applied_volume_factor time more than older volume
-        if sma_avg_volume == 0 or sma_avg_volume / lma_avg_volume < applied_volume_factor:
+        if failure is VolumeCheckFailureEnum.VOLUME_FACTOR:
             # log volumes that are higher than 1/3 the required volumes
-            if lma_avg_volume != 0 and sma_avg_volume / lma_avg_volume > math.floor(applied_volume_factor / 3):
-                logging.info(f"Market:{pair}, volume factor check: "
-                             f"{sma_avg_volume} / {lma_avg_volume} = {sma_avg_volume / lma_avg_volume}")
-            return False  # Skip this coin
-
-        logging.info(f"Market:{pair}, volume factor check passes ! "
-                     f"{sma_avg_volume} > {lma_avg_volume} * {applied_volume_factor}")
-
-        green_candles_number = 0
-
-        # Individual candle checks
-        for i in range(1, SHORT_MA_VOLUME_DEPTH + 1):
-
-            # Count green candles
-            if stock_data_manager.stock_data_list[-i].get_color() is ColorEnum.GREEN:
-                green_candles_number += 1
-
-            # Volume factor check
-            if stock_data_manager.stock_data_list[-i].volume / lma_avg_volume < applied_volume_factor:
-                logging.info(f"Market:{pair}, volume individual candle check fail !")
-                return False  # Skip this coin
+            applied_volume_factor = max(VOLUME_CHECK_FACTOR_SIZE,
+                                        VOLUME_CHECK_FACTOR_SIZE * evaluation["market_volume_indicator"])
+            if evaluation["volume_factors"][pair] > math.floor(applied_volume_factor / 3):
+                logging.info(f"Market:{pair}, volume factor check: {evaluation['volume_factors'][pair]}")
+        elif failure not in [None, VolumeCheckFailureEnum.NOT_ENOUGH_DATA,
+                             VolumeCheckFailureEnum.TOO_MANY_ZERO_VOLUME_CANDLES]:
+            logging.info(f"Market:{pair}, volume factor check passes ! {evaluation['volume_factors'][pair]}")
+            logging.info(f"Market:{pair}, {failure.value} check fail !")
 
-            # Volume minimum value check
-            if stock_data_manager.stock_data_list[-i].volume < MINIMUM_AVERAGE_VOLUME:
-                logging.info(f"Market:{pair}, volume minimum value check fail ! "
-                             f"{stock_data_manager.stock_data_list[-i].volume} < {MINIMUM_AVERAGE_VOLUME}")
-                return False  # Skip this coin
-
-        if green_candles_number / SHORT_MA_VOLUME_DEPTH < SHORT_MA_GREEN_CANDLE_DOMINANCE_MIN_RATIO:
-            logging.info(f"Market:{pair}, green candle dominance check fail ! "
-                         f"{green_candles_number} green candle(s) is less than {SHORT_MA_VOLUME_DEPTH} * "
-                         f"{SHORT_MA_GREEN_CANDLE_DOMINANCE_MIN_RATIO}")
-            return False  # Skip this coin
-
-        logging.info(f"Market:{pair}, Volume check passes ! "
-                     f"{sma_avg_volume} >= {MINIMUM_AVERAGE_VOLUME}")
-
-        # Check the price is up from at least MINIMUM_PRICE_VARIATION %
-        candle_before = stock_data_manager.stock_data_list[-(SHORT_MA_VOLUME_DEPTH + 1)]
-        last_candle = stock_data_manager.stock_data_list[-1]
-
-        if last_candle.close_price < candle_before.open_price * (1 + MINIMUM_PRICE_VARIATION / 100):
-            logging.info(f"Market:{pair}, price minimum check fail ! "
-                         f"{last_candle.close_price} < "
-                         f"{candle_before.open_price * (1 + MINIMUM_PRICE_VARIATION / 100)}")
-            return False  # Skip this coin
-
-        logging.info(f"Market:{pair}, price minimum check passes ! "
-                     f"{last_candle.close_price} >= {candle_before.open_price} * {MINIMUM_PRICE_VARIATION}%")
-
-        return True
+        return failure is None
 
     def open_position(self, pair: str) -> bool:
         """
@@ -310,7 +219,7 @@ class MultiCoinAbnormalVolumeTracker(Strategy):
 
         pair_manager: PairManagerDict = self.pair_manager_list[pair]
         pair_manager["position_driver"] = PositionDriver(self.ftx_rest_api,
-                                                         POSITION_DRIVER_WORKER_SLEEP_TIME_BETWEEN_LOOPS)
+                                                         POSITION_DRIVER_WORKER_SLEEP_TIME_BETWEEN_LOOPS, self.clock)
 
         response = self.ftx_rest_api.get("wallet/balances")
         wallets = [format_wallet_raw_data(wallet) for wallet in response if
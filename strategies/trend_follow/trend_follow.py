@@ -1,6 +1,7 @@
 import logging
 import math
 import time
+from typing import Optional
 
 from core.enums.order_type_enum import OrderTypeEnum
 from core.enums.position_state_enum import PositionStateEnum
@@ -36,6 +37,9 @@ class TrendFollow(Strategy):
         self.ftx_rest_api: FtxRestApi = FtxRestApi()
         self.ftx_ws_client: FtxWebsocketClient = FtxWebsocketClient()
         self.ftx_ws_client.connect()
+        # Subscribe to the orderbook now (the subscription is kept on reconnection), so that opening a position never
+        # waits for its first update
+        self.ftx_ws_client.wait_for_orderbook_update(MARKET, 5)
 
         # Init stock acquisition / or / position driver
         self.btc_manager: CryptoPairManager = CryptoPairManager(MARKET, self.ftx_rest_api)
@@ -46,6 +50,7 @@ class TrendFollow(Strategy):
         # Init loop vars
         self.current_position_side = SideEnum.BUY
         self.last_position_state = PositionStateEnum.NOT_OPENED
+        self.market_data: Optional[MarketDataDict] = None
 
     def before_loop(self) -> None:
         pass
@@ -83,22 +88,34 @@ class TrendFollow(Strategy):
             wallet: WalletDict = wallets[0]
             position_price = min(math.floor(wallet["free"]), POSITION_MAX_PRICE)
 
-            # Retrieve market data
-            logging.info("Retrieving market price")
-            response = self.ftx_rest_api.get(f"markets/{MARKET}")
-            logging.info(f"FTX API response: {str(response)}")
-
-            market_data: MarketDataDict = format_market_raw_data(response)
-
-            # Ticker ask is not always filled. Use market data in this case
-            ask = market_data["ask"] if ticker_price is None else ticker_price["ask"]
-            bid = market_data["bid"] if ticker_price is None else ticker_price["bid"]
-
-            if ticker_price is None:
-                logging.warning(f"Ticker was empty, using stock data instead")
-
-            pair_price = ask if self.current_position_side == SideEnum.BUY else bid
-            position_size = position_price / pair_price - position_price / pair_price % market_data["size_increment"]
+            # Retrieve market data (size increment only changes on FTX side, it is retrieved once)
+            if self.market_data is None:
+                logging.info("Retrieving market data")
+                response = self.ftx_rest_api.get(f"markets/{MARKET}")
+                logging.info(f"FTX API response: {str(response)}")
+
+                self.market_data = format_market_raw_data(response)
+
+            # Expected fill price of the market order, from the live orderbook. Ticker and market data are used if the
+            # orderbook is empty or being synchronized again (reading it would wait for its next update)
+            best_price = None
+            if self.ftx_ws_client.get_orderbook_timestamp(MARKET) > 0:
+                orderbook_snapshot = self.ftx_ws_client.get_orderbook_snapshot(MARKET)
+                best_price = orderbook_snapshot["best_ask" if self.current_position_side == SideEnum.BUY
+                                                else "best_bid"]
+
+            if best_price is not None:
+                pair_price = self.ftx_ws_client.get_orderbook_vwap(MARKET, self.current_position_side,
+                                                                   position_price / best_price) or best_price
+            elif ticker_price is not None:
+                pair_price = ticker_price["ask" if self.current_position_side == SideEnum.BUY else "bid"]
+            else:
+                logging.warning(f"Orderbook and ticker were empty, using market data instead")
+                self.market_data = format_market_raw_data(self.ftx_rest_api.get(f"markets/{MARKET}"))
+                pair_price = self.market_data["ask" if self.current_position_side == SideEnum.BUY else "bid"]
+
+            size_increment = self.market_data["size_increment"]
+            position_size = position_price / pair_price - position_price / pair_price % size_increment
 
             # Configure position settings
             
@@ -1,6 +1,5 @@
 import logging
 
-from core.enums.color_enum import ColorEnum
 from core.stock.stock_data_manager import StockDataManager
 from strategies.twitter_elon_musk_doge_tracker.enums.probability_enum import ProbabilityEnum
 
@@ -45,18 +44,18 @@ class OrderDecisionMaker(object):
 
             logging.info("The decision maker needs to verify with volumes.")
 
-            if len(self.stock_data_manager.stock_data_list) > VOLUME_CHECK_DEPTH:
+            if len(self.stock_data_manager.get_data_view("volume")) > VOLUME_CHECK_DEPTH:
                 # Check last volume is volume_check_factor_size times more than the average 20 data candles
-                sum_volume = sum([d.volume for d in self.stock_data_manager.stock_data_list[-VOLUME_CHECK_DEPTH:]])
-                avg_volume = sum_volume / VOLUME_CHECK_DEPTH
-                last_data_candle = self.stock_data_manager.stock_data_list[-1]
+                avg_volume = self.stock_data_manager.get_volume_statistics(VOLUME_CHECK_DEPTH).volume_mean
+                last_volume = float(self.stock_data_manager.get_data_view("volume", 1)[0])
+                is_last_candle_green = self.stock_data_manager.get_data_view("open_price", 1)[0] <= \
+                    self.stock_data_manager.get_data_view("close_price", 1)[0]
 
-                logging.info(f"Volume ratio is {last_data_candle.volume / avg_volume} out of "
+                logging.info(f"Volume ratio is {last_volume / avg_volume} out of "
                              f"{volume_check_factor_size}. Trend is "
-                             f"{'upward' if last_data_candle.get_color() == ColorEnum.GREEN else 'downward'}")
+                             f"{'upward' if is_last_candle_green else 'downward'}")
 
-                volumes_factor_reached = last_data_candle.volume / avg_volume > volume_check_factor_size and \
-                    last_data_candle.get_color() == ColorEnum.GREEN
+                volumes_factor_reached = last_volume / avg_volume > volume_check_factor_size and is_last_candle_green
 
                 if volumes_factor_reached:
                     logging.info(
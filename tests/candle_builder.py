@@ -0,0 +1,29 @@
+import random
+from typing import List
+
+from core.models.raw_stock_data_dict import RawStockDataDict
+
+
+def build_candles(candle_number: int, seed: int = 42) -> List[RawStockDataDict]:
+    """Build a random walk candle list"""
+    rand = random.Random(seed)
+    candles = []
+    close_price = 100.0
+
+    for identifier in range(candle_number):
+        open_price = close_price
+        close_price = max(1.0, open_price + rand.uniform(-2, 2))
+        # Some flat candles to check zero gain / loss cases
+        if identifier % 17 == 0:
+            close_price = open_price
+        candles.append({
+            "id": identifier,
+            "time": identifier * 60,
+            "open_price": open_price,
+            "high_price": max(open_price, close_price) + rand.uniform(0, 1),
+            "low_price": min(open_price, close_price) - rand.uniform(0, 1),
+            "close_price": close_price,
+            "volume": rand.choice([0.0, rand.uniform(0, 5000)])
+        })
+
+    return candles
@@ -0,0 +1,16 @@
+"""
+Stub of config.private.ftx_config (the FTX api keys file is not versioned), so that the modules using FTX api can be
+imported by the tests. Import this module before them
+"""
+import sys
+import types
+
+import config.private
+
+ftx_config = types.ModuleType("config.private.ftx_config")
+ftx_config.ws_endpoint = "wss://ftx.com/ws/"
+ftx_config.rest_endpoint = "https://ftx.com/api/"
+ftx_config.api = {"key": "api key", "secret": "api secret", "sub_account": ""}
+
+sys.modules["config.private.ftx_config"] = ftx_config
+config.private.ftx_config = ftx_config
@@ -0,0 +1,93 @@
+import unittest
+
+import numpy as np
+
+from core.stock.stock_data_manager import StockDataManager
+from strategies.multi_coin_abnormal_volume_tracker.abnormal_volume_evaluator import AbnormalVolumeEvaluator
+from strategies.multi_coin_abnormal_volume_tracker.enums.volume_check_failure_enum import VolumeCheckFailureEnum
+
+LONG_DEPTH = 20
+SHORT_DEPTH = 4
+
+
+def _reference_decide(candles, market_volume_indicator):
+    """Per pair checks, computed the way MultiCoinAbnormalVolumeTracker.decide used to"""
+    if len(candles) < LONG_DEPTH + SHORT_DEPTH:
+        return VolumeCheckFailureEnum.NOT_ENOUGH_DATA
+
+    long_volumes = [c["volume"] for c in candles[-(LONG_DEPTH + SHORT_DEPTH):-SHORT_DEPTH]]
+    zero_volume_candle_number = sum(v == 0 for v in long_volumes)
+    if zero_volume_candle_number > LONG_DEPTH / 3:
+        return VolumeCheckFailureEnum.TOO_MANY_ZERO_VOLUME_CANDLES
+
+    long_avg_volume = sum(long_volumes) / (LONG_DEPTH - zero_volume_candle_number)
+    short_avg_volume = sum(c["volume"] for c in candles[-SHORT_DEPTH:]) / SHORT_DEPTH
+    applied_volume_factor = max(10, 10 * market_volume_indicator)
+    if short_avg_volume == 0 or short_avg_volume / long_avg_volume < applied_volume_factor:
+        return VolumeCheckFailureEnum.VOLUME_FACTOR
+
+    green_candle_number = 0
+    for i in range(1, SHORT_DEPTH + 1):
+        if candles[-i]["open_price"] <= candles[-i]["close_price"]:
+            green_candle_number += 1
+        if candles[-i]["volume"] / long_avg_volume < applied_volume_factor:
+            return VolumeCheckFailureEnum.INDIVIDUAL_CANDLE_VOLUME_FACTOR
+        if candles[-i]["volume"] < 15000:
+            return VolumeCheckFailureEnum.MINIMUM_VOLUME
+
+    if green_candle_number / SHORT_DEPTH < 0.75:
+        return VolumeCheckFailureEnum.GREEN_CANDLE_DOMINANCE
+
+    if candles[-1]["close_price"] < candles[-(SHORT_DEPTH + 1)]["open_price"] * (1 + 0.6 / 100):
+        return VolumeCheckFailureEnum.MINIMUM_PRICE_VARIATION
+
+    return None
+
+
+def _reference_market_volume_indicator(candle_lists):
+    factor_sum, pair_number = 0, 0
+    for candles in candle_lists:
+        if len(candles) < LONG_DEPTH + SHORT_DEPTH:
+            continue
+        long_avg_volume = sum(c["volume"] for c in candles[-(LONG_DEPTH + SHORT_DEPTH):-SHORT_DEPTH]) / LONG_DEPTH
+        short_avg_volume = sum(c["volume"] for c in candles[-SHORT_DEPTH:]) / SHORT_DEPTH
+        if long_avg_volume > 0 and short_avg_volume > 0:
+            pair_number += 1
+            factor_sum += min(max(short_avg_volume / long_avg_volume, 0.5), 4)
+    return round(factor_sum / pair_number, 2) if pair_number != 0 else 1
+
+
+class TestAbnormalVolumeEvaluator(unittest.TestCase):
+    """Test AbnormalVolumeEvaluator"""
+
+    def test_evaluate(self):
+        """Test that the vectorized checks give the same results as the per pair checks"""
+        rng = np.random.default_rng(7)
+        candle_lists = {}
+
+        for pair_index in range(300):
+            candle_number = int(rng.choice([10, 30]))
+            prices = 100 * np.cumprod(1 + rng.normal(0.002 * (pair_index % 3), 0.004, candle_number + 1))
+            base_volume = rng.choice([100, 2000])
+            volumes = rng.exponential(base_volume, candle_number) * (rng.random(candle_number) > 0.3 * (pair_index % 2))
+            spike = rng.choice([1, 30, 100])
+            volumes[-SHORT_DEPTH:] = rng.uniform(0.5, 1.5, SHORT_DEPTH) * base_volume * spike
+            candle_lists[f"PAIR{pair_index}"] = [{
+                "id": i, "time": i * 60, "open_price": prices[i], "high_price": max(prices[i], prices[i + 1]),
+                "low_price": min(prices[i], prices[i + 1]), "close_price": prices[i + 1], "volume": volumes[i]
+            } for i in range(candle_number)]
+
+        evaluator = AbnormalVolumeEvaluator(LONG_DEPTH, SHORT_DEPTH, 10, 0.75, 15000, 0.6)
+        evaluation = evaluator.evaluate({pair: StockDataManager(candles, False)
+                                         for pair, candles in candle_lists.items()})
+
+        market_volume_indicator = _reference_market_volume_indicator(candle_lists.values())
+        self.assertEqual(evaluation["market_volume_indicator"], market_volume_indicator)
+
+        failures = {pair: _reference_decide(candles, market_volume_indicator)
+                    for pair, candles in candle_lists.items()}
+        self.assertEqual(evaluation["candidates"], [pair for pair, failure in failures.items() if failure is None])
+        self.assertEqual(evaluation["failures"], {pair: f for pair, f in failures.items() if f is not None})
+
+        # Every check is covered by the generated data
+        self.assertEqual(set(failures.values()), set(VolumeCheckFailureEnum) | {None})
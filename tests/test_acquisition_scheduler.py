@@ -0,0 +1,67 @@
+import threading
+import time
+import unittest
+
+from core.stock.acquisition_scheduler import AcquisitionScheduler
+
+
+class FakeTimeFrameManager(object):
+    """Time frame manager stub recording its acquisitions"""
+
+    def __init__(self, market: str, acquisitions: list, acquisition_number: int, delay: float):
+        self.market = market
+        self.time_frame_length = 60
+        self.acquisitions = acquisitions
+        self.remaining_acquisitions = acquisition_number
+        self.delay = delay
+        self.done = threading.Event()
+
+    def feed(self) -> None:
+        self.acquisitions.append((self.market, time.time()))
+        self.remaining_acquisitions -= 1
+        if self.remaining_acquisitions == 0:
+            self.done.set()
+
+    def get_next_acquisition_time(self) -> float:
+        return time.time() + (self.delay if self.remaining_acquisitions > 0 else 3600)
+
+
+class TestAcquisitionScheduler(unittest.TestCase):
+    """Test AcquisitionScheduler"""
+
+    def test_acquisitions_follow_due_times(self):
+        """Test that subscriptions are fed in due time order and rescheduled"""
+        acquisitions = []
+        acquisition_scheduler = AcquisitionScheduler(100, 1)
+        now = time.time()
+        late = FakeTimeFrameManager("LATE", acquisitions, 1, 0)
+        early = FakeTimeFrameManager("EARLY", acquisitions, 3, 0.01)
+
+        acquisition_scheduler.subscribe(late, now + 0.1)
+        acquisition_scheduler.subscribe(early, now + 0.05)
+
+        self.assertTrue(late.done.wait(2))
+        self.assertTrue(early.done.wait(2))
+        self.assertEqual([market for market, _ in acquisitions], ["EARLY", "EARLY", "EARLY", "LATE"])
+        self.assertGreaterEqual(acquisitions[0][1], now + 0.05)
+
+        acquisition_scheduler.unsubscribe(late)
+        acquisition_scheduler.unsubscribe(early)
+        self.assertFalse(acquisition_scheduler.is_subscribed(early))
+
+    def test_rate_limit(self):
+        """Test that the global rate limit is applied to all the subscriptions"""
+        acquisitions = []
+        acquisition_scheduler = AcquisitionScheduler(20, 4)
+        time_frame_managers = [FakeTimeFrameManager(f"M{i}", acquisitions, 1, 0) for i in range(30)]
+
+        start = time.time()
+        for time_frame_manager in time_frame_managers:
+            acquisition_scheduler.subscribe(time_frame_manager)
+
+        for time_frame_manager in time_frame_managers:
+            self.assertTrue(time_frame_manager.done.wait(5))
+            acquisition_scheduler.unsubscribe(time_frame_manager)
+
+        # 20 first acquisitions are the burst, the 10 next ones wait for the bucket to refill
+        self.assertGreaterEqual(acquisitions[-1][1] - start, 9 / 20)
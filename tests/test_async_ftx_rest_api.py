@@ -0,0 +1,139 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import asyncio
+import json
+import time
+import unittest
+from typing import Dict, List, Optional
+from unittest import mock
+
+import aiohttp
+from requests import Request
+
+from core.ftx.rest.async_ftx_rest_api import AsyncFtxRestApi
+from core.ftx.rest.ftx_rest_api import FtxRestApi
+from tools.priority_token_bucket import PriorityTokenBucket
+
+
+class FakeResponse(object):
+    """aiohttp response stub"""
+
+    def __init__(self, status: int, content: bytes):
+        self.status: int = status
+        self._content: bytes = content
+
+    async def read(self) -> bytes:
+        return self._content
+
+    def raise_for_status(self) -> None:
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(mock.Mock(real_url="https://ftx.com/api/"), (), status=self.status,
+                                              message="Internal Server Error")
+
+
+class FakeRequestContext(object):
+    """Context manager returned by FakeSession.request, holding the response for a while"""
+
+    def __init__(self, session: 'FakeSession', response: FakeResponse):
+        self._session: 'FakeSession' = session
+        self._response: FakeResponse = response
+
+    async def __aenter__(self) -> FakeResponse:
+        self._session.in_flight += 1
+        self._session.max_in_flight = max(self._session.max_in_flight, self._session.in_flight)
+        await asyncio.sleep(self._session.response_delay)
+        return self._response
+
+    async def __aexit__(self, *args) -> None:
+        self._session.in_flight -= 1
+
+
+class FakeSession(object):
+    """aiohttp client session stub answering requests by url path, recording the sent requests"""
+
+    def __init__(self, response_delay: float = 0):
+        self.response_delay: float = response_delay
+        self.responses: Dict[str, FakeResponse] = {}  # { [path]: response }, a successful empty response by default
+        self.requests: List[dict] = []
+        self.request_times: List[float] = []
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+
+    def request(self, method: str, url, data: Optional[bytes], headers: Dict[str, str]) -> FakeRequestContext:
+        self.requests.append({"method": method, "url": str(url), "data": data, "headers": headers})
+        self.request_times.append(time.monotonic())
+        response = self.responses.get(url.path, FakeResponse(200, json.dumps({"success": True, "result": []}).encode()))
+        return FakeRequestContext(self, response)
+
+    async def close(self) -> None:
+        pass
+
+
+class TestAsyncFtxRestApi(unittest.TestCase):
+    """Test AsyncFtxRestApi"""
+
+    def setUp(self):
+        self._rate_limiters = (FtxRestApi.rate_limiter, FtxRestApi.public_rate_limiter,
+                               FtxRestApi.private_rate_limiter)
+        FtxRestApi.rate_limiter = PriorityTokenBucket(100, 100)
+        FtxRestApi.public_rate_limiter = PriorityTokenBucket(100, 100)
+        FtxRestApi.private_rate_limiter = PriorityTokenBucket(100, 100)
+
+        self.ftx_rest_api = AsyncFtxRestApi()
+        self.session = FakeSession()
+        self.ftx_rest_api._session = self.session
+
+    def tearDown(self):
+        FtxRestApi.rate_limiter, FtxRestApi.public_rate_limiter, FtxRestApi.private_rate_limiter = \
+            self._rate_limiters
+
+    def test_signature(self):
+        """Test that requests are signed as FtxRestApi signs them"""
+        with mock.patch("time.time", return_value=1_600_000_000):
+            asyncio.run(self.ftx_rest_api.get("orders", {"market": "BTC-PERP"}))
+            asyncio.run(self.ftx_rest_api.post("orders", {"market": "BTC-PERP", "side": "buy", "size": 1}))
+
+            expected_requests = [Request("GET", "https://ftx.com/api/orders", params={"market": "BTC-PERP"}),
+                                 Request("POST", "https://ftx.com/api/orders",
+                                         json={"market": "BTC-PERP", "side": "buy", "size": 1})]
+            for request in expected_requests:
+                FtxRestApi()._sign_request(request)
+
+        self.assertEqual(len(self.session.requests), 2)
+        for request, expected_request in zip(self.session.requests, expected_requests):
+            expected_prepared = expected_request.prepare()
+            self.assertEqual(request["url"], expected_prepared.url)
+            self.assertEqual(request["data"], expected_prepared.body)
+            for header in ["FTX-KEY", "FTX-SIGN", "FTX-TS"]:
+                self.assertEqual(request["headers"][header], expected_prepared.headers[header])
+
+    def test_gather_concurrency(self):
+        """Test that gathered requests are in flight together, while being sent under the rate limit"""
+        FtxRestApi.rate_limiter = PriorityTokenBucket(50, 2)
+        self.session.response_delay = 0.05
+        markets = [f"COIN{i}-PERP" for i in range(6)]
+
+        candles = asyncio.run(self.ftx_rest_api.gather_candles(markets, 60))
+
+        self.assertEqual(list(candles), markets)
+        self.assertGreater(self.session.max_in_flight, 1)
+        # 2 requests sent at once, then one every 1 / 50 sec
+        self.assertGreaterEqual(self.session.request_times[-1] - self.session.request_times[0], 0.07)
+        self.assertTrue(all("resolution=60" in request["url"] for request in self.session.requests))
+
+    def test_gather_failures(self):
+        """Test that failed requests are logged and left out of the results"""
+        self.session.responses = {
+            "/api/markets/ETH-PERP": FakeResponse(200, json.dumps({"success": False, "error": "No such market"})
+                                                  .encode()),
+            "/api/markets/SOL-PERP": FakeResponse(500, b"Internal Server Error")
+        }
+
+        with self.assertLogs(level="ERROR") as logs:
+            markets = asyncio.run(self.ftx_rest_api.gather_markets(["BTC-PERP", "ETH-PERP", "SOL-PERP"]))
+
+        self.assertEqual(markets, {"BTC-PERP": []})
+        self.assertEqual(len(logs.output), 2)
+        self.assertIn("ETH-PERP", logs.output[0])
+        self.assertIn("No such market", logs.output[0])
+        self.assertIn("SOL-PERP", logs.output[1])
+        self.assertIn("500", logs.output[1])
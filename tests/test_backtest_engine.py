@@ -0,0 +1,143 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import unittest
+from typing import Any, Dict, List, Optional
+
+from candle_builder import build_candles
+from core.backtest.backtest_engine import BacktestEngine
+from core.backtest.simulated_exchange import SimulatedExchange
+from core.enums.order_type_enum import OrderTypeEnum
+from core.enums.side_enum import SideEnum
+from core.strategy.strategy import Strategy
+from core.stock.stock_data_manager import StockDataManager
+from core.trading.position_driver import PositionDriver
+from tools.system_clock import SystemClock
+
+
+class _RecordingStrategy(Strategy):
+    """Strategy recording the data it sees on each loop"""
+
+    def __init__(self, stock_data_managers):
+        super(_RecordingStrategy, self).__init__()
+        self.stock_data_managers = stock_data_managers
+        self.seen = []
+
+    def before_loop(self) -> None:
+        pass
+
+    def loop(self) -> None:
+        self.seen.append((self.clock.time(), [len(sdm.stock_data_list) for sdm in self.stock_data_managers]))
+
+    def after_loop(self) -> None:
+        self.clock.sleep(10)
+
+    def cleanup(self) -> None:
+        pass
+
+
+class _RecordingExchange(SimulatedExchange):
+    """Simulated exchange recording the virtual time of each request"""
+
+    def __init__(self, clock: SystemClock):
+        super(_RecordingExchange, self).__init__(10000, clock=clock)
+        self.requests: List[tuple] = []
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None, priority=None) -> Any:
+        self.requests.append(("GET", path, self.clock.time()))
+        return super(_RecordingExchange, self).get(path, params, priority)
+
+    def post(self, path: str, params: Optional[Dict[str, Any]] = None, priority=None) -> Any:
+        self.requests.append(("POST", path, self.clock.time()))
+        return super(_RecordingExchange, self).post(path, params, priority)
+
+    def delete(self, path: str, params: Optional[Dict[str, Any]] = None, priority=None) -> Any:
+        self.requests.append(("DELETE", path, self.clock.time()))
+        return super(_RecordingExchange, self).delete(path, params, priority)
+
+
+class _PositionStrategy(Strategy):
+    """Strategy opening a position with a position driver on its first loop, then sleeping 45 sec per loop"""
+
+    def __init__(self, exchange: SimulatedExchange):
+        super(_PositionStrategy, self).__init__()
+        self.exchange = exchange
+        self.position_driver: Optional[PositionDriver] = None
+
+    def before_loop(self) -> None:
+        pass
+
+    def loop(self) -> None:
+        if self.position_driver is None:
+            self.position_driver = PositionDriver(self.exchange, 10, self.clock)
+            self.position_driver.open_position("BTC-PERP", SideEnum.BUY, {
+                "openings": [{"price": None, "size": 1, "type": OrderTypeEnum.MARKET}],
+                "trigger_orders": [],
+                "max_open_duration": 600
+            })
+
+    def after_loop(self) -> None:
+        self.clock.sleep(45)
+
+    def cleanup(self) -> None:
+        pass
+
+
+class TestBacktestEngine(unittest.TestCase):
+    """Test BacktestEngine"""
+
+    def test_run(self):
+        """Test that candles of several time frames are replayed in candle close order on the virtual clock"""
+        candles = build_candles(120)  # One minute candles from time 0
+        one_minute_records = StockDataManager(candles, False).to_records()
+        five_minute_records = StockDataManager(
+            [dict(c, id=c["id"] // 5, time=c["time"]) for c in candles[::5]], False).to_records()
+
+        engine = BacktestEngine(600, 6000)
+        one_minute, five_minutes = StockDataManager(auto_compute_indicators=False), \
+            StockDataManager(auto_compute_indicators=False)
+        engine.add_stock_data_manager("BTC-PERP", 60, one_minute, one_minute_records)
+        engine.add_stock_data_manager("BTC-PERP", 300, five_minutes, five_minute_records)
+
+        strategy = _RecordingStrategy([one_minute, five_minutes])
+        report = engine.run(strategy)
+
+        # Candles starting from 600 up to 5940 (1 min) and 5700 (5 min)
+        self.assertEqual(report["candle_number"], 90 + 18)
+        self.assertEqual(len(one_minute.stock_data_list), 90)
+        self.assertEqual(one_minute.stock_data_list[-1].time, 5940)
+        self.assertEqual(len(five_minutes.stock_data_list), 18)
+
+        # One loop at start, then one loop per one minute candle close
+        self.assertEqual(report["loop_number"], 91)
+        self.assertEqual(strategy.seen[0], (600, [0, 0]))
+        self.assertEqual(strategy.seen[1], (660, [1, 0]))
+        self.assertEqual(strategy.seen[5], (900, [5, 1]))
+        self.assertEqual(strategy.seen[-1], (6000, [90, 18]))
+        self.assertEqual(report["end_time"], 6010)
+
+        self.assertIsInstance(Strategy.clock, SystemClock)
+
+    @staticmethod
+    def run_position_backtest() -> List[tuple]:
+        """Backtest _PositionStrategy and return the requests received by the simulated exchange"""
+        engine = BacktestEngine(600, 3000)
+        exchange = _RecordingExchange(engine.clock)
+        engine.add_candle_listener(exchange.update_candles)
+        engine.add_stock_data_manager("BTC-PERP", 60, StockDataManager(auto_compute_indicators=False),
+                                      StockDataManager(build_candles(60), False).to_records())
+
+        strategy = _PositionStrategy(exchange)
+        engine.run(strategy)
+        strategy.position_driver.wait_for_close()
+
+        return exchange.requests
+
+    def test_position_driver(self):
+        """Test that a position driver is stepped on the virtual clock and closes its position after its max open
+        duration of virtual time, the same way on each run"""
+        requests = TestBacktestEngine.run_position_backtest()
+
+        self.assertEqual(requests[0], ("POST", "orders", 600))
+        self.assertEqual([request[2] for request in requests if request[1] == "positions"], list(range(610, 1201, 10)))
+        self.assertEqual(requests[-2:], [("POST", "orders", 1200), ("DELETE", "orders", 1200.25)])
+
+        self.assertEqual(TestBacktestEngine.run_position_backtest(), requests)
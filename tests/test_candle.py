@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import numpy as np
+
+from candle_builder import build_candles
+from core.enums.color_enum import ColorEnum
+from core.models.candle import Candle
+from core.models.identified_candle import IdentifiedCandle
+from core.stock.stock_data_manager import StockDataManager, MAX_ITEM_IN_IND_LIST
+
+
+class TestCandle(unittest.TestCase):
+    """Test Candle"""
+
+    def test_slots_and_equality(self):
+        """Test that candles have no instance dict and are compared by value"""
+        candle = Candle(1, 60, 1.0, 2.0, 0.5, 1.5, 10.0)
+
+        self.assertFalse(hasattr(candle, "__dict__"))
+        self.assertEqual(candle, Candle(1, 60, 1.0, 2.0, 0.5, 1.5, 10.0))
+        self.assertNotEqual(candle, Candle(1, 60, 1.0, 2.0, 0.5, 1.5, 11.0))
+        self.assertNotEqual(candle, IdentifiedCandle(1))
+        self.assertEqual(IdentifiedCandle(1), IdentifiedCandle(1))
+        self.assertEqual(hash(candle), 1)
+
+    def test_vectorized_patterns(self):
+        """Test that vectorized pattern methods give the same results as the candle ones"""
+        rand = random.Random(42)
+        candles = []
+        for identifier in range(500):
+            open_price, close_price = rand.uniform(90, 110), rand.uniform(90, 110)
+            candles.append(Candle(identifier, identifier, open_price, max(open_price, close_price) + rand.uniform(0, 20),
+                                  min(open_price, close_price) - rand.uniform(0, 20), close_price, 1.0))
+        candles.append(Candle(500, 500, 100.0, 100.0, 100.0, 100.0, 1.0))  # Flat candle
+
+        open_prices = np.array([candle.open_price for candle in candles])
+        high_prices = np.array([candle.high_price for candle in candles])
+        low_prices = np.array([candle.low_price for candle in candles])
+        close_prices = np.array([candle.close_price for candle in candles])
+
+        self.assertEqual(Candle.get_colors(open_prices, close_prices).tolist(),
+                         [candle.get_color().value for candle in candles])
+        self.assertEqual(Candle.are_hammers_or_hanging_men(open_prices, high_prices, low_prices, close_prices).tolist(),
+                         [candle.is_hammer_or_hanging_man() for candle in candles])
+        self.assertEqual(Candle.are_inverted_hammers_or_shooting_stars(open_prices, high_prices, low_prices,
+                                                                       close_prices).tolist(),
+                         [candle.is_inverted_hammer_or_shooting_star() for candle in candles])
+        self.assertIn(ColorEnum.RED.value, Candle.get_colors(open_prices, close_prices))
+
+    def test_stock_data_list_reuses_unchanged_candles(self):
+        """Test that only changed candles are created again in the stock data list"""
+        candles = build_candles(MAX_ITEM_IN_IND_LIST + 20)
+        stock_data_manager = StockDataManager(candles[:MAX_ITEM_IN_IND_LIST + 10], False)
+        stock_data_list = stock_data_manager.stock_data_list
+
+        stock_data_manager.update_data(candles[MAX_ITEM_IN_IND_LIST + 9:MAX_ITEM_IN_IND_LIST + 12])
+        stock_data_manager.update_data([dict(candles[MAX_ITEM_IN_IND_LIST], volume=1.0)])
+        new_stock_data_list = stock_data_manager.stock_data_list
+
+        self.assertEqual(len(new_stock_data_list), MAX_ITEM_IN_IND_LIST)
+        self.assertEqual(new_stock_data_list, stock_data_manager._data_line.to_candle_list(MAX_ITEM_IN_IND_LIST))
+        self.assertIs(new_stock_data_list[0], stock_data_list[2])
+        self.assertIsNot(new_stock_data_list[-12], stock_data_list[-10])
+        self.assertEqual(new_stock_data_list[-12].volume, 1.0)
@@ -0,0 +1,61 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from candle_builder import build_candles
+from core.stock.candle_archive import CandleArchive
+from core.stock.candle_cache import CandleCache
+from core.stock.stock_data_manager import StockDataManager
+
+
+class TestCandleArchive(unittest.TestCase):
+    """Test CandleArchive"""
+
+    def test_append_and_get_range(self):
+        """Test that appended candles are queried back by time range"""
+        candles = build_candles(100)
+        records = StockDataManager(candles, False).to_records()
+
+        with tempfile.TemporaryDirectory() as directory:
+            candle_archive = CandleArchive(directory)
+            self.assertEqual(len(candle_archive.get_range("BTC/USD", 60)), 0)
+            self.assertIsNone(candle_archive.get_last_time("BTC/USD", 60))
+
+            self.assertEqual(candle_archive.append("BTC/USD", 60, records[:60]), 60)
+            # Already archived candles are ignored
+            self.assertEqual(candle_archive.append("BTC/USD", 60, records[40:]), 40)
+            self.assertEqual(candle_archive.append("BTC/USD", 60, records[90:]), 0)
+            self.assertEqual(candle_archive.get_last_time("BTC/USD", 60), candles[-1]["time"])
+
+            all_records = candle_archive.get_range("BTC/USD", 60)
+            self.assertIsInstance(all_records.base, np.memmap)
+            self.assertEqual(CandleCache.to_stock_data(all_records), candles)
+
+            start_time, end_time = candles[10]["time"], candles[20]["time"]
+            self.assertEqual(CandleCache.to_stock_data(candle_archive.get_range("BTC/USD", 60, start_time, end_time)),
+                             candles[10:20])
+            self.assertEqual(CandleCache.to_stock_data(candle_archive.get_range("BTC/USD", 60, start_time + 1)),
+                             candles[11:])
+            self.assertEqual(len(candle_archive.get_range("BTC/USD", 60, end_time, start_time)), 0)
+
+            self.assertEqual(list(candle_archive.iter_stock_data("BTC/USD", 60, start_time, chunk_size=7)),
+                             candles[10:])
+
+    def test_incomplete_record(self):
+        """Test that an interrupted write is ignored and overwritten by the next append"""
+        candles = build_candles(20)
+        records = StockDataManager(candles, False).to_records()
+
+        with tempfile.TemporaryDirectory() as directory:
+            candle_archive = CandleArchive(directory)
+            candle_archive.append("BTC-PERP", 60, records[:10])
+
+            with open(candle_archive.get_path("BTC-PERP", 60), "ab") as file:
+                file.write(records[10:11].tobytes()[:13])
+
+            self.assertEqual(len(candle_archive.get_range("BTC-PERP", 60)), 10)
+            candle_archive.append("BTC-PERP", 60, records[10:])
+            self.assertEqual(os.path.getsize(candle_archive.get_path("BTC-PERP", 60)), records.nbytes)
+            self.assertEqual(CandleCache.to_stock_data(candle_archive.get_range("BTC-PERP", 60)), candles)
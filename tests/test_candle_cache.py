@@ -0,0 +1,26 @@
+import os
+import tempfile
+import unittest
+
+from candle_builder import build_candles
+from core.stock.candle_cache import CandleCache
+from core.stock.stock_data_manager import StockDataManager
+
+
+class TestCandleCache(unittest.TestCase):
+    """Test CandleCache"""
+
+    def test_save_and_load(self):
+        """Test that saved candles are loaded back as the same stock data"""
+        candles = build_candles(50)
+        stock_data_manager = StockDataManager(candles, False)
+
+        with tempfile.TemporaryDirectory() as directory:
+            candle_cache = CandleCache(directory)
+            self.assertEqual(len(candle_cache.load("BTC/USD", 60)), 0)
+
+            candle_cache.save("BTC/USD", 60, stock_data_manager.to_records())
+            self.assertTrue(os.path.isfile(os.path.join(directory, "BTC_USD", "60.npy")))
+            self.assertEqual(os.listdir(os.path.join(directory, "BTC_USD")), ["60.npy"])
+
+            self.assertEqual(CandleCache.to_stock_data(candle_cache.load("BTC/USD", 60)), candles)
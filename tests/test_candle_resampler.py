@@ -0,0 +1,59 @@
+import unittest
+
+from candle_builder import build_candles
+from core.stock.candle_resampler import CandleResampler
+
+
+class TestCandleResampler(unittest.TestCase):
+    """Test CandleResampler"""
+
+    @staticmethod
+    def aggregate(base_candles: list, time_frame_length: int) -> dict:
+        """Build a candle from all its base candles"""
+        return {
+            "id": base_candles[0]["time"] // time_frame_length,
+            "time": base_candles[0]["time"],
+            "open_price": base_candles[0]["open_price"],
+            "high_price": max(candle["high_price"] for candle in base_candles),
+            "low_price": min(candle["low_price"] for candle in base_candles),
+            "close_price": base_candles[-1]["close_price"],
+            "volume": sum(candle["volume"] for candle in base_candles)
+        }
+
+    def test_resample_with_partial_updates(self):
+        """Test candles built from base candles received one by one, each of them first received partial"""
+        base_candles = build_candles(100)  # 60 sec candles
+        for candle in base_candles:
+            candle["time"] += 120  # First base candle does not start a 300 sec candle
+            candle["id"] = candle["time"] // 60
+
+        resampler = CandleResampler(300, 60)
+        built_candles = {}
+        for candle in base_candles:
+            for built_candle in resampler.resample([dict(candle, close_price=0.0, high_price=candle["open_price"])]):
+                built_candles[built_candle["time"]] = built_candle
+            for built_candle in resampler.resample([candle]):
+                built_candles[built_candle["time"]] = built_candle
+
+        expected_candles = {}
+        for time in range(300, base_candles[-1]["time"] + 1, 300):
+            expected_candles[time] = TestCandleResampler.aggregate(
+                [candle for candle in base_candles if time <= candle["time"] < time + 300], 300)
+
+        # The partially covered first candle (time 0) is not built
+        self.assertEqual(sorted(built_candles), sorted(expected_candles))
+        for time, expected_candle in expected_candles.items():
+            for key, value in expected_candle.items():
+                self.assertAlmostEqual(built_candles[time][key], value, msg=f"{time} {key}")
+        self.assertEqual(resampler.closed_candle_number, len(expected_candles) - 1)
+
+    def test_older_base_candle_update(self):
+        """Test that an update of an older base candle of the current candle is taken into account"""
+        base_candles = build_candles(5)  # 60 sec candles
+        resampler = CandleResampler(300, 60)
+        resampler.resample(base_candles)
+
+        base_candles[1] = dict(base_candles[1], high_price=1000.0, volume=base_candles[1]["volume"] + 1)
+        built_candle = resampler.resample([base_candles[1]])[0]
+
+        self.assertEqual(built_candle, TestCandleResampler.aggregate(base_candles, 300))
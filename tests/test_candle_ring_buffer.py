@@ -0,0 +1,93 @@
+import math
+import unittest
+
+from core.enums.candle_upsert_result_enum import CandleUpsertResultEnum
+from core.stock.candle_ring_buffer import CandleRingBuffer
+
+
+class TestCandleRingBuffer(unittest.TestCase):
+    """Test CandleRingBuffer"""
+
+    @staticmethod
+    def upsert_candle(buffer: CandleRingBuffer, identifier: int, close_price: float = 1.0,
+                      volume: float = 10.0) -> CandleUpsertResultEnum:
+        """Upsert a candle built from its identifier"""
+        return buffer.upsert(identifier, identifier * 60, 1.0, 2.0, 0.5, close_price, volume)
+
+    def test_append_keeps_identifier_order(self):
+        """Test that appended candles are exposed sorted by identifier"""
+        buffer = CandleRingBuffer(5)
+        for identifier in range(10, 13):
+            self.upsert_candle(buffer, identifier)
+
+        self.assertEqual(len(buffer), 3)
+        self.assertEqual(buffer.identifiers.tolist(), [10, 11, 12])
+        self.assertEqual(buffer.times.tolist(), [600, 660, 720])
+
+    def test_capacity_drops_oldest_candles(self):
+        """Test that the oldest candles are dropped when the buffer is full"""
+        buffer = CandleRingBuffer(4)
+        for identifier in range(1, 11):
+            self.upsert_candle(buffer, identifier)
+
+        self.assertEqual(len(buffer), 4)
+        self.assertEqual(buffer.identifiers.tolist(), [7, 8, 9, 10])
+        self.assertEqual(buffer.get_column("identifier", 2).tolist(), [9, 10])
+
+    def test_upsert_last_candle(self):
+        """Test that a candle with the last identifier updates it in place"""
+        buffer = CandleRingBuffer(3)
+        for identifier in range(1, 6):
+            self.upsert_candle(buffer, identifier)
+        version = buffer.version
+
+        self.assertIs(self.upsert_candle(buffer, 5, close_price=3.0), CandleUpsertResultEnum.LAST_UPDATED)
+        self.assertIs(self.upsert_candle(buffer, 5, close_price=3.0), CandleUpsertResultEnum.UNCHANGED)
+        self.assertEqual(buffer.close_prices.tolist(), [1.0, 1.0, 3.0])
+        self.assertEqual(buffer.version, version + 1)
+
+    def test_upsert_older_candle(self):
+        """Test that older candles are updated or inserted at the right place"""
+        buffer = CandleRingBuffer(5)
+        for identifier in [1, 2, 4, 5]:
+            self.upsert_candle(buffer, identifier)
+
+        self.assertIs(self.upsert_candle(buffer, 2, volume=20.0), CandleUpsertResultEnum.UPDATED)
+        self.assertIs(self.upsert_candle(buffer, 3), CandleUpsertResultEnum.INSERTED)
+        self.assertEqual(buffer.identifiers.tolist(), [1, 2, 3, 4, 5])
+        self.assertEqual(buffer.volumes.tolist(), [10.0, 20.0, 10.0, 10.0, 10.0])
+
+        # Older than the oldest candle of a full buffer
+        self.assertIs(self.upsert_candle(buffer, 0), CandleUpsertResultEnum.UNCHANGED)
+        self.assertEqual(buffer.first_identifier, 1)
+
+    def test_views_are_read_only(self):
+        """Test that exposed views can't be used to alter the buffer"""
+        buffer = CandleRingBuffer(2)
+        self.upsert_candle(buffer, 1)
+
+        with self.assertRaises(ValueError):
+            buffer.volumes[0] = 0
+
+    def test_to_candle_list(self):
+        """Test the Candle objects built from the buffer"""
+        buffer = CandleRingBuffer(3)
+        for identifier in range(1, 5):
+            self.upsert_candle(buffer, identifier)
+
+        candles = buffer.to_candle_list(2)
+        self.assertEqual([candle.identifier for candle in candles], [3, 4])
+        self.assertEqual(candles[-1].time, 240)
+        self.assertIsInstance(candles[-1].identifier, int)
+
+    def test_extra_columns(self):
+        """Test the values of additional columns stay aligned with the candles"""
+        buffer = CandleRingBuffer(3)
+        buffer.add_column("indicator")
+        for identifier in range(1, 6):
+            self.upsert_candle(buffer, identifier)
+            buffer.set_value("indicator", -1, identifier * 10.0)
+        self.upsert_candle(buffer, 6)
+
+        self.assertEqual(buffer.get_column("indicator")[:2].tolist(), [40.0, 50.0])
+        self.assertTrue(math.isnan(buffer.get_column("indicator")[-1]))
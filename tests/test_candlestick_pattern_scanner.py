@@ -0,0 +1,61 @@
+import unittest
+
+import numpy as np
+
+from candle_builder import build_candles
+from core.enums.candlestick_shape_enum import CandlestickShapeEnum
+from core.stock.candlestick_pattern_scanner import CandlestickPatternScanner
+from core.stock.stock_data_manager import StockDataManager
+
+# open, high, low, close
+CANDLES = [
+    (10.0, 12.0, 9.0, 11.0),  # Green
+    (11.5, 12.0, 8.0, 9.5),  # Red, swallowing the previous one
+    (10.0, 10.5, 9.0, 10.3),  # Green, inside the previous body: harami
+    (10.0, 10.1, 7.0, 9.9),  # Hammer
+    (10.0, 13.0, 9.9, 10.1),  # Inverted hammer
+    (10.0, 10.0, 10.0, 10.0)  # Flat
+]
+
+
+class TestCandlestickPatternScanner(unittest.TestCase):
+    """Test CandlestickPatternScanner"""
+
+    def setUp(self):
+        self.open_prices, self.high_prices, self.low_prices, self.close_prices = \
+            [np.array(column) for column in zip(*CANDLES)]
+
+    def test_shapes(self):
+        """Test shapes found on a candle window"""
+        scanner = CandlestickPatternScanner(self.open_prices, self.high_prices, self.low_prices, self.close_prices)
+
+        self.assertEqual(scanner.get_mask(CandlestickShapeEnum.SWALLOWING).tolist(),
+                         [False, True, False, False, False, False])
+        self.assertEqual(scanner.get_mask(CandlestickShapeEnum.HARAMI).tolist(),
+                         [False, False, True, False, False, False])
+        self.assertEqual(scanner.get_mask(CandlestickShapeEnum.HAMMER_OR_HANGING_MAN).tolist(),
+                         [False, False, False, True, False, False])
+        self.assertEqual(scanner.get_shapes().tolist(), [
+            CandlestickShapeEnum.UNDEFINED.value,
+            CandlestickShapeEnum.SWALLOWING.value,
+            CandlestickShapeEnum.HARAMI.value,
+            CandlestickShapeEnum.HAMMER_OR_HANGING_MAN.value,
+            CandlestickShapeEnum.REVERSED_HAMMER_OR_FALLING_STAR.value,
+            CandlestickShapeEnum.UNDEFINED.value
+        ])
+
+    def test_several_markets(self):
+        """Test that a 2-D scan gives the same result as scanning each market alone"""
+        stock_data_managers = [StockDataManager(build_candles(candle_number, seed), False)
+                               for candle_number, seed in [(50, 1), (50, 2), (10, 3)]]
+
+        shapes = CandlestickPatternScanner.from_stock_data_managers(stock_data_managers, 30).get_shapes()
+
+        self.assertEqual(shapes.shape, (3, 30))
+        for row, stock_data_manager in enumerate(stock_data_managers[:2]):
+            expected = CandlestickPatternScanner.from_stock_data_manager(stock_data_manager, 31).get_shapes()[1:]
+            self.assertEqual(shapes[row].tolist(), expected.tolist())
+
+        expected = CandlestickPatternScanner.from_stock_data_manager(stock_data_managers[2]).get_shapes()
+        self.assertEqual(shapes[2, -10:].tolist(), expected.tolist())
+        self.assertFalse(shapes[2, :-10].any())
@@ -0,0 +1,48 @@
+import json
+import unittest
+
+import numpy as np
+
+from core.ftx.ftx_json_decoder import FtxJsonDecoder
+from core.stock.candle_cache import CandleCache
+from tools.utils import format_ohlcv_raw_data
+
+
+class TestFtxJsonDecoder(unittest.TestCase):
+    """Test FtxJsonDecoder"""
+
+    def test_decode(self):
+        """Test that the default parser and the standard library one give the same documents"""
+        payload = json.dumps({"success": True, "result": [{"price": 1.5, "size": 2, "name": "BTC-PERP"}]}).encode()
+        self.assertEqual(FtxJsonDecoder().decode(payload), FtxJsonDecoder(json.loads).decode(payload))
+        self.assertRaises(ValueError, FtxJsonDecoder().decode, b"<html>Bad gateway</html>")
+
+    def test_to_candle_records(self):
+        """Test that candle records hold the values of the row by row formatting"""
+        raw_candles = [{"startTime": "", "time": (1619827200 + i * 15) * 1000.0, "open": 10 + i, "high": 12 + i,
+                        "low": 9 + i, "close": 11 + i, "volume": i * 100} for i in range(20)]
+
+        self.assertEqual(CandleCache.to_stock_data(FtxJsonDecoder.to_candle_records(raw_candles, 15)),
+                         [format_ohlcv_raw_data(raw_candle, 15) for raw_candle in raw_candles])
+        self.assertEqual(len(FtxJsonDecoder.to_candle_records([], 15)), 0)
+
+    def test_to_trade_records(self):
+        """Test trade and orderbook records"""
+        trades = FtxJsonDecoder.to_trade_records([
+            {"id": 1, "price": 100.5, "size": 2, "side": "buy", "liquidation": False,
+             "time": "2021-05-01T00:00:01.500000+00:00"},
+            {"id": 2, "price": 100, "size": 0.5, "side": "sell", "liquidation": True,
+             "time": "2021-05-01T00:00:02+00:00"}
+        ])
+
+        self.assertEqual(trades["id"].tolist(), [1, 2])
+        self.assertEqual(trades["time"].tolist(), [1619827201.5, 1619827202])
+        self.assertEqual(trades["price"].tolist(), [100.5, 100])
+        self.assertEqual(trades["is_buy"].tolist(), [True, False])
+        self.assertEqual(trades["liquidation"].tolist(), [False, True])
+
+        levels = FtxJsonDecoder.to_orderbook_levels([[100.5, 2], [100, 0]])
+        self.assertEqual(levels["price"].tolist(), [100.5, 100])
+        self.assertEqual(levels["size"].tolist(), [2, 0])
+        self.assertEqual(len(FtxJsonDecoder.to_orderbook_levels([])), 0)
+        self.assertTrue(np.shares_memory(levels, levels["price"]))
@@ -0,0 +1,127 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import json
+import threading
+import time
+import unittest
+from typing import List
+from unittest import mock
+
+from requests import HTTPError, PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+import core.ftx.rest.ftx_rest_api as ftx_rest_api_module
+from core.enums.request_priority_enum import RequestPriorityEnum
+from core.ftx.rest.ftx_rest_api import FtxRestApi
+from tools.priority_token_bucket import PriorityTokenBucket
+
+
+class FakeAdapter(HTTPAdapter):
+    """Transport adapter answering requests with a queue of (status, result) responses instead of sending them"""
+
+    def __init__(self, responses: List[tuple] = None):
+        super(FakeAdapter, self).__init__()
+        self.responses: List[tuple] = responses or []
+        self.requests: List[PreparedRequest] = []
+        self._lock = threading.Lock()
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        with self._lock:
+            self.requests.append(request)
+            status_code, result = self.responses.pop(0) if len(self.responses) > 0 else (200, None)
+
+        response = Response()
+        response.status_code = status_code
+        response.request = request
+        response.url = request.url
+        response._content = json.dumps({"success": True, "result": result}).encode() if status_code == 200 \
+            else b"Too many requests"
+        return response
+
+
+class TestFtxRestApi(unittest.TestCase):
+    """Test FtxRestApi"""
+
+    def setUp(self):
+        self._rate_limiters = (FtxRestApi.rate_limiter, FtxRestApi.public_rate_limiter,
+                               FtxRestApi.private_rate_limiter)
+        FtxRestApi.rate_limiter = PriorityTokenBucket(100, 100)
+        FtxRestApi.public_rate_limiter = PriorityTokenBucket(100, 100)
+        FtxRestApi.private_rate_limiter = PriorityTokenBucket(100, 100)
+
+        self.ftx_rest_api = FtxRestApi(pool_size=3)
+        self.adapter = FakeAdapter()
+        self.ftx_rest_api._adapter = self.adapter
+
+    def tearDown(self):
+        FtxRestApi.rate_limiter, FtxRestApi.public_rate_limiter, FtxRestApi.private_rate_limiter = \
+            self._rate_limiters
+
+    def test_rate_limiters(self):
+        """Test that both request types draw from the global budget, within their own one"""
+        self.assertEqual(ftx_rest_api_module.REST_MAX_REQUESTS_PER_SECOND, 10)
+        self.assertLessEqual(ftx_rest_api_module.REST_PUBLIC_MAX_REQUESTS_PER_SECOND, 10)
+        self.assertLessEqual(ftx_rest_api_module.REST_PRIVATE_MAX_REQUESTS_PER_SECOND, 10)
+
+        self.assertIs(FtxRestApi.get_rate_limiter('GET', 'markets/BTC-PERP/candles'), FtxRestApi.public_rate_limiter)
+        self.assertIs(FtxRestApi.get_rate_limiter('GET', 'wallet/balances'), FtxRestApi.private_rate_limiter)
+        self.assertIs(FtxRestApi.get_rate_limiter('POST', 'orders'), FtxRestApi.private_rate_limiter)
+        self.assertEqual(FtxRestApi.get_request_priority('DELETE', 'orders/123'), RequestPriorityEnum.ORDER)
+        self.assertEqual(FtxRestApi.get_request_priority('GET', 'orders'), RequestPriorityEnum.ACCOUNT)
+        self.assertEqual(FtxRestApi.get_request_priority('GET', 'markets/BTC-PERP'), RequestPriorityEnum.MARKET_DATA)
+
+        FtxRestApi.rate_limiter = PriorityTokenBucket(10, 2)
+        start = time.monotonic()
+        for _ in range(2):
+            self.ftx_rest_api.get('markets/BTC-PERP')
+            self.ftx_rest_api.get('wallet/balances')
+        self.assertGreaterEqual(time.monotonic() - start, 0.18)  # 4 requests, 2 of them waiting for a global token
+
+    def test_order_gets_ahead_of_market_data(self):
+        """Test that an order waiting for the global budget is sent before the market data requests queued before"""
+        FtxRestApi.rate_limiter = PriorityTokenBucket(10, 1)
+        FtxRestApi.rate_limiter.acquire()  # Empty the global budget so that every request below waits
+        threads = []
+
+        for path in ['markets/BTC-PERP/candles', 'markets/ETH-PERP/candles', 'markets/SOL-PERP/candles']:
+            threads.append(threading.Thread(target=self.ftx_rest_api.get, args=(path,)))
+            threads[-1].start()
+            time.sleep(0.01)  # Let the request queue up
+
+        threads.append(threading.Thread(target=self.ftx_rest_api.post, args=('orders', {"market": "BTC-PERP"})))
+        threads[-1].start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([request.path_url for request in self.adapter.requests],
+                         ['/api/orders', '/api/markets/BTC-PERP/candles', '/api/markets/ETH-PERP/candles',
+                          '/api/markets/SOL-PERP/candles'])
+        self.assertEqual(list(FtxRestApi.get_rate_limit_metrics()["lanes"]), ["ORDER", "MARKET_DATA"])
+
+    def test_too_many_requests_retry(self):
+        """Test that HTTP 429 responses are sent again after a delay, up to the retry limit"""
+        retry_number = FtxRestApi.get_rate_limit_metrics()["too_many_requests_retry_number"]
+        self.adapter.responses = [(429, None), (429, None), (200, {"name": "BTC-PERP"})]
+
+        with mock.patch.object(ftx_rest_api_module, 'REST_TOO_MANY_REQUESTS_MIN_RETRY_DELAY', 0.01):
+            self.assertEqual(self.ftx_rest_api.get('markets/BTC-PERP'), {"name": "BTC-PERP"})
+            self.assertEqual(len(self.adapter.requests), 3)
+            self.assertEqual(FtxRestApi.get_rate_limit_metrics()["too_many_requests_retry_number"], retry_number + 2)
+
+            self.adapter.responses = [(429, None)] * (ftx_rest_api_module.REST_TOO_MANY_REQUESTS_MAX_RETRY + 1)
+            self.assertRaises(HTTPError, self.ftx_rest_api.get, 'markets/BTC-PERP')
+
+    def test_sessions(self):
+        """Test that each thread has its own signed session, all sharing the connection pool"""
+        sessions = [self.ftx_rest_api._get_session()]
+        thread = threading.Thread(target=lambda: sessions.append(self.ftx_rest_api._get_session()))
+        thread.start()
+        thread.join()
+
+        self.assertIs(self.ftx_rest_api._get_session(), sessions[0])
+        self.assertIsNot(sessions[0], sessions[1])
+        self.assertTrue(all(session.get_adapter('https://ftx.com/api/') is self.adapter for session in sessions))
+        self.assertEqual(FtxRestApi(pool_size=3)._adapter._pool_maxsize, 3)
+
+        self.ftx_rest_api.get('positions')
+        self.assertEqual(self.adapter.requests[0].headers['FTX-KEY'], 'api key')
+        self.assertIn('FTX-SIGN', self.adapter.requests[0].headers)
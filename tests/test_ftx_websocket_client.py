@@ -0,0 +1,53 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import json
+import unittest
+from typing import Dict, List
+
+from core.ftx.ws.ftx_websocket_client import FtxWebsocketClient
+from core.stock.orderbook import Orderbook
+
+
+class _FakeFtxWebsocketClient(FtxWebsocketClient):
+    """FtxWebsocketClient recording the sent messages instead of sending them"""
+
+    def __init__(self):
+        super(_FakeFtxWebsocketClient, self).__init__()
+        self.sent_messages: List[Dict] = []
+
+    def send_json(self, message: Dict) -> None:
+        self.sent_messages.append(message)
+
+
+class TestFtxWebsocketClient(unittest.TestCase):
+    """Test FtxWebsocketClient"""
+
+    @staticmethod
+    def orderbook_partial(timestamp: float) -> str:
+        """Build an orderbook partial message of BTC-PERP, with its checksum"""
+        orderbook = Orderbook()
+        orderbook.update([(100, 1)], [(101, 2)], timestamp)
+        return json.dumps({"type": "partial", "channel": "orderbook", "market": "BTC-PERP", "data": {
+            "action": "partial", "bids": [[100, 1]], "asks": [[101, 2]], "time": timestamp,
+            "checksum": orderbook.get_checksum()
+        }})
+
+    def test_orderbook_kept_on_reconnect(self):
+        """Test that orderbook subscriptions are sent again when the connection is opened again"""
+        client = _FakeFtxWebsocketClient()
+        client._on_open(None)
+        client.wait_for_orderbook_update("BTC-PERP", 0)  # Subscribes without waiting
+        client._on_message(None, TestFtxWebsocketClient.orderbook_partial(1.5))
+
+        self.assertEqual(client.get_orderbook_timestamp("BTC-PERP"), 1.5)
+        self.assertEqual(client.get_orderbook_snapshot("BTC-PERP")["best_bid"], 100)
+
+        reconnections = []
+        client.add_reconnect_listener(lambda: reconnections.append(client.get_orderbook_timestamp("BTC-PERP")))
+        client.sent_messages.clear()
+        client._on_open(None)  # Reconnection
+
+        self.assertEqual(client.sent_messages, [{"op": "subscribe", "channel": "orderbook", "market": "BTC-PERP"}])
+        self.assertEqual(reconnections, [0])  # The orderbook received before the reconnection is dropped
+
+        client._on_message(None, TestFtxWebsocketClient.orderbook_partial(2.5))
+        self.assertEqual(client.get_orderbook_timestamp("BTC-PERP"), 2.5)
@@ -0,0 +1,112 @@
+import unittest
+from typing import List
+
+import numpy as np
+import pandas as pd
+import stockstats
+
+from candle_builder import build_candles
+from core.models.raw_stock_data_dict import RawStockDataDict
+from core.stock.stock_data_manager import StockDataManager, MAX_ITEM_IN_DATA_SET
+
+COMPARED_COLUMNS = ["rsi", "rsi_6", "atr", "atr_14", "boll", "boll_ub", "boll_lb", "macd", "macds", "macdh",
+                    "close_10_sma", "close_10_ema", "volume_20_sma", "volume_5_ema", "high_7_smma"]
+
+
+class TestIndicatorEngine(unittest.TestCase):
+    """Test the incremental indicator engine against stockstats"""
+
+    @staticmethod
+    def compute_with_stockstats(candles: List[RawStockDataDict]) -> stockstats.StockDataFrame:
+        """Compute indicators from scratch with stockstats"""
+        return stockstats.StockDataFrame.retype(pd.DataFrame([{
+            "date": candle["time"],
+            "open": candle["open_price"],
+            "high": candle["high_price"],
+            "low": candle["low_price"],
+            "close": candle["close_price"],
+            "volume": candle["volume"]
+        } for candle in candles]))
+
+    def assert_same_indicators(self, stock_data_manager: StockDataManager, candles: List[RawStockDataDict]):
+        """Assert the indicator engine values are the stockstats ones computed over the whole candle history"""
+        expected = TestIndicatorEngine.compute_with_stockstats(candles)
+
+        for column in COMPARED_COLUMNS:
+            stock_data_manager._indicator_engine.add_column(column)
+            TestIndicatorEngine.assert_same_column(column, stock_data_manager.get_data_view(column),
+                                                   expected[column].to_numpy()[-MAX_ITEM_IN_DATA_SET:])
+
+    @staticmethod
+    def assert_same_column(column: str, actual: np.ndarray, expected: np.ndarray):
+        """Assert two indicator columns are the same"""
+        if column.startswith("rsi"):
+            # First rsi value (no gain nor loss yet) is NaN or 50 depending on the stockstats version
+            actual, expected = actual[1:], expected[1:]
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-9, err_msg=column)
+
+    def test_candles_fed_one_by_one(self):
+        """Test indicators computed candle after candle"""
+        candles = build_candles(MAX_ITEM_IN_DATA_SET)
+        stock_data_manager = StockDataManager()
+
+        for candle in candles:
+            stock_data_manager.update_data([candle])
+
+        self.assert_same_indicators(stock_data_manager, candles)
+
+    def test_last_candle_updates(self):
+        """Test indicators when the last candle is updated several times before the next one starts"""
+        candles = build_candles(120)
+        stock_data_manager = StockDataManager()
+        stock_data_manager._indicator_engine.add_column("close_10_sma")
+
+        for candle in candles:
+            partial_candle = dict(candle, close_price=candle["open_price"] * 1.01, volume=candle["volume"] / 2)
+            stock_data_manager.update_data([partial_candle])
+            stock_data_manager.update_data([candle])
+
+        self.assert_same_indicators(stock_data_manager, candles)
+
+    def test_dropped_candles(self):
+        """Test indicators once candles are dropped from the data line, including an older candle update (rebuild)"""
+        candles = build_candles(MAX_ITEM_IN_DATA_SET + 200)
+        stock_data_manager = StockDataManager()
+        for column in COMPARED_COLUMNS:
+            stock_data_manager._indicator_engine.add_column(column)
+
+        for candle in candles[:MAX_ITEM_IN_DATA_SET + 150]:
+            stock_data_manager.update_data([candle])
+
+        self.assert_same_indicators(stock_data_manager, candles[:MAX_ITEM_IN_DATA_SET + 150])
+
+        candles[200] = dict(candles[200], close_price=candles[200]["close_price"] + 5)
+        stock_data_manager.update_data([candles[200]])
+
+        self.assert_same_indicators(stock_data_manager, candles[:MAX_ITEM_IN_DATA_SET + 150])
+
+        for candle in candles[MAX_ITEM_IN_DATA_SET + 150:]:  # Candles still dropped as expected after the rebuild
+            stock_data_manager.update_data([candle])
+
+        self.assert_same_indicators(stock_data_manager, candles)
+
+    def test_older_candle_update(self):
+        """Test indicators after an older candle has been updated"""
+        candles = build_candles(100)
+        stock_data_manager = StockDataManager(candles)
+
+        candles[50] = dict(candles[50], close_price=candles[50]["close_price"] + 5)
+        stock_data_manager.update_data([candles[50]])
+
+        self.assert_same_indicators(stock_data_manager, candles)
+
+    def test_stock_indicators_data_frame(self):
+        """Test indicators exposed through the stockstats data frame"""
+        candles = build_candles(60)
+        stock_data_manager = StockDataManager(candles)
+        expected = TestIndicatorEngine.compute_with_stockstats(candles)
+
+        for column in ["rsi", "atr_14", "boll_ub", "boll_lb", "kdjk"]:
+            TestIndicatorEngine.assert_same_column(column, stock_data_manager.stock_indicators[column].to_numpy(),
+                                                   expected[column].to_numpy())
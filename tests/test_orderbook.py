@@ -0,0 +1,55 @@
+import random
+import unittest
+import zlib
+from itertools import zip_longest
+
+from core.stock.orderbook import Orderbook
+
+
+def _get_checksum(bids, asks):
+    """Checksum of the whole sorted book, computed as FTX documents it"""
+    bids = sorted(((price, size) for price, size in bids.items()), reverse=True)[:100]
+    asks = sorted((price, size) for price, size in asks.items())[:100]
+    return zlib.crc32(':'.join(
+        ':'.join(f'{float(level[0])}:{float(level[1])}' for level in pair if level)
+        for pair in zip_longest(bids, asks)
+    ).encode())
+
+
+class TestOrderbook(unittest.TestCase):
+    """Test Orderbook"""
+
+    def test_levels(self):
+        """Test that levels are sorted from the best price, and removed on 0 size"""
+        orderbook = Orderbook()
+        orderbook.update([(99, 1), (100, 2), (98, 3)], [(102, 1), (101, 2)], 1.5)
+        orderbook.update([(99, 0), (97, 0)], [(101, 5)], 2.5)
+
+        self.assertEqual(orderbook.get_levels(), {'bids': [(100, 2), (98, 3)], 'asks': [(101, 5), (102, 1)]})
+        self.assertEqual(orderbook.get_levels(1), {'bids': [(100, 2)], 'asks': [(101, 5)]})
+        self.assertEqual(orderbook.timestamp, 2.5)
+        self.assertEqual(len(orderbook.bids), 2)
+
+    def test_checksum(self):
+        """Test that the incremental checksum matches the checksum of the whole book after random deltas"""
+        rng = random.Random(7)
+        orderbook = Orderbook()
+        bids, asks = {}, {}
+
+        for _ in range(500):
+            bid_deltas = [(round(rng.uniform(900, 1000), 1), rng.choice([0, 0.5, 1, rng.uniform(0, 10)]))
+                          for _ in range(rng.randint(0, 5))]
+            ask_deltas = [(round(rng.uniform(1000.1, 1100), 1), rng.choice([0, 0.5, 1, rng.uniform(0, 10)]))
+                          for _ in range(rng.randint(0, 5))]
+            orderbook.update(bid_deltas, ask_deltas, 0)
+
+            for deltas, book in ((bid_deltas, bids), (ask_deltas, asks)):
+                for price, size in deltas:
+                    if size:
+                        book[price] = size
+                    else:
+                        book.pop(price, None)
+
+            self.assertEqual(orderbook.get_checksum(), _get_checksum(bids, asks))
+            self.assertEqual(orderbook.get_levels(),
+                             {'bids': sorted(bids.items(), reverse=True), 'asks': sorted(asks.items())})
@@ -0,0 +1,51 @@
+import unittest
+
+from core.enums.side_enum import SideEnum
+from core.stock.orderbook import Orderbook
+
+
+class TestOrderbookAnalytics(unittest.TestCase):
+    """Test OrderbookAnalytics"""
+
+    def test_snapshot(self):
+        """Test the snapshot values, and that it follows the orderbook updates"""
+        orderbook = Orderbook()
+        self.assertEqual(orderbook.get_snapshot(), {
+            "timestamp": 0.0, "best_bid": None, "best_bid_size": 0.0, "best_ask": None, "best_ask_size": 0.0,
+            "spread": None, "mid_price": None, "microprice": None, "imbalance": None
+        })
+
+        orderbook.update([(100, 3), (99, 5)], [(101, 1), (102, 1)], 1.5)
+        snapshot = orderbook.get_snapshot()
+        self.assertEqual(snapshot["best_bid"], 100)
+        self.assertEqual(snapshot["best_ask"], 101)
+        self.assertEqual(snapshot["spread"], 1)
+        self.assertEqual(snapshot["mid_price"], 100.5)
+        self.assertEqual(snapshot["microprice"], (100 * 1 + 101 * 3) / 4)  # Leans towards the thinner ask side
+        self.assertEqual(snapshot["imbalance"], (8 - 2) / 10)
+        self.assertEqual(snapshot["timestamp"], 1.5)
+
+        orderbook.update([(100, 0)], [], 2.5)
+        snapshot = orderbook.get_snapshot()
+        self.assertEqual(snapshot["best_bid"], 99)
+        self.assertEqual(snapshot["imbalance"], (5 - 2) / 7)
+        self.assertEqual(snapshot["timestamp"], 2.5)
+
+    def test_imbalance_depth(self):
+        """Test that levels below the imbalance depth are ignored"""
+        orderbook = Orderbook()
+        orderbook.analytics.imbalance_depth = 2
+        orderbook.update([(100, 1), (99, 1)], [(101, 1), (102, 1)], 0)
+        orderbook.update([(98, 50)], [], 0)
+
+        self.assertEqual(orderbook.get_snapshot()["imbalance"], 0)
+
+    def test_vwap(self):
+        """Test the expected fill price of market orders"""
+        orderbook = Orderbook()
+        orderbook.update([(100, 1), (99, 2)], [(101, 1), (103, 2)], 0)
+
+        self.assertEqual(orderbook.get_vwap(SideEnum.BUY, 0.5), 101)
+        self.assertEqual(orderbook.get_vwap(SideEnum.BUY, 2), 102)
+        self.assertEqual(orderbook.get_vwap(SideEnum.SELL, 3), (100 + 99 * 2) / 3)
+        self.assertIsNone(orderbook.get_vwap(SideEnum.SELL, 3.5))
@@ -0,0 +1,50 @@
+import functools
+import os
+import tempfile
+import unittest
+
+from candle_builder import build_candles
+from core.backtest.parameter_sweep import ParameterSweep
+from core.stock.stock_data_manager import StockDataManager
+from core.stock.candle_archive import CandleArchive
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
+
+VOLUME_FACTOR = 1  # Swept constant
+CANDLE_NUMBER = 10  # Swept constant
+
+
+def _run_test_backtest(candle_archive, market):
+    records = candle_archive.get_range(market, 60)[:CANDLE_NUMBER]
+    return {"volume": float(records["volume"].sum()) * VOLUME_FACTOR, "pid": os.getpid()}
+
+
+class TestParameterSweep(unittest.TestCase):
+    """Test ParameterSweep"""
+
+    def test_get_combinations(self):
+        """Test that every combination of the grid is listed"""
+        self.assertEqual(ParameterSweep.get_combinations({"A": [1, 2], "B": ["x"], "C": [True, False]}), [
+            {"A": 1, "B": "x", "C": True}, {"A": 1, "B": "x", "C": False},
+            {"A": 2, "B": "x", "C": True}, {"A": 2, "B": "x", "C": False}
+        ])
+
+    def test_run(self):
+        """Test that each combination is run with its constants in the worker processes"""
+        candles = build_candles(50)
+
+        with tempfile.TemporaryDirectory() as directory:
+            CandleArchive(directory).append("BTC-PERP", 60, StockDataManager(candles, False).to_records())
+
+            parameter_sweep = ParameterSweep(__name__, functools.partial(_run_test_backtest, market="BTC-PERP"),
+                                             directory, 2)
+            results = parameter_sweep.run({"VOLUME_FACTOR": [1, 3], "CANDLE_NUMBER": [5, 20]})
+
+            self.assertEqual(list(results.columns), ["VOLUME_FACTOR", "CANDLE_NUMBER", "volume", "pid"])
+            self.assertEqual(len(results), 4)
+            for _, row in results.iterrows():
+                expected_volume = sum(c["volume"] for c in candles[:int(row["CANDLE_NUMBER"])]) * row["VOLUME_FACTOR"]
+                self.assertAlmostEqual(row["volume"], expected_volume)
+            self.assertNotIn(os.getpid(), results["pid"].tolist())
+
+            with self.assertRaises(FtxAlgotradingException):
+                parameter_sweep.run({"UNKNOWN_CONSTANT": [1]})
@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from tools.priority_token_bucket import PriorityTokenBucket
+
+
+class TestPriorityTokenBucket(unittest.TestCase):
+    """Test PriorityTokenBucket"""
+
+    def test_priority_order(self):
+        """Test that waiting requests are served by priority, then in arrival order"""
+        priority_token_bucket = PriorityTokenBucket(10, 1)
+        priority_token_bucket.acquire()  # Empty the bucket so that every request below waits
+        served_requests = []
+        threads = []
+
+        for name, priority in [("market data 1", 2), ("market data 2", 2), ("account", 1), ("order", 0)]:
+            threads.append(threading.Thread(target=lambda n=name, p=priority: served_requests.append(
+                (n, priority_token_bucket.acquire(priority=p)))))
+            threads[-1].start()
+            time.sleep(0.01)  # Let the thread queue up
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([name for name, _ in served_requests],
+                         ["order", "account", "market data 1", "market data 2"])
+
+        metrics = priority_token_bucket.get_metrics()
+        self.assertEqual(list(metrics), [0, 1, 2])
+        self.assertEqual(metrics[2]["request_number"], 2)
+        self.assertGreater(metrics[2]["max_wait_time"], metrics[0]["max_wait_time"])
+
+    def test_acquire_async(self):
+        """Test that coroutines and threads share the bucket, by priority"""
+        priority_token_bucket = PriorityTokenBucket(10, 1)
+        priority_token_bucket.acquire()
+        served_requests = []
+
+        thread = threading.Thread(target=lambda: served_requests.append(("thread", priority_token_bucket.acquire(
+            priority=2))))
+        thread.start()
+        time.sleep(0.01)
+
+        async def acquire(name: str, priority: int):
+            await priority_token_bucket.acquire_async(priority=priority)
+            served_requests.append((name, priority))
+
+        async def acquire_all():
+            await asyncio.gather(acquire("coroutine 1", 1), acquire("coroutine 2", 0))
+
+        asyncio.run(acquire_all())
+        thread.join()
+
+        self.assertEqual([name for name, _ in served_requests], ["coroutine 2", "coroutine 1", "thread"])
+        self.assertFalse(priority_token_bucket.try_acquire())
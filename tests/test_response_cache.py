@@ -0,0 +1,72 @@
+import threading
+import time
+import unittest
+
+from core.ftx.rest.response_cache import ResponseCache
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+
+
+class TestResponseCache(unittest.TestCase):
+    """Test ResponseCache"""
+
+    def test_ttl(self):
+        """Test the endpoint patterns and the response expiration"""
+        response_cache = ResponseCache({'markets/{market_name}': 0.05})
+        self.assertEqual(response_cache.get_ttl('markets/BTC-PERP'), 0.05)
+        self.assertIsNone(response_cache.get_ttl('markets/BTC-PERP/candles'))
+        self.assertIsNone(response_cache.get_ttl('wallet/balances'))
+
+        responses = iter(range(10))
+        self.assertEqual(response_cache.get('markets/BTC-PERP', 0.05, lambda: next(responses)), 0)
+        self.assertEqual(response_cache.get('markets/BTC-PERP', 0.05, lambda: next(responses)), 0)
+        self.assertEqual(response_cache.get('markets/ETH-PERP', 0.05, lambda: next(responses)), 1)
+        time.sleep(0.06)
+        self.assertEqual(response_cache.get('markets/BTC-PERP', 0.05, lambda: next(responses)), 2)
+
+        self.assertEqual(response_cache.get_metrics(),
+                         {"hit_number": 1, "miss_number": 3, "shared_request_number": 0, "size": 2})
+
+        response_cache.clear()
+        self.assertEqual(response_cache.get('markets/BTC-PERP', 0.05, lambda: next(responses)), 3)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used responses are evicted first"""
+        response_cache = ResponseCache(max_size=2)
+        response_cache.get('a', 10, lambda: 'a')
+        response_cache.get('b', 10, lambda: 'b')
+        response_cache.get('a', 10, lambda: 'new a')
+        response_cache.get('c', 10, lambda: 'c')
+
+        self.assertEqual(response_cache.get('a', 10, lambda: 'new a'), 'a')
+        self.assertEqual(response_cache.get('b', 10, lambda: 'new b'), 'new b')
+
+    def test_single_flight(self):
+        """Test that concurrent identical requests are sent once, and share its error"""
+        response_cache = ResponseCache()
+        sent_requests = []
+        results = []
+
+        def send_request():
+            sent_requests.append(1)
+            time.sleep(0.05)
+            if len(sent_requests) == 1:
+                raise FtxRestApiException("Too many requests")
+            return {"price": 1}
+
+        def get():
+            try:
+                results.append(response_cache.get('markets/BTC-PERP', 10, send_request))
+            except FtxRestApiException as e:
+                results.append(e)
+
+        for _ in range(2):
+            threads = [threading.Thread(target=get) for _ in range(5)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(len(sent_requests), 2)  # The failed response is not cached
+        self.assertTrue(all(isinstance(result, FtxRestApiException) for result in results[:5]))
+        self.assertEqual(results[5:], [{"price": 1}] * 5)
+        self.assertEqual(response_cache.get_metrics()["shared_request_number"], 8)
@@ -0,0 +1,61 @@
+import unittest
+
+from candle_builder import build_candles
+from core.stock.indicators.rolling_volume_statistics import RollingVolumeStatistics
+from core.stock.stock_data_manager import StockDataManager
+from exceptions.ftx_algotrading_exception import FtxAlgotradingException
+
+
+class TestRollingVolumeStatistics(unittest.TestCase):
+    """Test RollingVolumeStatistics and StockDataManager.get_volume_statistics"""
+
+    def assert_statistics(self, stock_data_manager: StockDataManager, depth: int, offset: int = 0):
+        stock_data_list = stock_data_manager.stock_data_list
+        candles = stock_data_list[max(len(stock_data_list) - depth - offset, 0):max(len(stock_data_list) - offset, 0)]
+        volume_statistics = stock_data_manager.get_volume_statistics(depth, offset)
+
+        self.assertEqual(volume_statistics.candle_number, len(candles))
+        self.assertEqual(volume_statistics.is_full, len(candles) == depth)
+        self.assertAlmostEqual(volume_statistics.volume_sum, sum(c.volume for c in candles), places=6)
+        self.assertEqual(volume_statistics.zero_volume_candle_number, sum(c.volume == 0 for c in candles))
+        self.assertEqual(volume_statistics.green_candle_number,
+                         sum(c.open_price <= c.close_price for c in candles))
+
+    def test_append_and_update(self):
+        """Test that the statistics follow new candles, last candle updates and older candle updates"""
+        candles = build_candles(120)
+        for candle in candles[::7]:
+            candle["volume"] = 0
+
+        stock_data_manager = StockDataManager(candles[:3], False)
+        windows = [(10, 0), (20, 4), (1, 0), (5, 1)]
+        for depth, offset in windows:
+            self.assert_statistics(stock_data_manager, depth, offset)
+
+        for candle in candles[3:]:
+            stock_data_manager.update_data([candle])
+            stock_data_manager.update_data([dict(candle, volume=candle["volume"] * 2,
+                                                 close_price=candle["open_price"] - 1)])
+            for depth, offset in windows:
+                self.assert_statistics(stock_data_manager, depth, offset)
+
+        stock_data_manager.update_data([dict(candles[-8], volume=0)])
+        for depth, offset in windows:
+            self.assert_statistics(stock_data_manager, depth, offset)
+
+    def test_volume_mean(self):
+        """Test the volume mean and the empty window"""
+        volume_statistics = RollingVolumeStatistics(3)
+        self.assertNotEqual(volume_statistics.volume_mean, volume_statistics.volume_mean)  # NaN
+
+        for candle in build_candles(5):
+            volume_statistics.append(candle)
+
+        self.assertAlmostEqual(volume_statistics.volume_mean, sum(c["volume"] for c in build_candles(5)[-3:]) / 3)
+
+    def test_invalid_window(self):
+        """Test that invalid windows are refused"""
+        stock_data_manager = StockDataManager(build_candles(5), False)
+        self.assertRaises(FtxAlgotradingException, stock_data_manager.get_volume_statistics, 0)
+        self.assertRaises(FtxAlgotradingException, stock_data_manager.get_volume_statistics, 5, -1)
+
@@ -0,0 +1,129 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import threading
+import unittest
+from collections import defaultdict
+from typing import Callable, Dict, List
+from unittest import mock
+
+import core.ftx.ws.sharded_ftx_websocket_client as sharded_ftx_websocket_client_module
+from core.ftx.ws.sharded_ftx_websocket_client import ShardedFtxWebsocketClient
+
+
+class FakeShard(object):
+    """FtxWebsocketClient connection stub, recording the trades listeners and the removed markets"""
+
+    def __init__(self):
+        self.connected: bool = True
+        self.trades_listeners: Dict[str, List[Callable]] = defaultdict(list)
+        self.removed_markets: List[str] = []
+        self._disconnect_listeners: List[Callable[[], None]] = []
+        self._reconnect_listeners: List[Callable[[], None]] = []
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    def add_disconnect_listener(self, listener: Callable[[], None]) -> None:
+        self._disconnect_listeners.append(listener)
+
+    def add_reconnect_listener(self, listener: Callable[[], None]) -> None:
+        self._reconnect_listeners.append(listener)
+
+    def add_trades_listener(self, market: str, listener: Callable) -> None:
+        self.trades_listeners[market].append(listener)
+
+    def remove_trades_listener(self, market: str, listener: Callable) -> None:
+        self.trades_listeners[market].remove(listener)
+
+    def remove_market(self, market: str) -> None:
+        self.removed_markets.append(market)
+        self.trades_listeners.pop(market, None)
+
+    def get_ticker(self, market: str) -> Dict:
+        return {"market": market}
+
+    def disconnect(self) -> None:
+        self.connected = False
+        for listener in self._disconnect_listeners:
+            listener()
+
+    def reconnect(self) -> None:
+        self.connected = True
+        for listener in self._reconnect_listeners:
+            listener()
+
+
+class TestShardedFtxWebsocketClient(unittest.TestCase):
+    """Test ShardedFtxWebsocketClient"""
+
+    def setUp(self):
+        with mock.patch.object(sharded_ftx_websocket_client_module, 'FtxWebsocketClient', FakeShard):
+            self.client = ShardedFtxWebsocketClient(4)
+        self.shards: List[FakeShard] = self.client._shards
+        self.markets = [f"COIN{i}-PERP" for i in range(100)]
+        self.reconnected_markets: List[str] = []
+
+        for market in self.markets:
+            self.client.add_trades_listener(market, lambda trades: None)
+            self.client.add_reconnect_listener(lambda m=market: self.reconnected_markets.append(m), market)
+
+    def _get_assignment(self) -> Dict[str, int]:
+        return {market: index for index, markets in enumerate(self.client.get_shard_markets()) for market in markets}
+
+    def test_assignment(self):
+        """Test that markets are spread over the connections, always to the same one"""
+        assignment = self._get_assignment()
+        self.assertEqual(len(assignment), len(self.markets))
+        self.assertTrue(all(len(markets) > 10 for markets in self.client.get_shard_markets()))
+
+        with mock.patch.object(sharded_ftx_websocket_client_module, 'FtxWebsocketClient', FakeShard):
+            other_client = ShardedFtxWebsocketClient(4)
+        self.assertTrue(all(other_client._get_target_shard_index(market) == index
+                            for market, index in assignment.items()))
+
+        for market, index in assignment.items():
+            self.assertEqual(len(self.shards[index].trades_listeners[market]), 1)
+        self.assertEqual(self.client.get_ticker(self.markets[0]), {"market": self.markets[0]})
+
+    def test_failover(self):
+        """Test that only the markets of a lost connection are moved, with their trades listeners, and moved back"""
+        assignment = self._get_assignment()
+        lost_markets = [market for market, index in assignment.items() if index == 1]
+
+        self.shards[1].disconnect()  # Rebalanced without any other call on the client
+        new_assignment = self._get_assignment()
+
+        self.assertEqual(sorted(self.shards[1].removed_markets), sorted(lost_markets))
+        self.assertEqual(sorted(market for market in self.markets if new_assignment[market] != assignment[market]),
+                         sorted(lost_markets))
+        self.assertTrue(all(len(self.shards[new_assignment[market]].trades_listeners[market]) == 1
+                            for market in lost_markets))
+        self.assertEqual(sorted(self.reconnected_markets), sorted(lost_markets))
+
+        self.reconnected_markets.clear()
+        self.shards[1].reconnect()
+
+        self.assertEqual(self._get_assignment(), assignment)
+        self.assertTrue(all(len(self.shards[1].trades_listeners[market]) == 1 for market in lost_markets))
+        self.assertEqual(sorted(self.reconnected_markets), sorted(lost_markets))
+
+    def test_reconnect(self):
+        """Test that a connection opened again only notifies its own markets"""
+        shard_markets = self.client.get_shard_markets()
+        lock_states = []
+
+        def acquire_lock():
+            if self.client._lock.acquire(timeout=1):
+                lock_states.append("free")
+                self.client._lock.release()
+
+        def on_reconnect():  # Listeners are called after the client lock is released
+            thread = threading.Thread(target=acquire_lock)
+            thread.start()
+            thread.join()
+
+        self.client.add_reconnect_listener(on_reconnect)
+        self.shards[2].reconnect()  # Lost and opened again before its markets were moved
+
+        self.assertEqual(sorted(self.reconnected_markets), sorted(shard_markets[2]))
+        self.assertEqual(lock_states, ["free"])
+        self.assertEqual(self.client.get_shard_markets(), shard_markets)
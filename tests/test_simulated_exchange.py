@@ -0,0 +1,93 @@
+import unittest
+
+from core.backtest.simulated_exchange import SimulatedExchange
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+from tools.utils import format_market_raw_data, format_position_raw_data, format_wallet_raw_data
+
+
+def _candle(time, open_price, high_price, low_price, close_price):
+    return {"id": time // 60, "time": time, "open_price": open_price, "high_price": high_price,
+            "low_price": low_price, "close_price": close_price, "volume": 1000.0}
+
+
+class TestSimulatedExchange(unittest.TestCase):
+    """Test SimulatedExchange"""
+
+    def setUp(self):
+        self.exchange = SimulatedExchange(1000, taker_fee=0, maker_fee=0)
+        self.exchange.update_candles("BTC-PERP", 60, [_candle(0, 100, 100, 100, 100)])
+
+    def _get_position(self):
+        positions = [format_position_raw_data(p) for p in self.exchange.get("positions")]
+        self.assertEqual(len(positions), 1)
+        return positions[0]
+
+    def test_market_order_and_stop(self):
+        """Test that a market order opens a position closed by a stop, cancelling the other reduce only orders"""
+        market = format_market_raw_data(self.exchange.get("markets/BTC-PERP"))
+        self.assertEqual(market["ask"], 100)
+
+        order = self.exchange.post("orders", {"market": "BTC-PERP", "side": "buy", "price": None, "type": "market",
+                                              "size": 5})
+        self.assertEqual(order["status"], "closed")
+        self.assertEqual(self._get_position()["open_size"], 5)
+        self.assertEqual(format_wallet_raw_data(self.exchange.get("wallet/balances")[0])["free"], 500)
+
+        for trigger_order in [{"type": "stop", "triggerPrice": 95, "trailValue": None},
+                              {"type": "takeProfit", "triggerPrice": 120, "trailValue": None}]:
+            self.exchange.post("conditional_orders", dict(trigger_order, market="BTC-PERP", side="sell", size=5,
+                                                          reduceOnly=True, orderPrice=None))
+        self.assertEqual(len(self.exchange.get("conditional_orders", {"market": "BTC-PERP"})), 2)
+
+        # Red candle: the high is reached before the low
+        self.exchange.update_candles("BTC-PERP", 60, [_candle(60, 100, 110, 98, 99)])
+        self.assertEqual(self._get_position()["open_size"], 5)
+        self.assertEqual(self._get_position()["unrealized_pnl"], -5)
+
+        self.exchange.update_candles("BTC-PERP", 60, [_candle(120, 99, 100, 90, 92)])
+        position = self._get_position()
+        self.assertEqual(position["open_size"], 0)
+        self.assertEqual(position["realized_pnl"], -25)
+        self.assertEqual(self.exchange.balance, 975)
+        self.assertEqual(self.exchange.get("conditional_orders"), [])
+
+        statistics = self.exchange.get_statistics()
+        self.assertEqual((statistics["trade_number"], statistics["winning_trade_number"]), (1, 0))
+        self.assertEqual(statistics["pnl"], -25)
+
+    def test_trailing_stop_and_gap(self):
+        """Test that a trailing stop follows the price and is filled at the open price on a gap"""
+        self.exchange.post("orders", {"market": "BTC-PERP", "side": "sell", "price": None, "type": "market",
+                                      "size": 2})
+        self.exchange.post("conditional_orders", {"market": "BTC-PERP", "side": "buy", "size": 2,
+                                                  "type": "trailingStop", "reduceOnly": True, "triggerPrice": None,
+                                                  "orderPrice": None, "trailValue": 5})
+
+        self.exchange.update_candles("BTC-PERP", 60, [_candle(60, 100, 101, 90, 92)])
+        self.assertEqual(self.exchange.get("conditional_orders")[0]["triggerPrice"], 95)
+
+        # Opens above the trigger price
+        self.exchange.update_candles("BTC-PERP", 60, [_candle(120, 97, 98, 96, 96)])
+        self.assertEqual(self._get_position()["realized_pnl"], 6)
+
+    def test_limit_order(self):
+        """Test that a limit order is filled at its price once reached and that invalid orders are rejected"""
+        order = self.exchange.post("orders", {"market": "BTC-PERP", "side": "buy", "price": 95, "type": "limit",
+                                              "size": 1})
+        self.assertEqual(order["status"], "open")
+        self.assertEqual(self.exchange.get("positions"), [])
+
+        self.exchange.add_trades("BTC-PERP", [{"price": 97}, {"price": 94}])
+        self.assertEqual(self.exchange.get("orders"), [])
+        self.assertEqual(self._get_position()["entry_price"], 94)
+
+        with self.assertRaises(FtxRestApiException):
+            self.exchange.post("orders", {"market": "BTC-PERP", "side": "buy", "price": None, "type": "market",
+                                          "size": 1, "reduceOnly": True})
+        with self.assertRaises(FtxRestApiException):
+            self.exchange.post("orders", {"market": "BTC-PERP", "side": "buy", "price": None, "type": "market",
+                                          "size": 100})
+        with self.assertRaises(FtxRestApiException):
+            self.exchange.get("markets/ETH-PERP")
+        with self.assertRaises(FtxRestApiException):
+            self.exchange.get("account")
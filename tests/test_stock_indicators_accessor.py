@@ -0,0 +1,37 @@
+import unittest
+
+from candle_builder import build_candles
+from core.stock.stock_data_manager import StockDataManager
+
+
+class TestStockIndicatorsAccessor(unittest.TestCase):
+    """Test StockIndicatorsAccessor"""
+
+    def test_only_read_columns_are_computed(self):
+        """Test that indicators are computed on demand and cached until the data line changes"""
+        candles = build_candles(40)
+        stock_data_manager = StockDataManager(candles[:-1])
+        stock_indicators = stock_data_manager.stock_indicators
+
+        self.assertEqual(stock_indicators.cached_columns, [])
+        self.assertEqual(stock_data_manager._indicator_engine.columns, [])
+
+        rsi = stock_indicators["rsi"]
+        self.assertIs(stock_indicators["rsi"], rsi)
+        self.assertEqual(stock_indicators.cached_columns, ["rsi"])
+        self.assertEqual(stock_data_manager._indicator_engine.columns, ["rsi"])
+
+        # Same data: the cache is kept
+        stock_data_manager.update_data([candles[-2]])
+        self.assertIs(stock_indicators["rsi"], rsi)
+
+        # New candle: the cache is dropped, the rsi is computed incrementally
+        stock_data_manager.update_data([candles[-1]])
+        self.assertEqual(stock_indicators.cached_columns, [])
+        self.assertEqual(len(stock_indicators["rsi"]), 40)
+        self.assertEqual(stock_indicators["rsi"].index[-1], candles[-1]["time"])
+
+    def test_disabled_indicators(self):
+        """Test that there is no accessor without data or when indicators are disabled"""
+        self.assertIsNone(StockDataManager().stock_indicators)
+        self.assertIsNone(StockDataManager(build_candles(5), False).stock_indicators)
@@ -0,0 +1,87 @@
+import ftx_config_stub  # Stubs the FTX api keys file, must be imported first
+import unittest
+from typing import List
+from unittest import mock
+
+from core.stock.time_frame_manager import TimeFrameManager, MIN_MISSING_CANDLE_RETRY_DELAY, MIN_RETRY_DELAY
+from exceptions.ftx_rest_api_exception import FtxRestApiException
+
+TIME_FRAME_LENGTH = 60
+LAST_CANDLE_TIME = 1_200_000  # Start time of the last candle available on the first acquisition
+
+
+class FakeFtxRestApi(object):
+    """FtxRestApi stub answering candle requests with the candles started before a given time"""
+
+    def __init__(self):
+        self.last_candle_time: int = LAST_CANDLE_TIME
+        self.fail: bool = False
+
+    def get(self, path: str, params: dict) -> List[dict]:
+        if self.fail:
+            raise FtxRestApiException("Service unavailable")
+
+        return [{"time": candle_time * 1000, "open": 100, "high": 101, "low": 99, "close": 100, "volume": 10}
+                for candle_time in range(max(params["start_time"], self.last_candle_time - 5 * TIME_FRAME_LENGTH),
+                                         self.last_candle_time + 1, TIME_FRAME_LENGTH)]
+
+
+class TestTimeFrameManager(unittest.TestCase):
+    """Test the TimeFrameManager acquisition timing"""
+
+    def setUp(self):
+        self.ftx_rest_api = FakeFtxRestApi()
+        with mock.patch("time.time", return_value=LAST_CANDLE_TIME + 5):
+            self.time_frame_manager = TimeFrameManager(TIME_FRAME_LENGTH, "BTC-PERP", self.ftx_rest_api, False)
+            self.time_frame_manager.feed()
+
+    def feed(self, now: float) -> float:
+        """Feed the time frame manager at a given time and return its next acquisition time"""
+        with mock.patch("time.time", return_value=now):
+            self.time_frame_manager.feed()
+            return self.time_frame_manager.get_next_acquisition_time()
+
+    def test_wake_up_on_candle_close(self):
+        """Test that the next acquisition is right after the last candle close, plus the grace period"""
+        candle_close = LAST_CANDLE_TIME + TIME_FRAME_LENGTH
+
+        with mock.patch("time.time", return_value=LAST_CANDLE_TIME + 5):
+            self.assertEqual(self.time_frame_manager.get_next_acquisition_time(),
+                             candle_close + TimeFrameManager.candle_close_grace_period)
+
+        # Woken up too early, the next candle is not expected yet: no backoff
+        self.assertEqual(self.feed(candle_close + 0.5), candle_close + TimeFrameManager.candle_close_grace_period)
+
+    def test_missing_candle_backoff(self):
+        """Test that acquisitions are retried with an increasing delay only while the expected candle is missing"""
+        candle_close = LAST_CANDLE_TIME + TIME_FRAME_LENGTH
+        now = candle_close + TimeFrameManager.candle_close_grace_period
+
+        self.assertEqual(self.feed(now), now + MIN_MISSING_CANDLE_RETRY_DELAY)
+        now += MIN_MISSING_CANDLE_RETRY_DELAY
+        self.assertEqual(self.feed(now), now + 2 * MIN_MISSING_CANDLE_RETRY_DELAY)
+
+        self.ftx_rest_api.last_candle_time = candle_close  # The expected candle is available
+        now += 2 * MIN_MISSING_CANDLE_RETRY_DELAY
+        self.assertEqual(self.feed(now),
+                         candle_close + TIME_FRAME_LENGTH + TimeFrameManager.candle_close_grace_period)
+
+        # A failed acquisition uses the failure retry delay, not the missing candle one
+        self.ftx_rest_api.fail = True
+        self.assertEqual(self.feed(now + 1), now + 1 + MIN_RETRY_DELAY)
+
+    def test_candle_availability_latency(self):
+        """Test that the time between a candle close and the availability of the next candle is recorded"""
+        candle_close = LAST_CANDLE_TIME + TIME_FRAME_LENGTH
+        self.assertEqual(list(self.time_frame_manager.candle_availability_latencies), [])
+
+        self.feed(candle_close + 1.5)  # Missing candle: no latency yet
+        self.assertEqual(list(self.time_frame_manager.candle_availability_latencies), [])
+
+        self.ftx_rest_api.last_candle_time = candle_close
+        self.feed(candle_close + 3)
+        self.ftx_rest_api.last_candle_time = candle_close + TIME_FRAME_LENGTH
+        self.feed(candle_close + TIME_FRAME_LENGTH + 2)
+
+        self.assertEqual(list(self.time_frame_manager.candle_availability_latencies), [3, 2])
+        self.assertEqual(self.time_frame_manager.mean_candle_availability_latency, 2.5)
@@ -0,0 +1,20 @@
+import time
+import unittest
+
+from tools.token_bucket import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test TokenBucket"""
+
+    def test_burst_then_rate(self):
+        """Test that the bucket allows a burst of its capacity, then tokens at its rate"""
+        token_bucket = TokenBucket(50, 3)
+
+        self.assertTrue(all(token_bucket.try_acquire() for _ in range(3)))
+        self.assertFalse(token_bucket.try_acquire())
+
+        start = time.monotonic()
+        for _ in range(5):
+            token_bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - start, 4 / 50)
@@ -0,0 +1,45 @@
+import datetime
+import unittest
+
+from core.stock.trade_candle_aggregator import TradeCandleAggregator
+
+
+def trade(timestamp: float, price: float, size: float) -> dict:
+    """Build an FTX websocket trade"""
+    return {
+        "id": int(timestamp * 1000),
+        "price": price,
+        "size": size,
+        "side": "buy",
+        "liquidation": False,
+        "time": datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc).isoformat()
+    }
+
+
+class TestTradeCandleAggregator(unittest.TestCase):
+    """Test TradeCandleAggregator"""
+
+    def test_candles_built_from_trades(self):
+        """Test candles built from trade messages, the first partially received candle being skipped"""
+        aggregator = TradeCandleAggregator(15)
+
+        self.assertEqual(aggregator.add_trades([trade(1000010.5, 10.0, 1.0)]), [])  # Candle 1000005 partially seen
+        candles = aggregator.add_trades([trade(1000020.0, 11.0, 2.0), trade(1000021.0, 9.0, 1.0)])
+        candles += aggregator.add_trades([trade(1000033.9, 12.0, 1.0)])
+        self.assertEqual(candles, [
+            {"id": 66668, "time": 1000020, "open_price": 11.0, "high_price": 11.0, "low_price": 9.0,
+             "close_price": 9.0, "volume": 31.0},
+            {"id": 66668, "time": 1000020, "open_price": 11.0, "high_price": 12.0, "low_price": 9.0,
+             "close_price": 12.0, "volume": 43.0}
+        ])
+        self.assertEqual(aggregator.closed_candle_number, 0)
+
+        # No trade during the next candle
+        candles = aggregator.add_trades([trade(1000065.0, 13.0, 1.0)])
+        self.assertEqual([candle["time"] for candle in candles], [1000035, 1000050, 1000065])
+        self.assertEqual([candle["volume"] for candle in candles], [0.0, 0.0, 13.0])
+        self.assertEqual(candles[0]["open_price"], 12.0)
+        self.assertEqual(aggregator.closed_candle_number, 3)
+
+        aggregator.reset()
+        self.assertEqual(aggregator.add_trades([trade(1000081.0, 13.0, 1.0)]), [])
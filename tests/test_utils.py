@@ -0,0 +1,64 @@
+import unittest
+
+import numpy as np
+
+from core.stock.candle_cache import CandleCache
+from tools.utils import format_ohlcv_raw_data, format_ohlcv_raw_data_list, format_market_raw_data, \
+    format_market_raw_data_list, format_wallet_raw_data, format_wallet_raw_data_list, format_position_raw_data, \
+    format_position_raw_data_list
+
+
+class TestUtils(unittest.TestCase):
+    """Test the bulk raw data formatters"""
+
+    def _assert_columns_equal(self, columns, rows):
+        """Assert that the columns hold the values of the row by row formatting"""
+        self.assertEqual([{field: column[i] for field, column in columns.items()} for i in range(len(rows))], rows)
+        self.assertTrue(all(len(column) == len(rows) for column in columns.values()))
+
+    def test_format_ohlcv_raw_data_list(self):
+        """Test that candle records hold the values of the row by row formatting, skipping incomplete raw data"""
+        raw_data_list = [{"startTime": "", "time": (1619827200 + i * 15) * 1000.0, "open": 10 + i, "high": 12 + i,
+                          "low": 9 + i, "close": 11 + i, "volume": i * 100} for i in range(20)]
+
+        self.assertEqual(CandleCache.to_stock_data(format_ohlcv_raw_data_list(raw_data_list, 15)),
+                         [format_ohlcv_raw_data(raw_data, 15) for raw_data in raw_data_list])
+
+        with self.assertLogs(level="WARNING"):
+            records = format_ohlcv_raw_data_list(raw_data_list[:2] + [{"time": 0}], 15)
+        self.assertEqual(len(records), 2)
+        self.assertEqual(len(format_ohlcv_raw_data_list([], 15)), 0)
+
+    def test_format_market_and_wallet_raw_data_list(self):
+        """Test that market and wallet columns hold the values of the row by row formatting"""
+        market_raw_data_list = [{"name": name, "price": 10 + i, "ask": 10.5 + i, "bid": 9.5 + i, "change1h": 0.01,
+                                 "change24h": -0.1 * i, "sizeIncrement": 0.001, "type": "future"}
+                                for i, name in enumerate(["BTC-PERP", "ETH-PERP", "DOGE-PERP"])]
+        self._assert_columns_equal(format_market_raw_data_list(market_raw_data_list),
+                                   [format_market_raw_data(raw_data) for raw_data in market_raw_data_list])
+
+        wallet_raw_data_list = [{"coin": "USD", "total": 1000, "free": 500.5, "availableWithoutBorrow": 500.5,
+                                 "usdValue": 1000, "spotBorrow": 0},
+                                {"coin": "BTC", "total": 0.1, "free": 0.1, "availableWithoutBorrow": 0.1,
+                                 "usdValue": 4000, "spotBorrow": 0}]
+        self._assert_columns_equal(format_wallet_raw_data_list(wallet_raw_data_list),
+                                   [format_wallet_raw_data(raw_data) for raw_data in wallet_raw_data_list])
+
+        self.assertEqual(len(format_wallet_raw_data_list([])["coin"]), 0)
+
+    def test_format_position_raw_data_list(self):
+        """Test that position columns hold the values of the row by row formatting, missing prices being NaN"""
+        position_raw_data_list = [{"future": future, "size": 2.0, "side": side, "netSize": 2.0 if side == "buy" else -2,
+                                   "longOrderSize": 0, "shortOrderSize": 0, "cost": 100, "entryPrice": 50,
+                                   "unrealizedPnl": 0, "realizedPnl": 1.5, "initialMarginRequirement": 0.1,
+                                   "maintenanceMarginRequirement": 0.03, "openSize": 2, "collateralUsed": 10,
+                                   "estimatedLiquidationPrice": 30}
+                                  for future, side in [("BTC-PERP", "buy"), ("ETH-PERP", "sell")]]
+        self._assert_columns_equal(format_position_raw_data_list(position_raw_data_list),
+                                   [format_position_raw_data(raw_data) for raw_data in position_raw_data_list])
+
+        closed_position_raw_data = dict(position_raw_data_list[0], size=0, entryPrice=None,
+                                        estimatedLiquidationPrice=None)
+        columns = format_position_raw_data_list([closed_position_raw_data])
+        self.assertTrue(np.isnan(columns["entry_price"][0]))
+        self.assertTrue(np.isnan(columns["estimated_liquidation_price"][0]))
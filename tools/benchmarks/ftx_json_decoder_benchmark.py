@@ -0,0 +1,120 @@
+"""
+Compare the FtxJsonDecoder path (fastest installed JSON parser and typed records) to the standard library path
+(json.loads and row by row formatting) on FTX payloads.
+
+Usage: python -m tools.benchmarks.ftx_json_decoder_benchmark [payload directory]
+
+The payload directory holds recorded payloads: candles*.json (REST candle responses), trades*.json (websocket trades
+messages) and orderbook*.json (websocket orderbook messages). Payloads shaped like FTX ones are generated if no
+directory is given.
+"""
+import glob
+import json
+import os
+import random
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+from core.ftx.ftx_json_decoder import FtxJsonDecoder
+from core.stock.trade_candle_aggregator import TradeCandleAggregator
+from tools.utils import format_ohlcv_raw_data
+
+TIME_FRAME_LENGTH = 60
+REPEAT_NUMBER = 200
+
+
+def generate_payloads() -> Dict[str, List[bytes]]:
+    """
+    :return: Generated payloads shaped like FTX ones { [payload type]: [payloads] }
+    """
+    rng = random.Random(42)
+    price = 40000.0
+    candles = []
+
+    for i in range(1500):
+        open_price, price = price, price * (1 + rng.gauss(0, 0.002))
+        candles.append({"startTime": "2021-05-01T00:00:00+00:00", "time": (1619827200 + i * 60) * 1000.0,
+                        "open": open_price, "high": max(open_price, price) * 1.001,
+                        "low": min(open_price, price) * 0.999, "close": price, "volume": rng.uniform(0, 1e6)})
+
+    trades = [{"id": 1000000 + i, "price": price + rng.uniform(-5, 5), "size": rng.uniform(0, 2),
+               "side": rng.choice(["buy", "sell"]), "liquidation": False,
+               "time": f"2021-05-01T00:00:{i % 60:02d}.{i:06d}+00:00"} for i in range(100)]
+
+    orderbook = {"action": "partial", "time": 1619827200.123, "checksum": 0,
+                 "bids": [[price - i * 0.5, rng.uniform(0, 10)] for i in range(1, 101)],
+                 "asks": [[price + i * 0.5, rng.uniform(0, 10)] for i in range(1, 101)]}
+
+    return {
+        "candles": [json.dumps({"success": True, "result": candles}).encode()],
+        "trades": [json.dumps({"channel": "trades", "market": "BTC-PERP", "type": "update", "data": trades}).encode()],
+        "orderbook": [json.dumps({"channel": "orderbook", "market": "BTC-PERP", "type": "partial",
+                                  "data": orderbook}).encode()]
+    }
+
+
+def load_payloads(directory: str) -> Dict[str, List[bytes]]:
+    """
+    :param directory: The payload directory
+    :return: The recorded payloads { [payload type]: [payloads] }
+    """
+    payloads = {}
+
+    for payload_type in ("candles", "trades", "orderbook"):
+        payloads[payload_type] = []
+        for path in sorted(glob.glob(os.path.join(directory, f"{payload_type}*.json"))):
+            with open(path, "rb") as file:
+                payloads[payload_type].append(file.read())
+
+    return payloads
+
+
+def get_paths(ftx_json_decoder: FtxJsonDecoder) -> Dict[str, Dict[str, Callable[[bytes], object]]]:
+    """
+    :param ftx_json_decoder: The decoder to benchmark
+    :return: The decoding functions of each path for each payload type { [payload type]: { [path]: function } }
+    """
+    return {
+        "candles": {
+            "stdlib": lambda payload: [format_ohlcv_raw_data(raw_candle, TIME_FRAME_LENGTH)
+                                       for raw_candle in json.loads(payload)["result"]],
+            "decoder": lambda payload: ftx_json_decoder.to_candle_records(
+                ftx_json_decoder.decode(payload)["result"], TIME_FRAME_LENGTH)
+        },
+        "trades": {
+            "stdlib": lambda payload: [(TradeCandleAggregator.parse_trade_time(trade["time"]), float(trade["price"]),
+                                        float(trade["size"])) for trade in json.loads(payload)["data"]],
+            "decoder": lambda payload: ftx_json_decoder.to_trade_records(ftx_json_decoder.decode(payload)["data"])
+        },
+        "orderbook": {
+            "stdlib": lambda payload: {side: [(float(price), float(size)) for price, size in levels]
+                                       for side, levels in json.loads(payload)["data"].items()
+                                       if side in ("bids", "asks")},
+            "decoder": lambda payload: {side: ftx_json_decoder.to_orderbook_levels(levels)
+                                        for side, levels in ftx_json_decoder.decode(payload)["data"].items()
+                                        if side in ("bids", "asks")}
+        }
+    }
+
+
+def main() -> None:
+    payloads = load_payloads(sys.argv[1]) if len(sys.argv) > 1 else generate_payloads()
+    ftx_json_decoder = FtxJsonDecoder()
+    print(f"JSON parser: {ftx_json_decoder.loads.__module__}.{ftx_json_decoder.loads.__name__}")
+
+    for payload_type, paths in get_paths(ftx_json_decoder).items():
+        if len(payloads[payload_type]) == 0:
+            continue
+
+        durations = {path: min(timeit.repeat(lambda: [decode(payload) for payload in payloads[payload_type]],
+                                             number=REPEAT_NUMBER, repeat=3)) / REPEAT_NUMBER
+                     for path, decode in paths.items()}
+
+        print(f"{payload_type}: {len(payloads[payload_type])} payloads, "
+              f"stdlib {durations['stdlib'] * 1e6:.1f} us, decoder {durations['decoder'] * 1e6:.1f} us "
+              f"(x{durations['stdlib'] / durations['decoder']:.1f})")
+
+
+if __name__ == '__main__':
+    main()
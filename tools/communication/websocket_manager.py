@@ -19,6 +19,12 @@ class WebsocketManager:
     def _on_message(self, ws, message):
         raise NotImplementedError()
 
+    def _on_open(self, ws):
+        pass
+
+    def _on_disconnect(self):
+        pass
+
     def send(self, message):
         self.connect()
         self.ws.send(message)
@@ -31,6 +37,7 @@ class WebsocketManager:
 
         self.ws = WebSocketApp(
             self._get_url(),
+            on_open=self._wrap_callback(self._on_open),
             on_message=self._wrap_callback(self._on_message),
             on_close=self._wrap_callback(self._on_close),
             on_error=self._wrap_callback(self._on_error),
@@ -71,6 +78,7 @@ class WebsocketManager:
         if ws is self.ws:
             self.ws = None
             ws.close()
+            self._on_disconnect()
             self.connect()
 
     def connect(self):
@@ -88,6 +96,10 @@ class WebsocketManager:
     def _on_error(self, ws: WebSocketApp, error):
         self._reconnect(ws)
 
+    def is_connected(self) -> bool:
+        ws = self.ws
+        return ws is not None and ws.sock is not None and ws.sock.connected
+
     def reconnect(self) -> None:
         if self.ws is not None:
             self._reconnect(self.ws)
@@ -0,0 +1,152 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Dict, List, Tuple
+
+from core.models.rate_limit_lane_metrics_dict import RateLimitLaneMetricsDict
+from tools.token_bucket import TokenBucket
+
+ASYNC_POLL_DELAY = 0.01  # Time between two checks of a coroutine waiting behind other requests
+
+
+class PriorityTokenBucket(TokenBucket):
+    """
+    Thread safe token bucket rate limiter with priority lanes. Waiting requests are served by priority (lowest value
+    first), then in arrival order. The time waited in each lane is recorded
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Priority token bucket constructor
+
+        :param rate: Number of tokens added to the bucket per second
+        :param capacity: Maximum number of tokens in the bucket (maximum burst size)
+        """
+        super(PriorityTokenBucket, self).__init__(rate, capacity)
+        self._condition: threading.Condition = threading.Condition(self._lock)
+        self._waiters: List[Tuple[int, int]] = []  # Heap of (priority, sequence)
+        self._sequence = itertools.count()
+        self._wait_times: Dict[int, List[float]] = {}  # { [priority]: [request number, total wait, max wait] }
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens from the bucket if there are enough of them and nobody is waiting for them
+
+        :param tokens: Number of tokens to take
+        :return: True if the tokens have been taken, False otherwise
+        """
+        with self._lock:
+            self._refill()
+            if len(self._waiters) == 0 and self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1, priority: int = 0) -> float:
+        """
+        Take tokens from the bucket, waiting for them and for the requests of higher priority if needed
+
+        :param tokens: Number of tokens to take
+        :param priority: Priority of the request (lowest value first)
+        :return: Time waited in seconds
+        """
+        start = time.monotonic()
+
+        with self._condition:
+            waiter = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, waiter)
+
+            try:
+                while not self._take_tokens(waiter, tokens):
+                    # Only the first waiter knows when its tokens are available, the others are woken up when it leaves
+                    self._condition.wait((tokens - self._tokens) / self.rate if self._waiters[0] == waiter else None)
+            finally:
+                self._remove_waiter(waiter)
+
+            return self._record_wait_time(priority, time.monotonic() - start)
+
+    async def acquire_async(self, tokens: float = 1, priority: int = 0) -> float:
+        """
+        Take tokens from the bucket, waiting for them and for the requests of higher priority without blocking the
+        event loop
+
+        :param tokens: Number of tokens to take
+        :param priority: Priority of the request (lowest value first)
+        :return: Time waited in seconds
+        """
+        start = time.monotonic()
+
+        with self._condition:
+            waiter = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, waiter)
+
+        try:
+            while True:
+                with self._condition:
+                    if self._take_tokens(waiter, tokens):
+                        break
+                    time_to_wait = (tokens - self._tokens) / self.rate if self._waiters[0] == waiter \
+                        else ASYNC_POLL_DELAY
+
+                await asyncio.sleep(time_to_wait)
+        finally:
+            with self._condition:
+                self._remove_waiter(waiter)
+
+        with self._condition:
+            return self._record_wait_time(priority, time.monotonic() - start)
+
+    def get_metrics(self) -> Dict[int, RateLimitLaneMetricsDict]:
+        """
+        :return: The metrics of each lane used so far { [priority]: metrics }
+        """
+        with self._lock:
+            return {priority: {
+                "request_number": request_number,
+                "average_wait_time": total_wait_time / request_number,
+                "max_wait_time": max_wait_time
+            } for priority, (request_number, total_wait_time, max_wait_time) in sorted(self._wait_times.items())}
+
+    def _take_tokens(self, waiter: Tuple[int, int], tokens: float) -> bool:
+        """
+        Take tokens from the bucket if the waiter is the first one and there are enough tokens (lock must be held)
+
+        :param waiter: The waiter (priority, sequence)
+        :param tokens: Number of tokens to take
+        :return: True if the tokens have been taken, False otherwise
+        """
+        self._refill()
+        if self._waiters[0] == waiter and self._tokens >= tokens:
+            self._tokens -= tokens
+            return True
+        return False
+
+    def _remove_waiter(self, waiter: Tuple[int, int]) -> None:
+        """
+        Remove a waiter and wake up the others so that the next one waits for its tokens (lock must be held)
+
+        :param waiter: The waiter (priority, sequence)
+        """
+        if self._waiters[0] == waiter:
+            heapq.heappop(self._waiters)
+        else:
+            self._waiters.remove(waiter)
+            heapq.heapify(self._waiters)
+
+        self._condition.notify_all()
+
+    def _record_wait_time(self, priority: int, wait_time: float) -> float:
+        """
+        Record the time waited by a request (lock must be held)
+
+        :param priority: Priority of the request
+        :param wait_time: Time waited in seconds
+        :return: The time waited
+        """
+        lane_wait_times = self._wait_times.setdefault(priority, [0, 0.0, 0.0])
+        lane_wait_times[0] += 1
+        lane_wait_times[1] += wait_time
+        lane_wait_times[2] = max(lane_wait_times[2], wait_time)
+        return wait_time
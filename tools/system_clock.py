@@ -0,0 +1,39 @@
+import threading
+import time
+from typing import Any, Callable, Iterable
+
+
+class SystemClock(object):
+    """Clock used by strategies to get the current time and to wait"""
+
+    def time(self) -> float:
+        """
+        :return: The current timestamp
+        """
+        return time.time()
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Wait for some time
+
+        :param seconds: Number of seconds to wait
+        """
+        time.sleep(seconds)
+
+    def start_thread(self, target: Callable[..., Any], args: Iterable = ()) -> threading.Thread:
+        """
+        Start a thread waiting with this clock
+
+        :param target: Function run by the thread
+        :param args: Arguments of the function
+        :return: The started thread
+        """
+        thread = threading.Thread(target=target, args=list(args))
+        thread.start()
+        return thread
+
+    def is_stopped(self) -> bool:
+        """
+        :return: True once the clock is stopped (end of a backtest): threads waiting with it should end, False otherwise
+        """
+        return False
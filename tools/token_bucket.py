@@ -0,0 +1,78 @@
+import asyncio
+import threading
+import time
+
+
+class TokenBucket(object):
+    """Thread safe token bucket rate limiter"""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Token bucket constructor
+
+        :param rate: Number of tokens added to the bucket per second
+        :param capacity: Maximum number of tokens in the bucket (maximum burst size)
+        """
+        self.rate: float = rate
+        self.capacity: float = capacity
+        self._tokens: float = capacity
+        self._last_refill: float = time.monotonic()
+        self._lock: threading.Lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """
+        Take tokens from the bucket if there are enough of them
+
+        :param tokens: Number of tokens to take
+        :return: True if the tokens have been taken, False otherwise
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, waiting for them to be available if needed
+
+        :param tokens: Number of tokens to take
+        :return: Time waited in seconds
+        """
+        start = time.monotonic()
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return time.monotonic() - start
+                time_to_wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(time_to_wait)
+
+    async def acquire_async(self, tokens: float = 1) -> float:
+        """
+        Take tokens from the bucket, waiting for them to be available without blocking the event loop
+
+        :param tokens: Number of tokens to take
+        :return: Time waited in seconds
+        """
+        start = time.monotonic()
+
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return time.monotonic() - start
+                time_to_wait = (tokens - self._tokens) / self.rate
+
+            await asyncio.sleep(time_to_wait)
+
+    def _refill(self) -> None:
+        """Add the tokens earned since the last refill"""
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
@@ -1,7 +1,10 @@
 import logging
 import math
+import operator
 import os
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
 
 from core.enums.side_enum import SideEnum
 from core.enums.trigger_order_type_enum import TriggerOrderTypeEnum
@@ -10,6 +13,7 @@ from core.models.position_data_dict import PositionDataDict
 from core.models.raw_stock_data_dict import RawStockDataDict
 from core.models.ticker_data_dict import TickerDataDict
 from core.models.wallet_dict import WalletDict
+from core.stock.candle_ring_buffer import CANDLE_DTYPE
 from exceptions.ftx_algotrading_exception import FtxAlgotradingException
 
 
@@ -65,6 +69,26 @@ def format_ohlcv_raw_data(ohlcv_raw_data: dict, time_step: int) -> Optional[RawS
     return None
 
 
+def format_ohlcv_raw_data_list(ohlcv_raw_data_list: List[dict], time_step: int) -> np.ndarray:
+    """
+    Format a list of OHLCV raw data (ie: a REST candle response) in one pass. Raw data missing fields are skipped
+
+    :param ohlcv_raw_data_list: The raw data list
+    :param time_step: The time between each record
+    :return: The candle records (CANDLE_DTYPE)
+    """
+    values = np.array(_get_raw_data_values(ohlcv_raw_data_list, ["time", "open", "high", "low", "close", "volume"],
+                                           "OHLCV"), dtype=np.float64).reshape(-1, 6)
+    records = np.empty(len(values), dtype=CANDLE_DTYPE)
+    records["time"] = np.floor(values[:, 0] / 1000)
+    records["identifier"] = records["time"] // time_step
+
+    for index, column in enumerate(("open_price", "high_price", "low_price", "close_price", "volume"), 1):
+        records[column] = values[:, index]
+
+    return records
+
+
 def format_market_raw_data(market_raw_data: dict) -> Optional[MarketDataDict]:
     """
     Format market raw data
@@ -90,6 +114,27 @@ def format_market_raw_data(market_raw_data: dict) -> Optional[MarketDataDict]:
     return None
 
 
+def format_market_raw_data_list(market_raw_data_list: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Format a list of market raw data (ie: markets response) into columns in one pass. Raw data missing fields are
+    skipped
+
+    :param market_raw_data_list: The market raw data list
+    :return: The MarketDataDict fields as columns { [field]: values }
+    """
+    columns = _get_raw_data_columns(market_raw_data_list, ["name", "price", "ask", "bid", "change1h", "change24h",
+                                                           "sizeIncrement"], "market")
+    return {
+        "name": np.array(columns[0], dtype=str),
+        "price": np.array(columns[1], dtype=np.float64),
+        "ask": np.array(columns[2], dtype=np.float64),
+        "bid": np.array(columns[3], dtype=np.float64),
+        "change1h": np.array(columns[4], dtype=np.float64),
+        "change24h": np.array(columns[5], dtype=np.float64),
+        "size_increment": np.array(columns[6], dtype=np.float64)
+    }
+
+
 def format_wallet_raw_data(wallet_raw_data: dict) -> Optional[WalletDict]:
     """
     Format market raw data
@@ -115,6 +160,26 @@ def format_wallet_raw_data(wallet_raw_data: dict) -> Optional[WalletDict]:
     return None
 
 
+def format_wallet_raw_data_list(wallet_raw_data_list: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Format a list of wallet raw data (ie: wallet/balances response) into columns in one pass. Raw data missing fields
+    are skipped
+
+    :param wallet_raw_data_list: The wallet raw data list
+    :return: The WalletDict fields as columns { [field]: values }
+    """
+    columns = _get_raw_data_columns(wallet_raw_data_list, ["coin", "total", "free", "availableWithoutBorrow",
+                                                           "usdValue", "spotBorrow"], "wallet")
+    return {
+        "coin": np.array(columns[0], dtype=str),
+        "total": np.array(columns[1], dtype=np.float64),
+        "free": np.array(columns[2], dtype=np.float64),
+        "available_without_borrow": np.array(columns[3], dtype=np.float64),
+        "usd_value": np.array(columns[4], dtype=np.float64),
+        "spot_borrow": np.array(columns[5], dtype=np.float64)
+    }
+
+
 def format_position_raw_data(position_raw_data: dict) -> Optional[PositionDataDict]:
     """
     Format position raw data
@@ -157,6 +222,65 @@ def format_position_raw_data(position_raw_data: dict) -> Optional[PositionDataDi
     return None
 
 
+def format_position_raw_data_list(position_raw_data_list: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    Format a list of position raw data (ie: positions response) into columns in one pass. Raw data missing fields are
+    skipped. Missing entry and estimated liquidation prices are NaN
+
+    :param position_raw_data_list: The position raw data list
+    :return: The PositionDataDict fields as columns { [field]: values }
+    """
+    fields = ["future", "size", "side", "netSize", "longOrderSize", "shortOrderSize", "cost", "entryPrice",
+              "unrealizedPnl", "realizedPnl", "initialMarginRequirement", "maintenanceMarginRequirement", "openSize",
+              "collateralUsed", "estimatedLiquidationPrice"]
+    names = ["future", "size", "side", "net_size", "long_order_size", "short_order_size", "cost", "entry_price",
+             "unrealized_pnl", "realized_pnl", "initial_margin_requirement", "maintenance_margin_requirement",
+             "open_size", "collateral_used", "estimated_liquidation_price"]
+    columns = _get_raw_data_columns(position_raw_data_list, fields, "position")
+
+    formatted_columns = {name: np.array(column, dtype=np.float64) for name, column in zip(names, columns)
+                         if name not in ("future", "side")}
+    formatted_columns["future"] = np.array(columns[0], dtype=str)
+    formatted_columns["side"] = np.array([SideEnum.BUY if side == "buy" else SideEnum.SELL for side in columns[2]],
+                                         dtype=object)
+
+    return {name: formatted_columns[name] for name in names}
+
+
+def _get_raw_data_values(raw_data_list: List[dict], fields: List[str], raw_data_name: str) -> List[Tuple]:
+    """
+    Read the values of some fields of each raw data. Raw data missing fields are skipped
+
+    :param raw_data_list: The raw data list
+    :param fields: The fields to read
+    :param raw_data_name: Name of the raw data (for log purpose)
+    :return: One tuple of values per raw data
+    """
+    get_values = operator.itemgetter(*fields)
+
+    try:
+        return list(map(get_values, raw_data_list))
+    except KeyError:
+        values = [get_values(raw_data) for raw_data in raw_data_list
+                  if all(field in raw_data for field in fields)]
+        logging.warning(f"{len(raw_data_list) - len(values)} {raw_data_name} raw data skipped. Data should be "
+                        f"composed of {len(fields)} fields: {', '.join(f'<{field}>' for field in fields)}")
+        return values
+
+
+def _get_raw_data_columns(raw_data_list: List[dict], fields: List[str], raw_data_name: str) -> List[Tuple]:
+    """
+    Read the values of some fields of each raw data, as columns. Raw data missing fields are skipped
+
+    :param raw_data_list: The raw data list
+    :param fields: The fields to read
+    :param raw_data_name: Name of the raw data (for log purpose)
+    :return: One tuple of values per field
+    """
+    values = _get_raw_data_values(raw_data_list, fields, raw_data_name)
+    return list(zip(*values)) if len(values) > 0 else [() for _ in fields]
+
+
 def get_trigger_order_type(trigger_order_type: TriggerOrderTypeEnum) -> str:
     """
     Get FTX trigger order type for given trigger_order_type enum value
@@ -0,0 +1,157 @@
+import heapq
+import itertools
+import threading
+from typing import Any, Callable, Iterable, List, Set, Tuple
+
+from tools.system_clock import SystemClock
+
+
+class VirtualClock(SystemClock):
+    """
+    Clock whose time only moves forward when asked to (used to replay data faster than real time). Only the thread
+    that created the clock moves the time forward when sleeping, other threads wait for the time to reach their wake
+    up time
+
+    Threads started with start_thread are stepped deterministically: when the time moves forward, they are woken up one
+    at a time, in wake up time order, at their exact wake up time, and the time only moves on once they all sleep again
+    or are done
+    """
+
+    def __init__(self, start_time: float = 0):
+        """
+        Virtual clock constructor
+
+        :param start_time: Initial timestamp
+        """
+        self._time: float = start_time
+        self._owner_thread_id: int = threading.get_ident()
+        self._stopped: bool = False
+        self._condition: threading.Condition = threading.Condition()
+        self._stepped_thread_ids: Set[int] = set()  # Threads started with start_thread
+        self._busy_thread_number: int = 0  # Stepped threads running (neither sleeping nor done)
+        self._sleepers: List[Tuple[float, int]] = []  # Heap of the stepped threads sleeps (wake up time, sequence)
+        self._woken_sleeps: Set[int] = set()  # Sequences of the sleeps whose wake up time has been reached
+        self._sequence = itertools.count()
+
+    def time(self) -> float:
+        """
+        :return: The current virtual timestamp
+        """
+        return self._time
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Move the virtual time forward without waiting (owner thread), or wait for the virtual time to move forward
+        (other threads)
+
+        :param seconds: Number of seconds to sleep
+        """
+        with self._condition:
+            wake_up_time = self._time + max(seconds, 0)
+
+            if threading.get_ident() == self._owner_thread_id:
+                self._set_time(wake_up_time)
+            elif self._stopped:
+                return
+            elif threading.get_ident() in self._stepped_thread_ids:
+                sleep = (wake_up_time, next(self._sequence))
+                heapq.heappush(self._sleepers, sleep)
+                self._busy_thread_number -= 1
+                self._condition.notify_all()
+
+                self._condition.wait_for(lambda: sleep[1] in self._woken_sleeps)
+                self._woken_sleeps.remove(sleep[1])
+            else:
+                self._condition.wait_for(lambda: self._stopped or self._time >= wake_up_time)
+
+    def advance_to(self, timestamp: float) -> None:
+        """
+        Move the virtual time forward up to a timestamp. Nothing is done if the timestamp is in the past
+
+        :param timestamp: The timestamp to move to
+        """
+        with self._condition:
+            self._set_time(timestamp)
+
+    def start_thread(self, target: Callable[..., Any], args: Iterable = ()) -> threading.Thread:
+        """
+        Start a thread stepped by the clock (see the class description)
+
+        :param target: Function run by the thread
+        :param args: Arguments of the function
+        :return: The started thread
+        """
+        with self._condition:
+            self._busy_thread_number += 1
+
+        thread = threading.Thread(target=self._run_stepped_thread, args=(target, list(args)))
+        thread.start()
+        return thread
+
+    def wait_until_idle(self) -> None:
+        """Wait for the threads started with start_thread to sleep or to be done (owner thread only)"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._busy_thread_number == 0)
+
+    def stop(self) -> None:
+        """
+        Stop waiting in the other threads: their sleeps return at once from now on. Sleeping stepped threads are woken
+        up one at a time, in wake up time order
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+            while len(self._sleepers) > 0:
+                self._condition.wait_for(lambda: self._busy_thread_number == 0)
+                self._wake_up_next_sleeper()
+
+            self._condition.wait_for(lambda: self._busy_thread_number == 0)
+
+    def is_stopped(self) -> bool:
+        return self._stopped
+
+    def _run_stepped_thread(self, target: Callable[..., Any], args: List) -> None:
+        """
+        Run the function of a thread started with start_thread
+
+        :param target: Function run by the thread
+        :param args: Arguments of the function
+        """
+        with self._condition:
+            self._stepped_thread_ids.add(threading.get_ident())
+
+        try:
+            target(*args)
+        finally:
+            with self._condition:
+                self._stepped_thread_ids.remove(threading.get_ident())
+                self._busy_thread_number -= 1
+                self._condition.notify_all()
+
+    def _wake_up_next_sleeper(self) -> None:
+        """Wake up the stepped thread with the earliest wake up time (the condition lock must be held)"""
+        _, sequence = heapq.heappop(self._sleepers)
+        self._busy_thread_number += 1
+        self._woken_sleeps.add(sequence)
+        self._condition.notify_all()
+
+    def _set_time(self, timestamp: float) -> None:
+        """
+        Move the virtual time forward, stopping at each wake up time of the stepped threads until they are idle, and
+        wake up the threads waiting for it (the condition lock must be held)
+
+        :param timestamp: The timestamp to move to
+        """
+        while True:
+            self._condition.wait_for(lambda: self._busy_thread_number == 0)
+
+            if len(self._sleepers) == 0 or self._sleepers[0][0] > timestamp:
+                break
+
+            self._time = max(self._time, self._sleepers[0][0])
+            self._wake_up_next_sleeper()
+
+        if timestamp > self._time:
+            self._time = timestamp
+            self._condition.notify_all()